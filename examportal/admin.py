@@ -116,4 +116,16 @@ class UserStudySessionAdmin(admin.ModelAdmin):
 class ExamTargetAdmin(admin.ModelAdmin):
     list_display = ['user', 'exam', 'target_date', 'daily_study_goal', 'created_at']
     list_filter = ['user', 'exam']
-    search_fields = ['user__username', 'exam__title']
\ No newline at end of file
+    search_fields = ['user__username', 'exam__title']
+
+@admin.register(SyncEvent)
+class SyncEventAdmin(admin.ModelAdmin):
+    list_display = ['user', 'event_type', 'key', 'occurred_at', 'received_at']
+    list_filter = ['event_type', 'received_at']
+    search_fields = ['user__username', 'key']
+
+@admin.register(StudyTimeTotal)
+class StudyTimeTotalAdmin(admin.ModelAdmin):
+    list_display = ['user', 'exam_category', 'period', 'minutes']
+    list_filter = ['exam_category', 'period']
+    search_fields = ['user__username']
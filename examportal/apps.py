@@ -4,4 +4,10 @@ from django.apps import AppConfig
 class ExamportalConfig(AppConfig):
     default_auto_field = 'django.db.models.BigAutoField'
     name = 'examportal'
-    verbose_name = 'Exam Portal'
\ No newline at end of file
+    verbose_name = 'Exam Portal'
+
+    def ready(self):
+        from django.db.backends.signals import connection_created
+        from .sqlite import configure_connection
+        connection_created.connect(configure_connection)
+        from . import auth_cache, crawlers, fragments, prerender, recommendations  # noqa: F401 (cache invalidation receivers)
\ No newline at end of file
@@ -0,0 +1,273 @@
+"""
+ASGI-native versions of the listing views and progress endpoints.
+
+``govtexamprep.asgi`` serves these through ``govtexamprep.urls_async``; WSGI
+keeps the synchronous views in ``views.py``. Independent queries are
+evaluated together with ``gather_queries``. On server databases
+(``ASYNC_PARALLEL_QUERIES``) each query runs on its own worker thread and
+connection, so they overlap. On SQLite they run one after another on the
+async ORM's thread. Templates still render synchronously because they touch
+lazy relations.
+"""
+import asyncio
+
+from asgiref.sync import sync_to_async
+from django.conf import settings
+from django.core.cache import cache
+from django.contrib.auth.decorators import login_required
+from django.db import close_old_connections
+from django.http import Http404, JsonResponse
+from django.shortcuts import render
+from django.utils.safestring import mark_safe
+
+from . import exam_facets, fragments, heartbeats, search_cache, views
+from .prerender import prerendered
+from .models import (
+    ExamCategory, UpcomingExam, Announcement, AdmitCard, Result, Note, Subject, AnswerKey,
+    UserStudySession,
+)
+
+arender = sync_to_async(render)
+
+
+def _evaluate_in_worker(queryset):
+    try:
+        return list(queryset)
+    finally:
+        close_old_connections()
+
+
+async def _evaluate(queryset):
+    return [obj async for obj in queryset]
+
+
+async def gather_queries(*querysets):
+    """Evaluate independent querysets concurrently and return their rows as lists."""
+    if getattr(settings, 'ASYNC_PARALLEL_QUERIES', False):
+        worker = sync_to_async(_evaluate_in_worker, thread_sensitive=False)
+        return await asyncio.gather(*(worker(queryset) for queryset in querysets))
+    return await asyncio.gather(*(_evaluate(queryset) for queryset in querysets))
+
+
+async def aget_object_or_404(queryset, **kwargs):
+    try:
+        return await queryset.aget(**kwargs)
+    except queryset.model.DoesNotExist:
+        raise Http404(f'No {queryset.model._meta.object_name} matches the given query.')
+
+
+async def home(request):
+    fragment_context = await sync_to_async(fragments.home_fragment_context)()
+    # Render the fetched HTML itself: a separate check could see the fragment
+    # expire before the template reads it, and cache empty sections.
+    sections = await cache.aget(fragments.home_fragment_key(fragment_context['home_fragment_version']))
+    if sections is not None:
+        rows = [[]] * 5
+        fragment_context['home_sections_html'] = mark_safe(sections)
+    else:
+        rows = await gather_queries(
+            ExamCategory.objects.prefetch_related('subject_set'),
+            UpcomingExam.objects.filter(is_active=True).order_by('exam_date')[:5],
+            Announcement.objects.filter(is_active=True).order_by('-created_at')[:5],
+            AdmitCard.objects.filter(is_active=True).select_related('exam').order_by('-release_date')[:3],
+            Result.objects.filter(is_active=True).select_related('exam').order_by('-result_date')[:3],
+        )
+    exam_categories, upcoming_exams, announcements, admit_cards, results = rows
+    context = {
+        'exam_categories': exam_categories,
+        'upcoming_exams': upcoming_exams,
+        'announcements': announcements,
+        'admit_cards': admit_cards,
+        'results': results,
+        **fragment_context,
+    }
+    return await arender(request, 'examportal/index.html', context)
+
+
+async def notes(request):
+    exam_categories, subjects = await gather_queries(ExamCategory.objects.all(), Subject.objects.all())
+    context = {
+        'exam_categories': exam_categories,
+        'subjects': subjects,
+        'selected_category': None,
+    }
+    return await arender(request, 'examportal/notes.html', context)
+
+
+async def notes_by_category(request, category_slug):
+    selected_category = await aget_object_or_404(ExamCategory.objects.all(), slug=category_slug)
+    exam_categories, subjects = await gather_queries(
+        ExamCategory.objects.all(),
+        Subject.objects.filter(exam_category=selected_category),
+    )
+    context = {
+        'exam_categories': exam_categories,
+        'selected_category': selected_category,
+        'subjects': subjects,
+    }
+    return await arender(request, 'examportal/notes.html', context)
+
+
+async def upcoming_exams(request):
+    filters = exam_facets.parse_filters(request.GET)
+    facets = await sync_to_async(exam_facets.facet_counts)(filters)
+    upcoming_exams_list = await _evaluate(exam_facets.filter_exams(filters))
+    context = {
+        'upcoming_exams': upcoming_exams_list,
+        'filters': filters,
+        'facets': facets,
+        'sorts': list(exam_facets.SORTS),
+    }
+    return await arender(request, 'examportal/upcoming_exams.html', context)
+
+
+async def announcements(request):
+    announcements_list = await _evaluate(Announcement.objects.filter(is_active=True).order_by('-created_at'))
+    return await arender(request, 'examportal/announcements.html', {'announcements': announcements_list})
+
+
+async def admit_cards(request):
+    admit_cards_list = await _evaluate(
+        AdmitCard.objects.filter(is_active=True).select_related('exam').order_by('-release_date')
+    )
+    return await arender(request, 'examportal/admit_cards.html', {'admit_cards': admit_cards_list})
+
+
+async def results(request):
+    results_list = await _evaluate(
+        Result.objects.filter(is_active=True).select_related('exam').order_by('-result_date')
+    )
+    return await arender(request, 'examportal/results.html', {'results': results_list})
+
+
+async def answer_keys(request):
+    answer_keys_list = AnswerKey.objects.filter(is_active=True).order_by('-release_date')
+    category_filter = request.GET.get('category')
+    if category_filter:
+        answer_keys_list = answer_keys_list.filter(exam__exam_category__slug=category_filter)
+
+    answer_keys_list, categories = await gather_queries(answer_keys_list, ExamCategory.objects.all())
+    context = {
+        'answer_keys': answer_keys_list,
+        'categories': categories,
+        'selected_category': category_filter,
+    }
+    return await arender(request, 'examportal/answer_keys.html', context)
+
+
+async def search(request):
+    query = request.GET.get('q', '').strip()
+    results = await sync_to_async(search_cache.search)(query)
+    context = {
+        'query': query,
+        'results': results,
+        'total_results': sum(len(items) for items in results.values()),
+        'has_results': any(len(items) > 0 for items in results.values())
+    }
+    return await arender(request, 'examportal/search.html', context)
+
+
+@prerendered
+async def exam_detail(request, exam_id):
+    """View for individual exam detail page"""
+    exam = await aget_object_or_404(
+        UpcomingExam.objects.select_related('exam_category'), id=exam_id, is_active=True
+    )
+    return await arender(request, 'examportal/exam_detail.html', {'exam': exam})
+
+
+# Progress Tracking Views. Reads use the async ORM; writes reuse the
+# serialized write helpers from views.py.
+@login_required
+async def mark_note_completed(request, note_id):
+    try:
+        if request.method == 'POST':
+            user = await request.auser()
+            note = await aget_object_or_404(Note.objects.select_related('subject'), id=note_id)
+            user_progress = await sync_to_async(views._complete_note)(user, note)
+
+            if user_progress is not None:
+                return JsonResponse({'success': True, 'progress': user_progress.progress_percentage})
+
+        return JsonResponse({'success': False})
+    except Exception as e:
+        return JsonResponse({'success': False, 'error': str(e)})
+
+
+@login_required
+async def mark_notes_completed(request):
+    try:
+        if request.method == 'POST':
+            try:
+                note_ids = views.parse_note_ids(request)
+            except ValueError as e:
+                return JsonResponse({'success': False, 'error': str(e)}, status=400)
+            user = await request.auser()
+            notes = await _evaluate(Note.objects.filter(id__in=note_ids).only('id', 'subject_id', 'title').order_by('id'))
+            if notes:
+                new_notes, progress = await sync_to_async(views._complete_notes)(user, notes)
+                return JsonResponse({'success': True, 'completed': len(new_notes), 'progress': progress})
+
+        return JsonResponse({'success': False})
+    except Exception as e:
+        return JsonResponse({'success': False, 'error': str(e)})
+
+
+@login_required
+async def start_study_session(request):
+    try:
+        if request.method == 'POST':
+            user = await request.auser()
+            subject = await aget_object_or_404(Subject.objects.all(), id=request.POST.get('subject_id'))
+            study_session = await sync_to_async(views._start_session)(user, subject)
+            return JsonResponse({'success': True, 'session_id': study_session.id})
+
+        return JsonResponse({'success': False})
+    except Exception as e:
+        return JsonResponse({'success': False, 'error': str(e)})
+
+
+@login_required
+async def end_study_session(request, session_id):
+    try:
+        if request.method == 'POST':
+            user = await request.auser()
+            study_session = await aget_object_or_404(
+                UserStudySession.objects.select_related('subject'), id=session_id, user=user
+            )
+            await sync_to_async(views._end_session)(user, study_session)
+            heartbeats.buffer.discard(study_session.id)
+            return JsonResponse({'success': True, 'duration': study_session.duration_minutes})
+
+        return JsonResponse({'success': False})
+    except Exception as e:
+        return JsonResponse({'success': False, 'error': str(e)})
+
+
+@login_required
+async def study_heartbeat(request, session_id):
+    try:
+        if request.method == 'POST':
+            user = await request.auser()
+            if await sync_to_async(heartbeats.buffer.beat)(session_id, user.id):
+                return JsonResponse({'success': True, 'interval': heartbeats.heartbeat_seconds()})
+
+        return JsonResponse({'success': False})
+    except Exception as e:
+        return JsonResponse({'success': False, 'error': str(e)})
+
+
+@login_required
+async def set_exam_target(request):
+    try:
+        if request.method == 'POST':
+            user = await request.auser()
+            exam = await aget_object_or_404(UpcomingExam.objects.all(), id=request.POST.get('exam_id'))
+            await sync_to_async(views._save_exam_target)(
+                user, exam, request.POST.get('target_date'), request.POST.get('daily_goal', 120)
+            )
+            return JsonResponse({'success': True})
+
+        return JsonResponse({'success': False})
+    except Exception as e:
+        return JsonResponse({'success': False, 'error': str(e)})
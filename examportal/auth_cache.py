@@ -0,0 +1,86 @@
+"""
+Cached ``request.user`` and ``UserProfile`` lookups for authenticated traffic.
+
+``CachedModelBackend`` serves ``request.user`` from the cache instead of
+querying ``auth_user`` on every request. ``get_cached_profile`` does the same
+for the user's profile. Both are dropped when the user or profile is saved or
+deleted, which covers password and ``is_active`` changes, and on logout.
+Django still checks the session auth hash against the cached user, so a
+password change still ends the other sessions. Sessions themselves use the
+``cached_db`` engine, see settings.
+"""
+from django.contrib.auth import get_user_model
+from django.contrib.auth.backends import ModelBackend
+from django.contrib.auth.signals import user_logged_out
+from django.core.cache import cache
+from django.core.exceptions import PermissionDenied
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+
+from .models import UserProfile
+
+USER_CACHE_SECONDS = 300
+
+
+def user_key(user_id):
+    return f'examportal:user:{user_id}'
+
+
+def profile_key(user_id):
+    return f'examportal:profile:{user_id}'
+
+
+def invalidate_user(user_id):
+    cache.delete_many([user_key(user_id), profile_key(user_id)])
+
+
+class CachedModelBackend(ModelBackend):
+    def authenticate(self, request, username=None, password=None, **kwargs):
+        user = super().authenticate(request, username=username, password=password, **kwargs)
+        if user is None:
+            # Stop here: ModelBackend, listed after this one for older sessions,
+            # would hash the same wrong password a second time.
+            raise PermissionDenied
+        return user
+
+    def get_user(self, user_id):
+        user = cache.get(user_key(user_id))
+        if user is None:
+            user = super().get_user(user_id)
+            if user is not None:
+                cache.set(user_key(user_id), user, USER_CACHE_SECONDS)
+        return user if self.user_can_authenticate(user) else None
+
+
+def get_cached_profile(user, create=False):
+    """The user's ``UserProfile`` from cache, creating it if ``create`` is set."""
+    profile = cache.get(profile_key(user.pk))
+    if profile is None:
+        if create:
+            profile, created = UserProfile.objects.get_or_create(user=user)
+        else:
+            profile = UserProfile.objects.filter(user=user).first()
+            if profile is None:
+                return None
+        cache.set(profile_key(user.pk), profile, USER_CACHE_SECONDS)
+    # Reuse the request's user instead of loading it again through the relation.
+    profile.user = user
+    return profile
+
+
+@receiver(post_save, sender=get_user_model())
+@receiver(post_delete, sender=get_user_model())
+def _user_changed(sender, instance, **kwargs):
+    invalidate_user(instance.pk)
+
+
+@receiver(post_save, sender=UserProfile)
+@receiver(post_delete, sender=UserProfile)
+def _profile_changed(sender, instance, **kwargs):
+    cache.delete(profile_key(instance.user_id))
+
+
+@receiver(user_logged_out)
+def _user_logged_out(sender, request, user, **kwargs):
+    if user is not None:
+        invalidate_user(user.pk)
@@ -0,0 +1,240 @@
+"""
+In-process view benchmarks.
+
+Every named URL in ``examportal.urls`` has a ``ViewCase`` below. The cases are
+run through the Django test client against a database filled by
+``seed_examportal`` and report wall time, query count and response size.
+Baselines live in ``benchmark_baselines.json`` and are refreshed with
+``python manage.py benchmark_views --update``.
+"""
+import io
+import json
+import os
+import statistics
+import time
+import uuid
+from contextlib import ExitStack, redirect_stdout
+from datetime import timedelta
+from pathlib import Path
+
+from django.contrib.auth.models import User
+from django.db import DEFAULT_DB_ALIAS, connections
+from django.test import Client
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+from django.utils import timezone
+
+from .db_routers import get_replicas
+from .management.commands.seed_examportal import SEED_USERNAME_PREFIX
+from .models import ExamCategory, Note, Subject, UpcomingExam, UserProgress, UserStudySession
+
+BENCHMARK_SCALES = (0.01, 0.05)
+BASELINE_PATH = Path(__file__).resolve().parent / 'benchmark_baselines.json'
+
+# A view regresses when it is slower than baseline * (1 + TIME_TOLERANCE) plus
+# TIME_SLACK seconds, issues more queries than the baseline, or returns a
+# response more than BYTES_TOLERANCE larger. Wall time varies a lot between
+# machines, so the time tolerance is generous and can be tuned from the
+# environment on slow CI runners.
+TIME_TOLERANCE = float(os.environ.get('BENCHMARK_TIME_TOLERANCE', 3.0))
+TIME_SLACK = 0.05
+BYTES_TOLERANCE = 0.25
+
+
+class BenchmarkFixture:
+    """Objects from the seeded dataset that URL arguments are built from."""
+
+    def __init__(self):
+        self.user = (
+            User.objects.filter(username__startswith=SEED_USERNAME_PREFIX, userprofile__isnull=False)
+            .order_by('id').first()
+        )
+        self.category = ExamCategory.objects.order_by('id').first()
+        self.subject = Subject.objects.order_by('id').first()
+        self.exam = UpcomingExam.objects.filter(is_active=True).order_by('id').first()
+        self.note_ids = list(Note.objects.filter(is_active=True).order_by('id').values_list('id', flat=True))
+        self._open_session = None
+
+    def open_session(self):
+        if self._open_session is None:
+            self._open_session = self.new_session()
+        return self._open_session
+
+    def uncompleted_note_ids(self, count):
+        """The first ``count`` notes, with any completion by the fixture user undone."""
+        note_ids = self.note_ids[:count]
+        UserProgress.completed_notes.through.objects.filter(
+            userprogress__user=self.user, note_id__in=note_ids
+        ).delete()
+        return note_ids
+
+    def sync_events(self, i):
+        """An offline study batch: a session with three notes, then an exam target."""
+        start = timezone.now() - timedelta(hours=2)
+        batch = uuid.uuid4().hex
+        events = [{'id': f'{batch}-start', 'type': 'session_started', 'at': start.isoformat(),
+                   'subject_id': self.subject.id}]
+        events += [
+            {'id': f'{batch}-note-{note_id}', 'type': 'note_completed',
+             'at': (start + timedelta(minutes=10 * n)).isoformat(), 'note_id': note_id}
+            for n, note_id in enumerate(self.note_ids[i * 3 % len(self.note_ids):][:3])
+        ]
+        events += [
+            {'id': f'{batch}-end', 'type': 'session_ended', 'at': (start + timedelta(minutes=45)).isoformat(),
+             'session': f'{batch}-start'},
+            {'id': f'{batch}-target', 'type': 'exam_target_set', 'at': (start + timedelta(minutes=50)).isoformat(),
+             'exam_id': self.exam.id, 'target_date': '2030-01-01', 'daily_goal': 90},
+        ]
+        return {'events': events}
+
+    def new_session(self):
+        return UserStudySession.objects.create(
+            user=self.user,
+            subject=self.subject,
+            start_time=timezone.now() - timedelta(minutes=30),
+        )
+
+
+class ViewCase:
+    """
+    One benchmarked request. ``kwargs`` and ``data`` are callables taking the
+    fixture and the iteration number, so stateful endpoints can get fresh
+    arguments on every run without that setup being timed.
+    """
+
+    def __init__(self, url_name, method='get', auth=False, kwargs=None, data=None, query='', content_type=None):
+        self.url_name = url_name
+        self.method = method
+        self.auth = auth
+        self.kwargs = kwargs or (lambda fixture, i: {})
+        self.data = data or (lambda fixture, i: {})
+        self.query = query
+        self.content_type = content_type
+
+    def url(self, fixture, i):
+        return reverse(self.url_name, kwargs=self.kwargs(fixture, i)) + self.query
+
+
+VIEW_CASES = [
+    ViewCase('home'),
+    ViewCase('register'),
+    ViewCase('login'),
+    ViewCase('logout', auth=True),
+    ViewCase('profile', auth=True),
+    ViewCase('dashboard', auth=True),
+    ViewCase('contact'),
+    ViewCase('notes'),
+    ViewCase('notes_by_category', kwargs=lambda f, i: {'category_slug': f.category.slug}),
+    ViewCase('upcoming_exams'),
+    ViewCase('exam_stats'),
+    ViewCase('leaderboard', auth=True, query='?period=all'),
+    ViewCase('announcements'),
+    ViewCase('admit_cards'),
+    ViewCase('results'),
+    ViewCase('answer_keys'),
+    ViewCase('search', query='?q=ssc'),
+    ViewCase('search_cache_stats', auth=True),
+    ViewCase('eligible_exams', query='?dob=2000-06-15&category=obc&qualification=4'),
+    ViewCase('eligible_exams_api', query='?dob=2000-06-15&category=obc&qualification=4'),
+    ViewCase('mark_note_completed', method='post', auth=True,
+             kwargs=lambda f, i: {'note_id': f.note_ids[i % len(f.note_ids)]}),
+    ViewCase('mark_notes_completed', method='post', auth=True,
+             data=lambda f, i: {'note_ids': f.uncompleted_note_ids(30)}),
+    ViewCase('start_study_session', method='post', auth=True,
+             data=lambda f, i: {'subject_id': f.subject.id}),
+    ViewCase('end_study_session', method='post', auth=True,
+             kwargs=lambda f, i: {'session_id': f.new_session().id}),
+    ViewCase('study_heartbeat', method='post', auth=True,
+             kwargs=lambda f, i: {'session_id': f.open_session().id}),
+    ViewCase('set_exam_target', method='post', auth=True,
+             data=lambda f, i: {'exam_id': f.exam.id, 'target_date': '2030-01-01', 'daily_goal': 90}),
+    ViewCase('study_heatmap', auth=True),
+    ViewCase('sync_progress', method='post', auth=True, content_type='application/json',
+             data=lambda f, i: f.sync_events(i)),
+    ViewCase('debug_upcoming'),
+    ViewCase('debug_announcements'),
+    ViewCase('debug_admit_cards'),
+    ViewCase('debug_results'),
+    ViewCase('privacy_policy'),
+    ViewCase('terms_conditions'),
+    ViewCase('about_us'),
+    ViewCase('refund_policy'),
+    ViewCase('disclaimer'),
+    ViewCase('exam_detail', kwargs=lambda f, i: {'exam_id': f.exam.id}),
+    ViewCase('sitemap_index'),
+    ViewCase('sitemap_section', kwargs=lambda f, i: {'section': 'exams'}),
+    ViewCase('feed', kwargs=lambda f, i: {'kind': 'announcements', 'feed_format': 'rss'}),
+    # 503: benchmarks never import the WSGI application, so nothing warms the process up
+    ViewCase('readiness'),
+]
+
+
+def run_case(case, fixture, repeat=5):
+    """Run a case ``repeat`` times after one warm-up request and summarise it."""
+    timings = []
+    for i in range(repeat + 1):
+        client = Client()
+        if case.auth:
+            client.force_login(fixture.user)
+        url = case.url(fixture, i)
+        data = case.data(fixture, i)
+
+        with ExitStack() as stack:
+            captured = [stack.enter_context(CaptureQueriesContext(connections[alias]))
+                        for alias in [DEFAULT_DB_ALIAS, *get_replicas()]]
+            stack.enter_context(redirect_stdout(io.StringIO()))
+            started = time.perf_counter()
+            extra = {'content_type': case.content_type} if case.content_type else {}
+            response = getattr(client, case.method)(url, data, **extra)
+            elapsed = time.perf_counter() - started
+
+        if i:
+            timings.append(elapsed)
+
+    return {
+        'seconds': round(statistics.median(timings), 5),
+        'queries': sum(len(context.captured_queries) for context in captured),
+        'bytes': len(response.content),
+        'status': response.status_code,
+    }
+
+
+def run_benchmarks(repeat=5, cases=None):
+    """Benchmark every case against the currently seeded database."""
+    fixture = BenchmarkFixture()
+    return {case.url_name: run_case(case, fixture, repeat) for case in (cases or VIEW_CASES)}
+
+
+def load_baselines(path=BASELINE_PATH):
+    try:
+        with open(path) as handle:
+            return json.load(handle)
+    except FileNotFoundError:
+        return {}
+
+
+def save_baselines(baselines, path=BASELINE_PATH):
+    with open(path, 'w') as handle:
+        json.dump(baselines, handle, indent=2, sort_keys=True)
+        handle.write('\n')
+
+
+def find_regressions(results, baseline):
+    """Return a human-readable line for every metric that regressed."""
+    regressions = []
+    for url_name, measured in sorted(results.items()):
+        expected = baseline.get(url_name)
+        if not expected:
+            continue
+        if measured['status'] != expected['status']:
+            regressions.append(f"{url_name}: status {measured['status']} (baseline {expected['status']})")
+        if measured['queries'] > expected['queries']:
+            regressions.append(f"{url_name}: {measured['queries']} queries (baseline {expected['queries']})")
+        time_limit = expected['seconds'] * (1 + TIME_TOLERANCE) + TIME_SLACK
+        if measured['seconds'] > time_limit:
+            regressions.append(
+                f"{url_name}: {measured['seconds'] * 1000:.1f}ms (baseline {expected['seconds'] * 1000:.1f}ms)"
+            )
+        if measured['bytes'] > expected['bytes'] * (1 + BYTES_TOLERANCE):
+            regressions.append(f"{url_name}: {measured['bytes']} bytes (baseline {expected['bytes']})")
+    return regressions
@@ -1,7 +1,24 @@
+from django.core.cache import cache
+from django.utils.functional import SimpleLazyObject
+
+from . import crawlers
 from .models import ExamCategory
 
+CATEGORY_CACHE_SECONDS = 600
+
+
+def category_list():
+    """All exam categories, cached until a category or exam changes."""
+    key = f"examportal:categories:{crawlers.last_changed('exams').timestamp()}"
+    categories = cache.get(key)
+    if categories is None:
+        categories = list(ExamCategory.objects.all())
+        cache.set(key, categories, CATEGORY_CACHE_SECONDS)
+    return categories
+
+
 def exam_categories(request):
-    categories = ExamCategory.objects.all()
+    # Lazy so pages that never show the footer list don't touch the cache.
     return {
-        'exam_categories': categories
-    }
\ No newline at end of file
+        'exam_categories': SimpleLazyObject(category_list)
+    }
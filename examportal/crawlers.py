@@ -0,0 +1,312 @@
+"""
+Sitemaps and RSS/Atom feeds for search engines and aggregators.
+
+``/sitemap.xml`` is a sitemap index. It points to the ``pages``, ``exams``
+and ``notes`` sections, and sections larger than ``SITEMAP_SHARD_SIZE`` URLs
+are split into ``?p=`` shards. Every ``lastmod`` comes from the content's
+``updated_at``. ``/feeds/<kind>.rss`` and ``/feeds/<kind>.atom`` list the
+latest announcements, admit cards, results and answer keys.
+
+Every response is cached and sent with a ``Last-Modified`` header.
+Conditional requests get a 304. Both the cache key and ``Last-Modified`` come
+from ``last_changed(label)``, the time the content behind a label last
+changed. The save/delete receivers below move that time forward once the
+change commits, so a response is only rebuilt after its content changes. In a
+shared cache the times are stored without expiry. A per-process cache such as
+LocMem never sees the marks of other workers, so there the times and the
+cached responses expire after ``LOCAL_CHANGED_SECONDS``. If a time is
+missing, it is recomputed from the newest ``updated_at``.
+"""
+import hashlib
+from datetime import datetime, timezone as dt_timezone
+from functools import wraps
+
+from django.contrib.sitemaps import Sitemap
+from django.contrib.sitemaps import views as sitemap_views
+from django.contrib.syndication.views import Feed
+from django.core.cache import cache, caches
+from django.core.cache.backends.locmem import LocMemCache
+from django.db import transaction
+from django.db.models import Max
+from django.db.models.signals import post_delete, post_save
+from django.http import Http404, HttpResponse
+from django.urls import reverse, reverse_lazy
+from django.utils import timezone
+from django.utils.feedgenerator import Atom1Feed
+from django.views.decorators.http import condition
+
+from .models import (
+    AdmitCard, Announcement, AnswerKey, ExamCategory, Note, Result, Subject, UpcomingExam,
+)
+
+SITEMAP_SHARD_SIZE = 5000
+FEED_SIZE = 50
+CRAWL_CACHE_SECONDS = 6 * 60 * 60
+LOCAL_CHANGED_SECONDS = 60
+EPOCH = datetime(2000, 1, 1, tzinfo=dt_timezone.utc)
+
+# label -> models whose updated_at decides when the label last changed
+LABEL_MODELS = {
+    'exams': [UpcomingExam],
+    'notes': [Note],
+    'announcements': [Announcement],
+    'admit_cards': [AdmitCard],
+    'results': [Result],
+    'answer_keys': [AnswerKey],
+}
+# model -> labels whose output shows it
+MODEL_LABELS = {
+    UpcomingExam: ['exams', 'admit_cards', 'results', 'answer_keys'],
+    ExamCategory: ['exams', 'notes'],
+    Subject: ['notes'],
+    Note: ['notes'],
+    Announcement: ['announcements'],
+    AdmitCard: ['admit_cards'],
+    Result: ['results'],
+    AnswerKey: ['answer_keys'],
+}
+
+
+def changed_key(label):
+    return f'examportal:crawl-changed:{label}'
+
+
+def changed_timeout():
+    """None (no expiry) for a shared cache, ``LOCAL_CHANGED_SECONDS`` for a per-process one."""
+    return LOCAL_CHANGED_SECONDS if isinstance(caches['default'], LocMemCache) else None
+
+
+def last_changed(label):
+    changed = cache.get(changed_key(label))
+    if changed is None:
+        stamps = [model.objects.aggregate(latest=Max('updated_at'))['latest'] for model in LABEL_MODELS[label]]
+        changed = max((stamp for stamp in stamps if stamp), default=EPOCH)
+        cache.add(changed_key(label), changed, changed_timeout())
+    return changed
+
+
+def mark_changed(labels):
+    now = timezone.now()
+    cache.set_many({changed_key(label): now for label in labels}, changed_timeout())
+
+
+# Sitemaps
+
+class PageSitemap(Sitemap):
+    changefreq = 'daily'
+    # url name -> labels its content comes from
+    pages = {
+        'home': ['exams', 'announcements', 'admit_cards', 'results'],
+        'notes': ['notes'],
+        'upcoming_exams': ['exams'],
+        'announcements': ['announcements'],
+        'admit_cards': ['admit_cards'],
+        'results': ['results'],
+        'answer_keys': ['answer_keys'],
+        'about_us': [],
+        'privacy_policy': [],
+        'terms_conditions': [],
+        'refund_policy': [],
+        'disclaimer': [],
+    }
+
+    def items(self):
+        return list(self.pages)
+
+    def location(self, item):
+        return reverse(item)
+
+    def lastmod(self, item):
+        return max((last_changed(label) for label in self.pages[item]), default=None)
+
+
+class ExamSitemap(Sitemap):
+    changefreq = 'weekly'
+    limit = SITEMAP_SHARD_SIZE
+
+    def items(self):
+        return UpcomingExam.objects.filter(is_active=True).only('id', 'updated_at').order_by('id')
+
+    def location(self, exam):
+        return reverse('exam_detail', kwargs={'exam_id': exam.id})
+
+    def lastmod(self, exam):
+        return exam.updated_at
+
+
+class NoteCategorySitemap(Sitemap):
+    changefreq = 'weekly'
+    limit = SITEMAP_SHARD_SIZE
+
+    def items(self):
+        return (
+            ExamCategory.objects
+            .annotate(latest_note=Max('subject__note__updated_at'))
+            .only('slug')
+            .order_by('id')
+        )
+
+    def location(self, category):
+        return reverse('notes_by_category', kwargs={'category_slug': category.slug})
+
+    def lastmod(self, category):
+        return category.latest_note
+
+
+SITEMAPS = {'pages': PageSitemap, 'exams': ExamSitemap, 'notes': NoteCategorySitemap}
+SITEMAP_LABELS = {'pages': list(LABEL_MODELS), 'exams': ['exams'], 'notes': ['notes']}
+
+
+# Feeds
+
+class ContentFeed(Feed):
+    model = None
+    related = []
+    date_field = 'created_at'
+    item_guid_is_permalink = False
+
+    def items(self):
+        return (
+            self.model.objects.filter(is_active=True)
+            .select_related(*self.related)
+            .order_by(f'-{self.date_field}', '-id')[:FEED_SIZE]
+        )
+
+    def item_guid(self, item):
+        return f'{self.model._meta.model_name}-{item.id}'
+
+    def item_pubdate(self, item):
+        return item.created_at
+
+    def item_updateddate(self, item):
+        return item.updated_at
+
+    def exam_link(self, item):
+        return reverse('exam_detail', kwargs={'exam_id': item.exam_id})
+
+
+class AnnouncementFeed(ContentFeed):
+    model = Announcement
+    title = 'Announcements'
+    link = reverse_lazy('announcements')
+    description = 'Latest government exam announcements'
+
+    def item_title(self, item):
+        return item.title
+
+    def item_description(self, item):
+        return item.summary
+
+    def item_link(self, item):
+        return f"{reverse('announcements')}#announcement-{item.id}"
+
+
+class AdmitCardFeed(ContentFeed):
+    model = AdmitCard
+    related = ['exam']
+    title = 'Admit Cards'
+    link = reverse_lazy('admit_cards')
+    description = 'Newly released admit cards'
+
+    def item_description(self, item):
+        return f'{item.exam.title}: released {item.release_date:%d %b %Y}'
+
+    def item_link(self, item):
+        return item.download_link or self.exam_link(item)
+
+
+class ResultFeed(ContentFeed):
+    model = Result
+    related = ['exam']
+    title = 'Results'
+    link = reverse_lazy('results')
+    description = 'Newly declared exam results'
+
+    def item_description(self, item):
+        return f'{item.exam.title}: declared {item.result_date:%d %b %Y}'
+
+    def item_link(self, item):
+        return item.result_link or self.exam_link(item)
+
+
+class AnswerKeyFeed(ContentFeed):
+    model = AnswerKey
+    related = ['exam']
+    title = 'Answer Keys'
+    link = reverse_lazy('answer_keys')
+    description = 'Newly released answer keys'
+
+    def item_description(self, item):
+        return f'{item.exam.title} ({item.get_exam_type_display()}): released {item.release_date:%d %b %Y}'
+
+    def item_link(self, item):
+        return item.get_download_url() or self.exam_link(item)
+
+
+FEEDS = {
+    'announcements': AnnouncementFeed,
+    'admit_cards': AdmitCardFeed,
+    'results': ResultFeed,
+    'answer_keys': AnswerKeyFeed,
+}
+
+
+# Views
+
+def crawler_cached(labels):
+    """Cache a view's 200 responses until ``labels`` change; ``labels`` may be a callable of the URL kwargs."""
+    def changed(kwargs):
+        return max((last_changed(label) for label in (labels(**kwargs) if callable(labels) else labels)),
+                   default=EPOCH)
+
+    def decorator(view):
+        @wraps(view)
+        @condition(last_modified_func=lambda request, *args, **kwargs: changed(kwargs))
+        def wrapper(request, *args, **kwargs):
+            # Sitemaps and feeds hold absolute URLs, so the host and scheme are part of the key
+            url = f'{request.scheme}://{request.get_host()}{request.get_full_path()}'
+            path = hashlib.md5(url.encode()).hexdigest()
+            key = f'examportal:crawl:{path}:{changed(kwargs).timestamp()}'
+            cached = cache.get(key)
+            if cached is None:
+                response = view(request, *args, **kwargs)
+                if hasattr(response, 'render'):
+                    response.render()
+                if response.status_code != 200:
+                    return response
+                cached = (response.content, response['Content-Type'])
+                cache.set(key, cached, changed_timeout() or CRAWL_CACHE_SECONDS)
+            return HttpResponse(cached[0], content_type=cached[1])
+        return wrapper
+    return decorator
+
+
+@crawler_cached(SITEMAP_LABELS['pages'])
+def sitemap_index(request):
+    return sitemap_views.index(request, SITEMAPS, sitemap_url_name='sitemap_section')
+
+
+@crawler_cached(lambda section: SITEMAP_LABELS.get(section, []))
+def sitemap_section(request, section):
+    return sitemap_views.sitemap(request, SITEMAPS, section=section)
+
+
+@crawler_cached(lambda kind, feed_format: [kind] if kind in FEEDS else [])
+def feed(request, kind, feed_format):
+    if kind not in FEEDS or feed_format not in ('rss', 'atom'):
+        raise Http404('No such feed')
+    view = FEEDS[kind]()
+    if feed_format == 'atom':
+        view.feed_type = Atom1Feed
+        view.subtitle = view.description
+    return view(request)
+
+
+def _content_changed(sender, using, **kwargs):
+    # Marking before the commit would let a request rebuild from the old rows under the new time.
+    transaction.on_commit(lambda: mark_changed(MODEL_LABELS[sender]), using=using)
+
+
+for _model in MODEL_LABELS:
+    post_save.connect(_content_changed, sender=_model, dispatch_uid=f'crawl-save-{_model.__name__}')
+    post_delete.connect(_content_changed, sender=_model, dispatch_uid=f'crawl-delete-{_model.__name__}')
@@ -0,0 +1,124 @@
+"""
+Read-replica routing for the read-only public views.
+
+``ReplicaRoutingMiddleware`` marks requests for the views in
+``REPLICA_READ_VIEWS``; while a marked request runs, ``ReplicaRouter`` sends
+its reads to one of ``settings.DATABASE_REPLICAS``. Once that request writes,
+it is pinned to ``default`` so it can read its own writes. A replica that
+fails to connect is skipped for ``REPLICA_RETRY_SECONDS`` and reads fall back
+to ``default``. Every other request, management command and test uses
+``default`` as before.
+"""
+import random
+import time
+from contextvars import ContextVar
+
+from asgiref.sync import iscoroutinefunction, markcoroutinefunction
+from django.conf import settings
+from django.db import DEFAULT_DB_ALIAS, connections
+from django.urls import Resolver404, resolve
+
+REPLICA_READ_VIEWS = {
+    'home', 'notes', 'notes_by_category', 'upcoming_exams', 'announcements',
+    'admit_cards', 'results', 'answer_keys', 'search', 'exam_detail',
+    'sitemap_index', 'sitemap_section', 'feed', 'eligible_exams', 'eligible_exams_api',
+    'exam_stats', 'leaderboard',
+}
+# Sessions and users stay on the primary so a fresh login is never lost to
+# replication lag; only portal content is read from replicas.
+REPLICA_APP_LABELS = {'examportal'}
+REPLICA_RETRY_SECONDS = 30
+
+# None outside a replica-eligible request, otherwise a dict with the pin state.
+_request_state = ContextVar('examportal_replica_request', default=None)
+_unavailable_until = {}
+
+
+def get_replicas():
+    return list(getattr(settings, 'DATABASE_REPLICAS', []))
+
+
+def replica_available(alias):
+    if _unavailable_until.get(alias, 0) > time.monotonic():
+        return False
+    try:
+        connections[alias].ensure_connection()
+    except Exception:
+        _unavailable_until[alias] = time.monotonic() + REPLICA_RETRY_SECONDS
+        return False
+    _unavailable_until.pop(alias, None)
+    return True
+
+
+def use_replicas():
+    """Start routing reads to replicas for the current request."""
+    return _request_state.set({'pinned': False})
+
+
+def stop_using_replicas(token):
+    _request_state.reset(token)
+
+
+def pin_to_primary():
+    state = _request_state.get()
+    if state is not None:
+        state['pinned'] = True
+
+
+class ReplicaRouter:
+    def db_for_read(self, model, **hints):
+        state = _request_state.get()
+        if state is None or state['pinned'] or model._meta.app_label not in REPLICA_APP_LABELS:
+            return None
+        replicas = [alias for alias in get_replicas() if replica_available(alias)]
+        if not replicas:
+            return DEFAULT_DB_ALIAS
+        return random.choice(replicas)
+
+    def db_for_write(self, model, **hints):
+        pin_to_primary()
+        return DEFAULT_DB_ALIAS
+
+    def allow_relation(self, obj1, obj2, **hints):
+        aliases = {DEFAULT_DB_ALIAS, *get_replicas()}
+        if obj1._state.db in aliases and obj2._state.db in aliases:
+            return True
+        return None
+
+
+class ReplicaRoutingMiddleware:
+    sync_capable = True
+    async_capable = True
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+        self.async_mode = iscoroutinefunction(get_response)
+        if self.async_mode:
+            markcoroutinefunction(self)
+
+    def start(self, request):
+        if request.method not in ('GET', 'HEAD') or not get_replicas():
+            return None
+        try:
+            url_name = resolve(request.path_info).url_name
+        except Resolver404:
+            return None
+        return use_replicas() if url_name in REPLICA_READ_VIEWS else None
+
+    def __call__(self, request):
+        if self.async_mode:
+            return self.__acall__(request)
+        token = self.start(request)
+        try:
+            return self.get_response(request)
+        finally:
+            if token is not None:
+                stop_using_replicas(token)
+
+    async def __acall__(self, request):
+        token = self.start(request)
+        try:
+            return await self.get_response(request)
+        finally:
+            if token is not None:
+                stop_using_replicas(token)
@@ -0,0 +1,117 @@
+"""
+Eligibility matching: which active exams a candidate can apply for.
+
+Age limits are checked as on the exam's last date of application. On save
+each ``UpcomingExam`` turns ``age_min``/``age_max`` into the range of dates
+of birth it accepts, ``dob_earliest``..``dob_latest``. Either end is empty
+when there is no limit on that side. Category relaxation only raises the
+upper age limit, so rather than widening every stored range the candidate's
+date of birth is moved forward by the relaxation instead. A lookup is then
+two indexed date comparisons however many exams there are.
+
+``educational_qualification`` is free text. ``parse_qualification`` maps it
+to the lowest level it mentions, stored as ``qualification_level``. Levels
+named only in a marks condition, as in "Bachelor's degree with 60% marks in
+12th", qualify another level rather than offer an alternative, so they are
+skipped unless the text names nothing else. An exam
+matches a candidate whose level is at least that. Level 0 means the text was
+not recognised. Such exams are still listed, and the candidate should check
+the notification. Percentage requirements are not matched.
+
+The functions only read attributes, so migrations can use them with
+historical models.
+"""
+import re
+from datetime import timedelta
+
+from django.db.models import Q
+
+# Exam fields the stored index is derived from
+ELIGIBILITY_FIELDS = ['application_end', 'age_min', 'age_max', 'educational_qualification']
+
+NOT_SPECIFIED, TENTH, TWELFTH, DIPLOMA, GRADUATE, POST_GRADUATE = range(6)
+QUALIFICATION_LEVELS = [
+    (NOT_SPECIFIED, 'Not specified'),
+    (TENTH, '10th pass'),
+    (TWELFTH, '12th pass'),
+    (DIPLOMA, 'Diploma / ITI'),
+    (GRADUATE, 'Graduate'),
+    (POST_GRADUATE, 'Post graduate'),
+]
+# Highest level first: a match is blanked out so "post graduate" is not
+# also read as "graduate".
+QUALIFICATION_PATTERNS = [
+    (POST_GRADUATE, r"post[\s-]?graduat\w*(?: degree)?|master'?s?(?: degree)?|\bm\.(?:a|sc|com|tech|e)\b|\bm(?:sc|com|tech|ba|ca)\b|\bpg\b"),
+    (GRADUATE, r"graduat\w*|bachelor'?s?|\bdegree\b|\bb\.(?:a|sc|com|tech|e|ed)\b|\bb(?:sc|com|tech|ed|ca)\b|\bllb\b"),
+    (DIPLOMA, r'diploma|\biti\b|polytechnic'),
+    (TWELFTH, r'12th|\bclass (?:xii|12)\b|10\s?\+\s?2|intermediate|(?:higher|senior) secondary|\bhsc\b'),
+    (TENTH, r'10th|\bclass (?:x|10)\b|matric\w*|high school|(?<!senior )(?<!higher )secondary'),
+]
+# "60% marks in 12th", up to the end of the clause
+MARKS_CONDITION = r'(?:%|\bmarks|\bpercent\w*)\s+(?:in|at)\b[^,;.()]*'
+
+# Upper age limit relaxation in years (central government norms)
+CATEGORY_RELAXATION = {
+    'general': 0,
+    'ews': 0,
+    'obc': 3,
+    'sc_st': 5,
+    'pwd': 10,
+}
+CATEGORY_CHOICES = [
+    ('general', 'General'),
+    ('ews', 'EWS'),
+    ('obc', 'OBC'),
+    ('sc_st', 'SC/ST'),
+    ('pwd', 'PwD'),
+]
+
+
+def lowest_level(text):
+    found = []
+    for level, pattern in QUALIFICATION_PATTERNS:
+        text, matches = re.subn(pattern, ' ', text)
+        if matches:
+            found.append(level)
+    return min(found, default=NOT_SPECIFIED)
+
+
+def parse_qualification(text):
+    """The lowest qualification level ``text`` asks for, or ``NOT_SPECIFIED``."""
+    text = ' '.join((text or '').lower().split())
+    return lowest_level(re.sub(MARKS_CONDITION, ' ', text)) or lowest_level(text)
+
+
+def add_years(day, years):
+    try:
+        return day.replace(year=day.year + years)
+    except ValueError:  # 29 February in a non-leap year
+        return day.replace(year=day.year + years, day=28)
+
+
+def dob_bounds(exam):
+    """``(earliest, latest)`` accepted dates of birth; ``None`` where there is no limit."""
+    cutoff = exam.application_end
+    if cutoff is None:
+        return None, None
+    earliest = latest = None
+    if exam.age_max is not None:
+        # Still age_max on the cutoff: born after the day they would turn age_max + 1
+        earliest = add_years(cutoff, -(exam.age_max + 1)) + timedelta(days=1)
+    if exam.age_min is not None:
+        latest = add_years(cutoff, -exam.age_min)
+    return earliest, latest
+
+
+def eligibility_filter(dob, category='general', level=NOT_SPECIFIED):
+    """A ``Q`` matching exams open to a candidate born on ``dob``."""
+    relaxed_dob = add_years(dob, CATEGORY_RELAXATION.get(category, 0))
+    return (
+        (Q(dob_latest__isnull=True) | Q(dob_latest__gte=dob)) &
+        (Q(dob_earliest__isnull=True) | Q(dob_earliest__lte=relaxed_dob)) &
+        Q(qualification_level__lte=level)
+    )
+
+
+def age_on(dob, day):
+    return day.year - dob.year - ((day.month, day.day) < (dob.month, dob.day))
@@ -0,0 +1,98 @@
+"""
+Structured copies of the free-text vacancy and fee fields.
+
+``vacancy_breakdown`` is typed by hand as JSON or as lines like
+"General: 400" or "OBC (NCL) - 1,020". ``fee_general`` and the other fee
+fields hold text like "Rs. 100", "₹500/-" or "Nil". ``UpcomingExam.save()``
+parses them into ``vacancies``, a ``{category: posts}`` dict keyed by
+``RESERVATION_CATEGORIES`` where the label is recognised, and into the
+integer ``*_amount`` fee columns in rupees. That lets reports sum and sort
+in the database. Parsing is tolerant. Unrecognised labels are kept under a
+slug of the label, totals are skipped, and fees with no amount stay empty.
+The text fields are still what the pages show.
+
+The functions only read attributes, so migrations can use them with
+historical models.
+"""
+import json
+import re
+
+from django.utils.text import slugify
+
+RESERVATION_CATEGORIES = ['general', 'ews', 'obc', 'sc', 'st', 'pwd', 'esm']
+CATEGORY_ALIASES = {
+    'general': 'general', 'gen': 'general', 'ur': 'general', 'unreserved': 'general',
+    'ews': 'ews',
+    'obc': 'obc', 'obc-ncl': 'obc',
+    'sc': 'sc',
+    'st': 'st',
+    'pwd': 'pwd', 'pwbd': 'pwd', 'ph': 'pwd',
+    'esm': 'esm', 'ex-servicemen': 'esm', 'ex-serviceman': 'esm',
+}
+SKIPPED_LABELS = {'total', 'total-posts', 'total-vacancies', 'grand-total'}
+# "OBC (NCL) - 1,020 posts": a label, an optional separator, then the count
+VACANCY_LINE = re.compile(r'^\s*([^\W\d_][^:=\d]*?)\s*[:=\-–]?\s*(\d[\d,]*)\b')
+FEE_FIELDS = ['fee_general', 'fee_obc', 'fee_sc_st', 'fee_female']
+NO_FEE = re.compile(r'\b(nil|free|exempt\w*|no fee|not applicable)\b', re.IGNORECASE)
+AMOUNT = re.compile(r'\d[\d,]*(?:\.\d+)?')
+
+
+def category_key(label):
+    slug = slugify(label.replace('/', ' '))
+    return CATEGORY_ALIASES.get(slug, slug)
+
+
+def _count(value):
+    try:
+        return int(str(value).replace(',', ''))
+    except ValueError:
+        return None
+
+
+def _add(vacancies, label, value):
+    key = category_key(str(label))
+    count = _count(value)
+    if key and key not in SKIPPED_LABELS and count is not None:
+        vacancies[key] = vacancies.get(key, 0) + count
+
+
+def parse_vacancies(text):
+    """``{category: posts}`` from JSON or "Label: count" text; ``{}`` when nothing parses."""
+    text = (text or '').strip()
+    vacancies = {}
+    try:
+        data = json.loads(text)
+    except ValueError:
+        data = None
+    if isinstance(data, dict):
+        for label, value in data.items():
+            _add(vacancies, label, value)
+        return vacancies
+    if isinstance(data, list):
+        for row in data:
+            if isinstance(row, dict) and 'category' in row:
+                _add(vacancies, row['category'], row.get('count', row.get('posts')))
+        return vacancies
+    # Commas separate entries only when a label follows, so "1,020" stays one number.
+    for segment in re.split(r'[\n;|]+|,(?=\s*[^\W\d_])', text):
+        match = VACANCY_LINE.match(segment)
+        if match:
+            _add(vacancies, match.group(1), match.group(2))
+    return vacancies
+
+
+def parse_fee(text):
+    """The first fee amount in whole rupees; 0 for "Nil"/"Exempted" without one, else ``None``.
+
+    An amount wins over exemption wording, as in "Rs. 100/- (SC/ST exempted)".
+    """
+    text = text or ''
+    match = AMOUNT.search(text)
+    if match is not None:
+        return int(float(match.group().replace(',', '')))
+    return 0 if NO_FEE.search(text) else None
+
+
+def fee_amounts(exam):
+    """``{'fee_general_amount': ..., ...}`` for the fee text fields of ``exam``."""
+    return {f'{field}_amount': parse_fee(getattr(exam, field)) for field in FEE_FIELDS}
@@ -0,0 +1,140 @@
+"""
+Faceted filtering and sorting for the upcoming exams page.
+
+``parse_filters`` cleans the query string into a filter state. Unknown or
+malformed values are dropped. ``filter_exams`` applies that state to active
+exams. ``facet_counts`` returns the per-category counts plus the open-now and
+vacancy-bucket counts from one grouped query. Categories with no matching
+exams are left out, except the selected one, which is listed with a count of
+0. That query uses every filter except the category, so each category shows
+how many exams selecting it would give, and ``all_total`` is what clearing
+the category would give. Facet counts are cached per filter state and keyed by
+``crawlers.last_changed('exams')`` and today's date, so any exam or category
+change gives a fresh key.
+"""
+import hashlib
+from datetime import date
+
+from django.core.cache import cache
+from django.db.models import Count, F, Q
+from django.utils import timezone
+
+from . import crawlers
+from .models import ExamCategory, UpcomingExam
+
+FACET_CACHE_SECONDS = 600
+VACANCY_BUCKETS = [100, 1000, 10000]
+SORTS = {
+    'exam_date': ['exam_date', 'id'],
+    'deadline': ['application_end', 'id'],
+    'vacancies': ['-total_vacancies', 'id'],
+    'newest': ['-created_at', '-id'],
+    'fee': [F('fee_general_amount').asc(nulls_last=True), 'id'],
+}
+
+
+def _int(value):
+    try:
+        number = int(value)
+    except (TypeError, ValueError):
+        return None
+    return number if number >= 0 else None
+
+
+def _date(value):
+    try:
+        return date.fromisoformat(value)
+    except (TypeError, ValueError):
+        return None
+
+
+def parse_filters(params):
+    filters = {
+        'category': params.get('category') or None,
+        'open': params.get('open') == '1' or None,
+        'age': _int(params.get('age')),
+        'min_vacancies': _int(params.get('min_vacancies')),
+        'exam_from': _date(params.get('exam_from')),
+        'exam_to': _date(params.get('exam_to')),
+        'sort': params.get('sort') if params.get('sort') in SORTS else None,
+    }
+    return {name: value for name, value in filters.items() if value is not None}
+
+
+def open_now(today=None):
+    today = today or timezone.localdate()
+    return Q(application_start__lte=today, application_end__gte=today)
+
+
+def _filtered(filters, include_category=True):
+    exams = UpcomingExam.objects.filter(is_active=True)
+    if include_category and 'category' in filters:
+        exams = exams.filter(exam_category__slug=filters['category'])
+    if filters.get('open'):
+        exams = exams.filter(open_now())
+    if 'age' in filters:
+        age = filters['age']
+        exams = exams.filter(Q(age_min__isnull=True) | Q(age_min__lte=age),
+                             Q(age_max__isnull=True) | Q(age_max__gte=age))
+    if 'min_vacancies' in filters:
+        exams = exams.filter(total_vacancies__gte=filters['min_vacancies'])
+    if 'exam_from' in filters:
+        exams = exams.filter(exam_date__gte=filters['exam_from'])
+    if 'exam_to' in filters:
+        exams = exams.filter(exam_date__lte=filters['exam_to'])
+    return exams
+
+
+def filter_exams(filters):
+    return (
+        _filtered(filters)
+        .select_related('exam_category')
+        .order_by(*SORTS[filters.get('sort', 'exam_date')])
+    )
+
+
+def facet_key(filters):
+    state = '&'.join(f'{name}={filters[name]}' for name in sorted(filters) if name != 'sort')
+    version = f"{crawlers.last_changed('exams').timestamp()}:{timezone.localdate().isoformat()}"
+    return f"examportal:exam-facets:{version}:{hashlib.md5(state.encode()).hexdigest()}"
+
+
+def compute_facets(filters):
+    aggregates = {'total': Count('id'), 'open_now': Count('id', filter=open_now())}
+    for bucket in VACANCY_BUCKETS:
+        aggregates[f'vacancies_{bucket}'] = Count('id', filter=Q(total_vacancies__gte=bucket))
+    rows = list(
+        _filtered(filters, include_category=False)
+        .values('exam_category__slug', 'exam_category__name')
+        .annotate(**aggregates)
+        .order_by()
+    )
+    selected = filters.get('category')
+    # Open/vacancy counts follow the category selection; category counts ignore it.
+    in_scope = [row for row in rows if not selected or row['exam_category__slug'] == selected]
+    categories = [
+        {'slug': row['exam_category__slug'], 'name': row['exam_category__name'], 'count': row['total']}
+        for row in rows
+    ]
+    if selected and not in_scope:
+        # Keep the selection visible in the dropdown even when nothing matches it.
+        categories += [
+            {'slug': selected, 'name': name, 'count': 0}
+            for name in ExamCategory.objects.filter(slug=selected).values_list('name', flat=True)
+        ]
+    return {
+        'categories': sorted(categories, key=lambda category: category['name']),
+        'all_total': sum(row['total'] for row in rows),
+        'total': sum(row['total'] for row in in_scope),
+        'open_now': sum(row['open_now'] for row in in_scope),
+        'vacancies': {bucket: sum(row[f'vacancies_{bucket}'] for row in in_scope) for bucket in VACANCY_BUCKETS},
+    }
+
+
+def facet_counts(filters):
+    key = facet_key(filters)
+    facets = cache.get(key)
+    if facets is None:
+        facets = compute_facets(filters)
+        cache.set(key, facets, FACET_CACHE_SECONDS)
+    return facets
@@ -0,0 +1,58 @@
+"""
+Vacancy and fee reports over active exams, computed in the database.
+
+``category_stats`` makes one grouped query per exam category. For each one
+it returns the number of exams, the total posts, the posts per reservation
+category (summed from the ``vacancies`` JSON) and the lowest and average
+general fee. ``cached_category_stats`` keeps the result in the cache. The key
+uses ``crawlers.last_changed('exams')``, so any exam or category change gives
+a fresh key.
+"""
+from django.core.cache import cache
+from django.db.models import Avg, Count, IntegerField, Min, Sum
+from django.db.models.fields.json import KT
+from django.db.models.functions import Cast
+
+from . import crawlers
+from .exam_data import RESERVATION_CATEGORIES
+from .models import UpcomingExam
+
+STATS_CACHE_SECONDS = 600
+
+
+def category_stats():
+    aggregates = {
+        'exams': Count('id'),
+        'total_vacancies': Sum('total_vacancies'),
+        'min_fee': Min('fee_general_amount'),
+        'avg_fee': Avg('fee_general_amount'),
+    }
+    for category in RESERVATION_CATEGORIES:
+        aggregates[f'vacancies_{category}'] = Sum(Cast(KT(f'vacancies__{category}'), IntegerField()))
+    rows = (
+        UpcomingExam.objects.filter(is_active=True)
+        .values('exam_category__slug', 'exam_category__name')
+        .annotate(**aggregates)
+        .order_by('exam_category__name')
+    )
+    return [
+        {
+            'slug': row['exam_category__slug'],
+            'name': row['exam_category__name'],
+            'exams': row['exams'],
+            'total_vacancies': row['total_vacancies'] or 0,
+            'vacancies': {category: row[f'vacancies_{category}'] or 0 for category in RESERVATION_CATEGORIES},
+            'min_fee': row['min_fee'],
+            'avg_fee': round(row['avg_fee']) if row['avg_fee'] is not None else None,
+        }
+        for row in rows
+    ]
+
+
+def cached_category_stats():
+    key = f"examportal:exam-stats:{crawlers.last_changed('exams').timestamp()}"
+    stats = cache.get(key)
+    if stats is None:
+        stats = category_stats()
+        cache.set(key, stats, STATS_CACHE_SECONDS)
+    return stats
@@ -1,6 +1,7 @@
 from django import forms
 from django.contrib.auth.forms import UserCreationForm, AuthenticationForm
 from django.contrib.auth.models import User
+from .eligibility import CATEGORY_CHOICES, QUALIFICATION_LEVELS
 from .models import UserProfile, Contact
 
 class CustomUserCreationForm(UserCreationForm):
@@ -61,4 +62,15 @@ class ContactForm(forms.ModelForm):
             'email': forms.EmailInput(attrs={'class': 'form-control', 'placeholder': 'Your Email'}),
             'subject': forms.TextInput(attrs={'class': 'form-control', 'placeholder': 'Subject'}),
             'message': forms.Textarea(attrs={'class': 'form-control', 'placeholder': 'Your Message', 'rows': 4}),
-        }
\ No newline at end of file
+        }
+
+class EligibilityForm(forms.Form):
+    dob = forms.DateField(label='Date of birth', widget=forms.DateInput(attrs={'class': 'form-control', 'type': 'date'}))
+    category = forms.ChoiceField(choices=CATEGORY_CHOICES, initial='general', widget=forms.Select(attrs={
+        'class': 'form-control'
+    }))
+    qualification = forms.TypedChoiceField(
+        label='Highest qualification', coerce=int, choices=QUALIFICATION_LEVELS[1:],
+        widget=forms.Select(attrs={'class': 'form-control'})
+    )
+    open_only = forms.BooleanField(label='Applications open now', required=False)
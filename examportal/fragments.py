@@ -0,0 +1,60 @@
+"""
+Fragment caching for the home page.
+
+The home page's shared sections (categories, exams, announcements, admit
+cards, results) are the same for every visitor, so ``index.html`` wraps them
+in a ``{% cache %}`` block keyed by ``home_fragment_version()``. The header
+and greeting stay outside the block, which lets the cached HTML be served to
+logged-in users too. The views pass lazy querysets, so on a cache hit none of
+the section queries run.
+
+The version is a counter in the cache, combined with today's date because
+``is_open_for_application`` depends on the date. Saving or deleting any
+model shown in those sections bumps the counter.
+"""
+from django.core.cache import cache
+from django.core.cache.utils import make_template_fragment_key
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+from django.utils import timezone
+
+from .models import AdmitCard, Announcement, ExamCategory, Result, Subject, UpcomingExam
+
+HOME_FRAGMENT_SECONDS = 600
+HOME_VERSION_KEY = 'examportal:home-version'
+
+
+def home_fragment_version():
+    version = cache.get_or_set(HOME_VERSION_KEY, 1, None)
+    return f'{version}:{timezone.localdate().isoformat()}'
+
+
+def home_fragment_key(version=None):
+    return make_template_fragment_key('home_sections', [version or home_fragment_version()])
+
+
+def home_fragment_context():
+    return {'home_fragment_seconds': HOME_FRAGMENT_SECONDS, 'home_fragment_version': home_fragment_version()}
+
+
+def bump_home_version():
+    try:
+        cache.incr(HOME_VERSION_KEY)
+    except ValueError:
+        cache.set(HOME_VERSION_KEY, 1, None)
+
+
+@receiver(post_save, sender=ExamCategory)
+@receiver(post_delete, sender=ExamCategory)
+@receiver(post_save, sender=Subject)
+@receiver(post_delete, sender=Subject)
+@receiver(post_save, sender=UpcomingExam)
+@receiver(post_delete, sender=UpcomingExam)
+@receiver(post_save, sender=Announcement)
+@receiver(post_delete, sender=Announcement)
+@receiver(post_save, sender=AdmitCard)
+@receiver(post_delete, sender=AdmitCard)
+@receiver(post_save, sender=Result)
+@receiver(post_delete, sender=Result)
+def _home_content_changed(sender, **kwargs):
+    bump_home_version()
@@ -0,0 +1,148 @@
+"""
+Heartbeat-based study session tracking.
+
+Clients call the heartbeat endpoint every ``STUDY_HEARTBEAT_SECONDS`` while a
+session is open. Heartbeats only touch ``HeartbeatBuffer`` in memory. The
+buffer keeps the latest beat per session and flushes them as a single
+``bulk_update`` of ``last_heartbeat``/``duration_minutes`` at most once every
+``STUDY_HEARTBEAT_FLUSH_SECONDS`` per worker. ``sweep_stale_sessions`` closes
+sessions whose last heartbeat is older than ``STUDY_SESSION_STALE_SECONDS``,
+such as a closed tab. Sessions from clients that never send heartbeats stay
+open until they are ended explicitly, or until they are
+``STUDY_SESSION_ABANDONED_SECONDS`` old. The sweep runs opportunistically
+after flushes and from the ``sweep_study_sessions`` command. The write rate
+therefore depends on the number of workers, not the number of students.
+
+Nothing is flushed when a worker exits. A restart loses at most one flush
+interval of heartbeats, and the sweep closes those sessions at their last
+written heartbeat.
+"""
+import threading
+import time
+from datetime import timedelta
+
+from django.conf import settings
+from django.db.models import F, Q
+from django.db.models.functions import Coalesce
+from django.utils import timezone
+
+from . import heatmap, leaderboards
+from .models import UserStudySession
+from .sqlite import serialized_write
+
+
+def heartbeat_seconds():
+    return getattr(settings, 'STUDY_HEARTBEAT_SECONDS', 60)
+
+
+def flush_seconds():
+    return getattr(settings, 'STUDY_HEARTBEAT_FLUSH_SECONDS', 30)
+
+
+def stale_seconds():
+    return getattr(settings, 'STUDY_SESSION_STALE_SECONDS', 300)
+
+
+def abandoned_seconds():
+    return getattr(settings, 'STUDY_SESSION_ABANDONED_SECONDS', 86400)
+
+
+@serialized_write
+def sweep_stale_sessions(now=None):
+    """Close open sessions that stopped sending heartbeats. Returns the number closed."""
+    now = now or timezone.now()
+    cutoff = now - timedelta(seconds=stale_seconds())
+    abandoned = now - timedelta(seconds=abandoned_seconds())
+    stale = list(
+        UserStudySession.objects
+        .filter(end_time__isnull=True)
+        .filter(Q(last_heartbeat__lt=cutoff) | Q(last_heartbeat__isnull=True, start_time__lt=abandoned))
+        .only('id', 'user_id', 'subject_id', 'start_time', 'duration_minutes')
+    )
+    if not stale:
+        return 0
+    closed = (
+        UserStudySession.objects
+        .filter(id__in=[session.id for session in stale], end_time__isnull=True)
+        .update(end_time=Coalesce(F('last_heartbeat'), F('start_time')))
+    )
+    leaderboards.record_sessions(stale)
+    heatmap.invalidate(session.user_id for session in stale)
+    return closed
+
+
+@serialized_write
+def _write_heartbeats(beats):
+    sessions = [
+        UserStudySession(
+            id=session_id,
+            last_heartbeat=seen,
+            duration_minutes=int((seen - start_time).total_seconds() / 60),
+        )
+        for session_id, (start_time, seen) in beats.items()
+    ]
+    # Sessions that ended meanwhile are left alone.
+    UserStudySession.objects.filter(end_time__isnull=True).bulk_update(
+        sessions, ['last_heartbeat', 'duration_minutes'], batch_size=500
+    )
+    return len(sessions)
+
+
+class HeartbeatBuffer:
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.pending = {}   # session id -> (start_time, last heartbeat)
+        self.known = {}     # session id -> (user id, start_time), validated once
+        self.last_flush = time.monotonic()
+        self.last_sweep = time.monotonic()
+
+    def session_start(self, session_id, user_id):
+        """Start time of an open session owned by ``user_id``, or None."""
+        entry = self.known.get(session_id)
+        if entry is None:
+            row = (
+                UserStudySession.objects
+                .filter(id=session_id, user_id=user_id, end_time__isnull=True)
+                .values_list('start_time', flat=True)
+                .first()
+            )
+            if row is None:
+                return None
+            entry = self.known[session_id] = (user_id, row)
+        return entry[1] if entry[0] == user_id else None
+
+    def beat(self, session_id, user_id, now=None):
+        start_time = self.session_start(session_id, user_id)
+        if start_time is None:
+            return False
+        with self.lock:
+            self.pending[session_id] = (start_time, now or timezone.now())
+        self.flush_if_due()
+        return True
+
+    def discard(self, session_id):
+        """Forget a session that was ended explicitly."""
+        with self.lock:
+            self.pending.pop(session_id, None)
+            self.known.pop(session_id, None)
+
+    def flush_if_due(self):
+        if time.monotonic() - self.last_flush >= flush_seconds():
+            self.flush()
+
+    def flush(self):
+        with self.lock:
+            beats, self.pending = self.pending, {}
+            self.last_flush = time.monotonic()
+            sweep = time.monotonic() - self.last_sweep >= stale_seconds()
+            if sweep:
+                self.last_sweep = time.monotonic()
+        written = _write_heartbeats(beats) if beats else 0
+        if sweep:
+            sweep_stale_sessions()
+            self.known.clear()
+        return written
+
+
+buffer = HeartbeatBuffer()
+
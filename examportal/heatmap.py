@@ -0,0 +1,85 @@
+"""
+Yearly study heatmap.
+
+``daily_minutes`` sums ``duration_minutes`` of the user's ended sessions per
+local day over the last ``HEATMAP_DAYS`` days in one ``GROUP BY`` query. A
+session counts towards the day it started on. ``user_heatmap`` caches the
+result per user in a compact form:
+
+    {"start": "2025-10-20", "end": "2026-10-19", "minutes": [0, 35, 0, ...],
+     "total": 4210, "active_days": 97, "max": 180}
+
+``minutes`` has one entry per day from ``start`` to ``end``, so the client
+lays out the grid without any dates. The entry names its last day, so a
+cached heatmap from yesterday is rebuilt rather than served. Ending a session
+invalidates the user's entry through ``invalidate``.
+"""
+from datetime import datetime, timedelta
+
+from django.contrib.auth.decorators import login_required
+from django.core.cache import cache
+from django.db import transaction
+from django.db.models import Sum
+from django.db.models.functions import TruncDate
+from django.http import JsonResponse
+from django.utils import timezone
+
+from .models import UserStudySession
+
+HEATMAP_DAYS = 365
+HEATMAP_CACHE_SECONDS = 3600
+
+
+def heatmap_key(user_id):
+    return f'examportal:study-heatmap:{user_id}'
+
+
+def daily_minutes(user_id, today=None):
+    """``{date: minutes}`` for the days in the window that have study time."""
+    today = today or timezone.localdate()
+    start = today - timedelta(days=HEATMAP_DAYS - 1)
+    since = timezone.make_aware(datetime.combine(start, datetime.min.time()))
+    return dict(
+        UserStudySession.objects
+        .filter(user_id=user_id, start_time__gte=since, end_time__isnull=False, duration_minutes__gt=0)
+        .annotate(day=TruncDate('start_time'))
+        .values('day')
+        .annotate(minutes=Sum('duration_minutes'))
+        .values_list('day', 'minutes')
+    )
+
+
+def build_heatmap(user_id, today=None):
+    today = today or timezone.localdate()
+    start = today - timedelta(days=HEATMAP_DAYS - 1)
+    by_day = daily_minutes(user_id, today)
+    minutes = [by_day.get(start + timedelta(days=offset), 0) for offset in range(HEATMAP_DAYS)]
+    return {
+        'start': start.isoformat(),
+        'end': today.isoformat(),
+        'minutes': minutes,
+        'total': sum(minutes),
+        'active_days': sum(1 for value in minutes if value),
+        'max': max(minutes),
+    }
+
+
+def user_heatmap(user_id):
+    today = timezone.localdate()
+    heatmap = cache.get(heatmap_key(user_id))
+    if heatmap is None or heatmap['end'] != today.isoformat():
+        heatmap = build_heatmap(user_id, today)
+        cache.set(heatmap_key(user_id), heatmap, HEATMAP_CACHE_SECONDS)
+    return heatmap
+
+
+def invalidate(user_ids):
+    """Drop cached heatmaps once the transaction that ended their sessions commits."""
+    keys = [heatmap_key(user_id) for user_id in set(user_ids)]
+    if keys:
+        transaction.on_commit(lambda: cache.delete_many(keys))
+
+
+@login_required
+def study_heatmap(request):
+    return JsonResponse(user_heatmap(request.user.id))
@@ -0,0 +1,193 @@
+"""
+Study-time leaderboards per exam category.
+
+Summing ``UserStudySession.duration_minutes`` by user and category on every
+page view would scan every session. Instead ``StudyTimeTotal`` keeps one row
+per user, category and period. The period is ``'all'`` for the all-time board
+or the Monday of the week for a weekly board. A session counts towards the
+week it started in.
+
+``record_sessions`` adds the minutes of sessions as they end. It is called by
+``end_study_session``, the sync endpoint and the stale-session sweep.
+``reconcile`` rebuilds the all-time totals and the recent weeks from the
+sessions with grouped queries. That repairs any drift, such as sessions
+edited in the admin. Run it periodically with ``manage.py
+reconcile_leaderboards``; its first run also fills the boards for sessions
+recorded before this table existed.
+
+Reads never touch the totals on a warm cache. Each board has a version in the
+cache, and the top ``LEADERBOARD_SIZE`` and each user's rank are cached under
+that version. The version moves whenever minutes are added to the board, so a
+page costs one cache read for the version and one ``get_many`` for the top
+entries and the caller's rank. On a miss the rank is one indexed count of
+the users ahead.
+"""
+import time
+from collections import Counter
+from datetime import datetime, timedelta
+
+from django.core.cache import cache
+from django.db import transaction
+from django.db.models import Sum
+from django.db.models.functions import TruncWeek
+from django.utils import timezone
+
+from .models import ExamCategory, StudyTimeTotal, Subject, UserStudySession
+from .sqlite import serialized_write
+
+ALL_TIME = 'all'
+PERIODS = {'week': 'This week', 'all': 'All time'}
+LEADERBOARD_SIZE = 20
+LEADERBOARD_CACHE_SECONDS = 600
+RECONCILE_WEEKS = 2
+
+
+def week_period(moment):
+    """The weekly period a moment falls in: the ISO date of its local Monday."""
+    day = timezone.localdate(moment)
+    return (day - timedelta(days=day.weekday())).isoformat()
+
+
+def period_key(period, now=None):
+    return ALL_TIME if period == 'all' else week_period(now or timezone.now())
+
+
+def date_of(period):
+    return datetime.strptime(period, '%Y-%m-%d').date()
+
+
+def version_key(category_id, period):
+    return f'examportal:leaderboard-version:{category_id}:{period}'
+
+
+def board_version(category_id, period):
+    return cache.get_or_set(version_key(category_id, period), time.time_ns, None)
+
+
+def bump_versions(boards):
+    for category_id, period in boards:
+        try:
+            cache.incr(version_key(category_id, period))
+        except ValueError:
+            cache.set(version_key(category_id, period), time.time_ns(), None)
+
+
+@serialized_write
+def record_sessions(sessions):
+    """Add the minutes of just-ended sessions to their users' totals."""
+    sessions = [session for session in sessions if session.duration_minutes > 0]
+    if not sessions:
+        return 0
+    categories = {
+        session.subject_id: session.subject.exam_category_id
+        for session in sessions if UserStudySession.subject.is_cached(session)
+    }
+    missing = {session.subject_id for session in sessions} - set(categories)
+    if missing:
+        categories.update(Subject.objects.filter(id__in=missing).values_list('id', 'exam_category_id'))
+    added = Counter()
+    for session in sessions:
+        category_id = categories.get(session.subject_id)
+        if category_id is None:
+            continue
+        for period in (ALL_TIME, week_period(session.start_time)):
+            added[(category_id, period, session.user_id)] += session.duration_minutes
+
+    with transaction.atomic(savepoint=False):
+        totals = {
+            (total.exam_category_id, total.period, total.user_id): total
+            for total in StudyTimeTotal.objects.select_for_update().filter(
+                exam_category_id__in={key[0] for key in added},
+                period__in={key[1] for key in added},
+                user_id__in={key[2] for key in added},
+            )
+        }
+        changed, created = [], []
+        for (category_id, period, user_id), minutes in added.items():
+            total = totals.get((category_id, period, user_id))
+            if total is None:
+                created.append(StudyTimeTotal(
+                    exam_category_id=category_id, period=period, user_id=user_id, minutes=minutes
+                ))
+            else:
+                total.minutes += minutes
+                changed.append(total)
+        if changed:
+            StudyTimeTotal.objects.bulk_update(changed, ['minutes'])
+        if created:
+            StudyTimeTotal.objects.bulk_create(created)
+        transaction.on_commit(lambda: bump_versions({key[:2] for key in added}))
+    return len(added)
+
+
+@serialized_write
+def reconcile(weeks=RECONCILE_WEEKS, now=None):
+    """Rebuild the all-time totals and the last ``weeks`` weekly totals from the sessions."""
+    now = now or timezone.now()
+    this_week = date_of(week_period(now))
+    periods = [ALL_TIME] + [(this_week - timedelta(weeks=n)).isoformat() for n in range(weeks)]
+    since = timezone.make_aware(datetime.combine(this_week - timedelta(weeks=weeks - 1), datetime.min.time()))
+
+    ended = UserStudySession.objects.filter(end_time__isnull=False, duration_minutes__gt=0)
+    totals = [
+        StudyTimeTotal(user_id=row['user_id'], exam_category_id=row['subject__exam_category_id'],
+                       period=ALL_TIME, minutes=row['minutes'])
+        for row in ended.values('user_id', 'subject__exam_category_id').annotate(minutes=Sum('duration_minutes'))
+    ]
+    totals += [
+        StudyTimeTotal(user_id=row['user_id'], exam_category_id=row['subject__exam_category_id'],
+                       period=timezone.localdate(row['week']).isoformat(), minutes=row['minutes'])
+        for row in ended.filter(start_time__gte=since).annotate(week=TruncWeek('start_time'))
+        .values('user_id', 'subject__exam_category_id', 'week').annotate(minutes=Sum('duration_minutes'))
+    ]
+    with transaction.atomic():
+        StudyTimeTotal.objects.filter(period__in=periods).delete()
+        StudyTimeTotal.objects.bulk_create(totals, batch_size=500)
+        category_ids = list(ExamCategory.objects.values_list('id', flat=True))
+        transaction.on_commit(lambda: bump_versions(
+            {(category_id, period) for category_id in category_ids for period in periods}
+        ))
+    return len(totals)
+
+
+def top_entries(category_id, period):
+    entries, rank, previous = [], 0, None
+    rows = (
+        StudyTimeTotal.objects.filter(exam_category_id=category_id, period=period, minutes__gt=0)
+        .order_by('-minutes', 'user_id')
+        .values_list('user_id', 'user__username', 'minutes')[:LEADERBOARD_SIZE]
+    )
+    for position, (user_id, username, minutes) in enumerate(rows, 1):
+        if minutes != previous:
+            rank, previous = position, minutes
+        entries.append({'rank': rank, 'user_id': user_id, 'username': username, 'minutes': minutes})
+    return entries
+
+
+def user_rank(category_id, period, user_id):
+    """``{'rank', 'minutes'}`` for a user on a board, or None when they have no minutes on it."""
+    board = StudyTimeTotal.objects.filter(exam_category_id=category_id, period=period)
+    minutes = board.filter(user_id=user_id).values_list('minutes', flat=True).first()
+    if not minutes:
+        return None
+    return {'rank': board.filter(minutes__gt=minutes).count() + 1, 'minutes': minutes}
+
+
+def standings(category_id, period, user_id=None):
+    """The cached top entries of a board and, for a signed-in user, their own rank."""
+    version = board_version(category_id, period)
+    top_key = f'examportal:leaderboard:{version}:{category_id}:{period}'
+    rank_key = f'{top_key}:{user_id}'
+    cached = cache.get_many([top_key, rank_key] if user_id else [top_key])
+    top = cached.get(top_key)
+    if top is None:
+        top = top_entries(category_id, period)
+        cache.set(top_key, top, LEADERBOARD_CACHE_SECONDS)
+    mine = None
+    if user_id:
+        mine = cached.get(rank_key)
+        if mine is None:
+            mine = {'entry': user_rank(category_id, period, user_id)}
+            cache.set(rank_key, mine, LEADERBOARD_CACHE_SECONDS)
+        mine = mine['entry']
+    return {'top': top, 'mine': mine}
@@ -0,0 +1,223 @@
+"""
+HTTP load generator for rehearsing traffic spikes against a running server.
+
+Requests either replay an access log (common/combined format or the
+runserver log) or are drawn from a weighted traffic mix such as
+``RESULT_DAY_MIX``. A share of the requests is sent by logged-in seeded users.
+Per URL name the report covers throughput, latency percentiles and error
+rates, so runs against different server or cache configurations can be
+compared directly.
+"""
+import random
+import re
+import threading
+import time
+from collections import defaultdict
+from concurrent.futures import ThreadPoolExecutor
+from http.cookiejar import CookieJar
+from urllib.error import HTTPError, URLError
+from urllib.parse import urlencode, urlsplit
+from urllib.request import HTTPCookieProcessor, HTTPRedirectHandler, Request, build_opener
+
+from django.urls import Resolver404, resolve
+
+# (weight, method, path, requires_login). "{exam_id}" is filled with a random
+# active exam id.
+NORMAL_MIX = [
+    (25, 'GET', '/', False),
+    (10, 'GET', '/notes/', False),
+    (10, 'GET', '/upcoming-exams/', False),
+    (10, 'GET', '/exam/{exam_id}/', False),
+    (8, 'GET', '/search/?q=ssc', False),
+    (5, 'GET', '/announcements/', False),
+    (5, 'GET', '/results/', False),
+    (5, 'GET', '/admit-cards/', False),
+    (5, 'GET', '/answer-keys/', False),
+    (10, 'GET', '/dashboard/', True),
+    (5, 'GET', '/profile/', True),
+    (2, 'GET', '/login/', False),
+]
+
+# Result day: results, admit cards and answer keys take most of the traffic.
+RESULT_DAY_MIX = [
+    (30, 'GET', '/results/', False),
+    (20, 'GET', '/admit-cards/', False),
+    (20, 'GET', '/answer-keys/', False),
+    (10, 'GET', '/', False),
+    (6, 'GET', '/search/?q=result', False),
+    (5, 'GET', '/exam/{exam_id}/', False),
+    (3, 'GET', '/upcoming-exams/', False),
+    (4, 'GET', '/dashboard/', True),
+    (2, 'GET', '/login/', False),
+]
+
+TRAFFIC_MIXES = {
+    'normal': NORMAL_MIX,
+    'result-day': RESULT_DAY_MIX,
+}
+
+LOG_LINE = re.compile(r'"(?P<method>GET|POST|HEAD) (?P<path>\S+) HTTP/[\d.]+"')
+
+
+def read_access_log(path):
+    """Return (method, path) pairs from a common/combined or runserver log."""
+    requests = []
+    with open(path, errors='replace') as handle:
+        for line in handle:
+            match = LOG_LINE.search(line)
+            if match:
+                requests.append((match['method'], match['path']))
+    return requests
+
+
+def url_name_for(path):
+    try:
+        return resolve(urlsplit(path).path).url_name or path
+    except Resolver404:
+        return 'unresolved'
+
+
+def percentile(sorted_values, pct):
+    if not sorted_values:
+        return 0.0
+    index = min(len(sorted_values) - 1, max(0, int(round(pct / 100 * len(sorted_values))) - 1))
+    return sorted_values[index]
+
+
+class NoRedirect(HTTPRedirectHandler):
+    def redirect_request(self, *args, **kwargs):
+        return None
+
+
+class Session:
+    """A cookie-holding HTTP client, optionally logged in as a user."""
+
+    def __init__(self, base_url, timeout):
+        self.base_url = base_url.rstrip('/')
+        self.timeout = timeout
+        self.cookies = CookieJar()
+        self.opener = build_opener(HTTPCookieProcessor(self.cookies), NoRedirect)
+
+    def csrf_token(self):
+        for cookie in self.cookies:
+            if cookie.name == 'csrftoken':
+                return cookie.value
+        return ''
+
+    def request(self, method, path, data=None):
+        body = urlencode(data or {}).encode() if method == 'POST' else None
+        request = Request(self.base_url + path, data=body, method=method)
+        if method == 'POST':
+            request.add_header('X-CSRFToken', self.csrf_token())
+            request.add_header('Referer', self.base_url + '/')
+        try:
+            with self.opener.open(request, timeout=self.timeout) as response:
+                response.read()
+                return response.status
+        except HTTPError as error:
+            error.read()
+            return error.code
+
+    def login(self, username, password):
+        self.request('GET', '/login/')
+        data = {'username': username, 'password': password, 'csrfmiddlewaretoken': self.csrf_token()}
+        return self.request('POST', '/login/', data) == 302
+
+
+class LoadTest:
+    def __init__(self, base_url, concurrency=10, logged_in_ratio=0.2, timeout=30, seed=None):
+        self.base_url = base_url
+        self.concurrency = concurrency
+        self.logged_in_ratio = logged_in_ratio
+        self.timeout = timeout
+        self.rng = random.Random(seed)
+        self.lock = threading.Lock()
+        self.local = threading.local()
+        self.user_sessions = []
+        self.samples = defaultdict(list)
+        self.errors = defaultdict(int)
+        self.statuses = defaultdict(lambda: defaultdict(int))
+
+    def login_users(self, credentials):
+        for username, password in credentials:
+            session = Session(self.base_url, self.timeout)
+            if session.login(username, password):
+                self.user_sessions.append(session)
+        return len(self.user_sessions)
+
+    def synthesize(self, mix, count, exam_ids=()):
+        weights = [entry[0] for entry in mix]
+        requests = []
+        for weight, method, path, requires_login in self.rng.choices(mix, weights=weights, k=count):
+            if '{exam_id}' in path:
+                if not exam_ids:
+                    continue
+                path = path.format(exam_id=self.rng.choice(exam_ids))
+            requests.append((method, path, requires_login))
+        return requests
+
+    def anonymous_session(self):
+        # Each worker thread keeps one anonymous session, like a returning browser.
+        if not hasattr(self.local, 'session'):
+            self.local.session = Session(self.base_url, self.timeout)
+        return self.local.session
+
+    def send(self, method, path, requires_login):
+        logged_in = self.user_sessions and (requires_login or self.rng.random() < self.logged_in_ratio)
+        session = self.rng.choice(self.user_sessions) if logged_in else self.anonymous_session()
+        url_name = url_name_for(path)
+        started = time.perf_counter()
+        try:
+            status = session.request(method, path)
+        except (URLError, OSError):
+            status = 'error'
+        elapsed = time.perf_counter() - started
+        with self.lock:
+            self.samples[url_name].append(elapsed)
+            self.statuses[url_name][status] += 1
+            if status == 'error' or status >= 400:
+                self.errors[url_name] += 1
+
+    def run(self, requests, duration=None):
+        """Send ``requests`` with ``concurrency`` workers; loop them until ``duration`` if given."""
+        deadline = time.perf_counter() + duration if duration else None
+        started = time.perf_counter()
+
+        def worker(offset):
+            i = offset
+            while True:
+                if deadline is None and i >= len(requests):
+                    return
+                if deadline is not None and time.perf_counter() >= deadline:
+                    return
+                self.send(*requests[i % len(requests)])
+                i += self.concurrency
+
+        with ThreadPoolExecutor(max_workers=self.concurrency) as pool:
+            for future in [pool.submit(worker, offset) for offset in range(self.concurrency)]:
+                future.result()
+        return time.perf_counter() - started
+
+    def report(self, elapsed):
+        """Per URL name summary, plus an ``ALL`` row covering every request."""
+        rows = {}
+        all_samples = []
+        for url_name, samples in sorted(self.samples.items()):
+            all_samples.extend(samples)
+            rows[url_name] = self.summarise(samples, self.errors[url_name], elapsed)
+            rows[url_name]['statuses'] = dict(self.statuses[url_name])
+        rows['ALL'] = self.summarise(all_samples, sum(self.errors.values()), elapsed)
+        return rows
+
+    @staticmethod
+    def summarise(samples, errors, elapsed):
+        ordered = sorted(samples)
+        return {
+            'requests': len(ordered),
+            'rps': len(ordered) / elapsed if elapsed else 0.0,
+            'p50': percentile(ordered, 50),
+            'p90': percentile(ordered, 90),
+            'p99': percentile(ordered, 99),
+            'max': ordered[-1] if ordered else 0.0,
+            'error_rate': errors / len(ordered) if ordered else 0.0,
+        }
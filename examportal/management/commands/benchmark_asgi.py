@@ -0,0 +1,155 @@
+import asyncio
+import io
+import statistics
+import time
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import redirect_stdout
+from urllib.parse import urlencode, urlsplit
+
+from django.contrib.auth.models import User
+from django.core.handlers.wsgi import WSGIHandler
+from django.core.management.base import BaseCommand, CommandError
+from django.test import Client, override_settings
+
+from examportal.management.commands.seed_examportal import SEED_USERNAME_PREFIX
+from examportal.models import Subject
+
+CSRF_TOKEN = 'x' * 32
+
+
+class Command(BaseCommand):
+    help = (
+        'Compare throughput of the sync views under WSGI with the async views under ASGI, '
+        'in-process against the seeded database (run seed_examportal first)'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--requests', type=int, default=400, help='Requests per mode')
+        parser.add_argument('--concurrency', type=int, default=20, help='Concurrent requests in flight')
+
+    def handle(self, *args, **options):
+        user = User.objects.filter(username__startswith=SEED_USERNAME_PREFIX).order_by('id').first()
+        subject = Subject.objects.order_by('id').first()
+        if user is None or subject is None:
+            raise CommandError('No seeded data found; run seed_examportal first')
+
+        client = Client()
+        client.force_login(user)
+        cookie = f"sessionid={client.cookies['sessionid'].value}; csrftoken={CSRF_TOKEN}"
+        mix = [
+            ('GET', '/', b''),
+            ('GET', '/results/', b''),
+            ('GET', '/search/?q=ssc', b''),
+            ('POST', '/progress/start-session/', urlencode({'subject_id': subject.id}).encode()),
+        ]
+        requests = [mix[i % len(mix)] for i in range(options['requests'])]
+
+        self.stdout.write(f"{'mode':<8}{'req/s':>9}{'p50 ms':>9}{'p99 ms':>9}{'errors':>8}")
+        # Some sync views print debug output; keep it out of the report. Every request
+        # comes from one user and address, so the rate limiter would answer most with 429.
+        with redirect_stdout(io.StringIO()), override_settings(ROOT_URLCONF='govtexamprep.urls',
+                                                               RATE_LIMIT_ENABLED=False):
+            wsgi = self.run_wsgi(requests, cookie, options['concurrency'])
+        self.report('WSGI', *wsgi)
+        with redirect_stdout(io.StringIO()), override_settings(ROOT_URLCONF='govtexamprep.urls_async',
+                                                               RATE_LIMIT_ENABLED=False):
+            asgi = asyncio.run(self.run_asgi(requests, cookie, options['concurrency']))
+        self.report('ASGI', *asgi)
+
+    def report(self, mode, elapsed, timings, errors):
+        timings.sort()
+        self.stdout.write(
+            f'{mode:<8}{len(timings) / elapsed:>9.1f}{statistics.median(timings) * 1000:>9.1f}'
+            f'{timings[int(len(timings) * 0.99) - 1] * 1000:>9.1f}{errors:>8}'
+        )
+
+    def run_wsgi(self, requests, cookie, concurrency):
+        application = WSGIHandler()
+
+        def call(request):
+            method, path, body = request
+            url = urlsplit(path)
+            environ = {
+                'REQUEST_METHOD': method,
+                'PATH_INFO': url.path,
+                'QUERY_STRING': url.query,
+                'SERVER_NAME': 'localhost',
+                'SERVER_PORT': '80',
+                'SERVER_PROTOCOL': 'HTTP/1.1',
+                'HTTP_HOST': 'localhost',
+                'HTTP_COOKIE': cookie,
+                'HTTP_X_CSRFTOKEN': CSRF_TOKEN,
+                'CONTENT_TYPE': 'application/x-www-form-urlencoded',
+                'CONTENT_LENGTH': str(len(body)),
+                'wsgi.input': io.BytesIO(body),
+                'wsgi.errors': io.StringIO(),
+                'wsgi.url_scheme': 'http',
+                'wsgi.multithread': True,
+                'wsgi.multiprocess': False,
+                'wsgi.run_once': False,
+                'wsgi.version': (1, 0),
+            }
+            statuses = []
+            started = time.perf_counter()
+            response = application(environ, lambda status, headers: statuses.append(int(status[:3])))
+            b''.join(response)
+            response.close()
+            return time.perf_counter() - started, statuses[0]
+
+        started = time.perf_counter()
+        with ThreadPoolExecutor(max_workers=concurrency) as pool:
+            outcomes = list(pool.map(call, requests))
+        elapsed = time.perf_counter() - started
+        return elapsed, [timing for timing, _ in outcomes], sum(status >= 400 for _, status in outcomes)
+
+    async def run_asgi(self, requests, cookie, concurrency):
+        from django.core.asgi import get_asgi_application
+        application = get_asgi_application()
+        semaphore = asyncio.Semaphore(concurrency)
+
+        async def call(request):
+            method, path, body = request
+            url = urlsplit(path)
+            scope = {
+                'type': 'http',
+                'asgi': {'version': '3.0'},
+                'http_version': '1.1',
+                'method': method,
+                'scheme': 'http',
+                'path': url.path,
+                'raw_path': url.path.encode(),
+                'query_string': url.query.encode(),
+                'root_path': '',
+                'headers': [
+                    (b'host', b'localhost'),
+                    (b'cookie', cookie.encode()),
+                    (b'x-csrftoken', CSRF_TOKEN.encode()),
+                    (b'content-type', b'application/x-www-form-urlencoded'),
+                    (b'content-length', str(len(body)).encode()),
+                ],
+                'client': ('127.0.0.1', 50000),
+                'server': ('localhost', 80),
+            }
+            sent = False
+            statuses = []
+
+            async def receive():
+                nonlocal sent
+                if not sent:
+                    sent = True
+                    return {'type': 'http.request', 'body': body, 'more_body': False}
+                await asyncio.Event().wait()
+
+            async def send(message):
+                if message['type'] == 'http.response.start':
+                    statuses.append(message['status'])
+
+            async with semaphore:
+                started = time.perf_counter()
+                await application(scope, receive, send)
+                return time.perf_counter() - started, statuses[0]
+
+        started = time.perf_counter()
+        outcomes = await asyncio.gather(*(call(request) for request in requests))
+        elapsed = time.perf_counter() - started
+        return elapsed, [timing for timing, _ in outcomes], sum(status >= 400 for _, status in outcomes)
@@ -0,0 +1,76 @@
+import statistics
+import time
+from copy import deepcopy
+
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+from django.db.utils import ConnectionHandler
+
+
+class Command(BaseCommand):
+    help = 'Compare per-request connection overhead with fresh, persistent and pooled connections'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--database', default='default', help='Alias whose settings are benchmarked')
+        parser.add_argument('--requests', type=int, default=500, help='Simulated requests per mode')
+        parser.add_argument('--queries', type=int, default=3, help='Queries issued by each simulated request')
+
+    def handle(self, *args, **options):
+        if options['database'] not in settings.DATABASES:
+            raise CommandError(f"Unknown database alias '{options['database']}'")
+        base = deepcopy(settings.DATABASES[options['database']])
+        base.get('OPTIONS', {}).pop('pool', None)
+
+        modes = {
+            'fresh connection': {**base, 'CONN_MAX_AGE': 0},
+            'persistent': {**base, 'CONN_MAX_AGE': 300, 'CONN_HEALTH_CHECKS': True},
+        }
+        if base['ENGINE'] == 'django.db.backends.postgresql':
+            modes['pooled'] = {
+                **base,
+                'CONN_MAX_AGE': 0,
+                'OPTIONS': {**base.get('OPTIONS', {}), 'pool': {'min_size': 1, 'max_size': 4}},
+            }
+
+        self.stdout.write(f"{'mode':<18}{'mean ms':>10}{'p50 ms':>10}{'p99 ms':>10}{'connects':>10}")
+        for name, settings_dict in modes.items():
+            try:
+                timings, connects = self.simulate(settings_dict, options['requests'], options['queries'])
+            except Exception as exc:
+                self.stdout.write(self.style.WARNING(f'{name:<18}skipped: {exc}'))
+                continue
+            timings.sort()
+            self.stdout.write(
+                f'{name:<18}{statistics.mean(timings) * 1000:>10.3f}{timings[len(timings) // 2] * 1000:>10.3f}'
+                f'{timings[int(len(timings) * 0.99) - 1] * 1000:>10.3f}{connects:>10}'
+            )
+
+    def simulate(self, settings_dict, requests, queries):
+        """Mimic Django's request lifecycle: close_old_connections at start and end."""
+        handler = ConnectionHandler({'default': settings_dict})
+        connection = handler['default']
+        connects = 0
+        original_connect = connection.connect
+
+        def counting_connect():
+            nonlocal connects
+            connects += 1
+            original_connect()
+        connection.connect = counting_connect
+
+        timings = []
+        try:
+            for _ in range(requests):
+                started = time.perf_counter()
+                connection.close_if_unusable_or_obsolete()
+                with connection.cursor() as cursor:
+                    for _ in range(queries):
+                        cursor.execute('SELECT 1')
+                        cursor.fetchone()
+                connection.close_if_unusable_or_obsolete()
+                timings.append(time.perf_counter() - started)
+        finally:
+            connection.close()
+            if settings_dict.get('OPTIONS', {}).get('pool'):
+                connection.close_pool()
+        return timings, connects
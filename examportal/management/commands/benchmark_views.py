@@ -0,0 +1,65 @@
+import io
+
+from django.core.management import call_command
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection
+from django.test.utils import setup_test_environment, teardown_test_environment
+
+from examportal.benchmarks import (
+    BENCHMARK_SCALES, VIEW_CASES, find_regressions, load_baselines, run_benchmarks, save_baselines,
+)
+
+
+class Command(BaseCommand):
+    help = 'Benchmark every examportal view on seeded throwaway databases'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--scales', type=float, nargs='+', default=list(BENCHMARK_SCALES),
+                            help='Dataset sizes passed to seed_examportal --scale')
+        parser.add_argument('--repeat', type=int, default=5, help='Timed requests per view')
+        parser.add_argument('--update', action='store_true',
+                            help='Write the measurements to benchmark_baselines.json')
+        parser.add_argument('--views', nargs='+',
+                            help='Only benchmark these URL names; with --update, merge them into the baselines')
+
+    def handle(self, *args, **options):
+        baselines = load_baselines()
+        cases = None
+        if options['views']:
+            cases = [case for case in VIEW_CASES if case.url_name in options['views']]
+            unknown = set(options['views']) - {case.url_name for case in cases}
+            if unknown:
+                raise CommandError(f"No benchmark case for: {', '.join(sorted(unknown))}")
+        regressions = []
+        setup_test_environment()
+        old_name = connection.creation.create_test_db(verbosity=0, autoclobber=True)
+        try:
+            for scale in options['scales']:
+                call_command('flush', interactive=False, verbosity=0)
+                call_command('seed_examportal', scale=scale, stdout=io.StringIO())
+                results = run_benchmarks(repeat=options['repeat'], cases=cases)
+                regressions += self.report(scale, results, baselines.get(str(scale), {}))
+                if options['update']:
+                    baselines.setdefault(str(scale), {}).update(results)
+        finally:
+            connection.creation.destroy_test_db(old_name, verbosity=0)
+            teardown_test_environment()
+
+        if options['update']:
+            save_baselines(baselines)
+            self.stdout.write(self.style.SUCCESS('Baselines updated'))
+        elif regressions:
+            raise CommandError(f'{len(regressions)} regression(s) against benchmark_baselines.json')
+
+    def report(self, scale, results, baseline):
+        self.stdout.write(f'\nScale {scale:g}')
+        self.stdout.write(f"{'view':<24}{'ms':>10}{'queries':>9}{'bytes':>9}{'status':>8}")
+        for url_name, measured in results.items():
+            self.stdout.write(
+                f"{url_name:<24}{measured['seconds'] * 1000:>10.2f}{measured['queries']:>9}"
+                f"{measured['bytes']:>9}{measured['status']:>8}"
+            )
+        regressions = find_regressions(results, baseline)
+        for line in regressions:
+            self.stdout.write(self.style.ERROR(f'REGRESSION {line}'))
+        return regressions
@@ -0,0 +1,75 @@
+import json
+
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+
+from examportal.loadtest import TRAFFIC_MIXES, LoadTest, read_access_log
+from examportal.management.commands.seed_examportal import SEED_USERNAME_PREFIX
+from examportal.models import UpcomingExam
+
+
+class Command(BaseCommand):
+    help = 'Replay or synthesize a traffic mix against a running server and report latency per URL name'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--base-url', default='http://127.0.0.1:8000', help='Server under test')
+        parser.add_argument('--mix', choices=sorted(TRAFFIC_MIXES), default='result-day',
+                            help='Synthesized traffic mix (ignored with --log)')
+        parser.add_argument('--log', help='Access log to replay instead of a synthesized mix')
+        parser.add_argument('--requests', type=int, default=2000, help='Requests to synthesize')
+        parser.add_argument('--duration', type=float,
+                            help='Keep sending for this many seconds, looping over the requests')
+        parser.add_argument('--concurrency', type=int, default=20, help='Concurrent client workers')
+        parser.add_argument('--logged-in-ratio', type=float, default=0.2,
+                            help='Share of anonymous requests sent by logged-in users instead')
+        parser.add_argument('--users', type=int, default=20,
+                            help='Seeded users (seed_examportal) to log in for authenticated traffic')
+        parser.add_argument('--password', default='seedpass123', help='Password of the seeded users')
+        parser.add_argument('--seed', type=int, default=42, help='Random seed for the traffic mix')
+        parser.add_argument('--json', dest='json_path', help='Also write the report to this file')
+        parser.add_argument('--with-rate-limit', action='store_true',
+                            help='Run even though the rate limiter is enabled, to measure the limiter itself')
+
+    def handle(self, *args, **options):
+        # All traffic comes from one address, so the limiter would answer much of it with 429.
+        if getattr(settings, 'RATE_LIMIT_ENABLED', True) and not options['with_rate_limit']:
+            raise CommandError(
+                'The rate limiter is enabled; start the server and this command with DJANGO_RATE_LIMIT=0, '
+                'or pass --with-rate-limit to measure the limiter itself'
+            )
+        load = LoadTest(
+            options['base_url'],
+            concurrency=options['concurrency'],
+            logged_in_ratio=options['logged_in_ratio'],
+            seed=options['seed'],
+        )
+
+        if options['users']:
+            credentials = [(f'{SEED_USERNAME_PREFIX}{i}', options['password']) for i in range(options['users'])]
+            logged_in = load.login_users(credentials)
+            self.stdout.write(f'Logged in {logged_in}/{options["users"]} users')
+
+        if options['log']:
+            requests = [(method, path, False) for method, path in read_access_log(options['log'])]
+        else:
+            exam_ids = list(UpcomingExam.objects.filter(is_active=True).values_list('id', flat=True))
+            requests = load.synthesize(TRAFFIC_MIXES[options['mix']], options['requests'], exam_ids)
+        if not requests:
+            raise CommandError('No requests to send')
+
+        self.stdout.write(f'Sending {len(requests)} requests with {options["concurrency"]} workers...')
+        elapsed = load.run(requests, duration=options['duration'])
+        report = load.report(elapsed)
+
+        self.stdout.write(f"\n{'url name':<24}{'reqs':>7}{'req/s':>9}{'p50 ms':>9}{'p90 ms':>9}"
+                          f"{'p99 ms':>9}{'max ms':>9}{'errors':>8}")
+        for url_name, row in report.items():
+            self.stdout.write(
+                f"{url_name:<24}{row['requests']:>7}{row['rps']:>9.1f}{row['p50'] * 1000:>9.1f}"
+                f"{row['p90'] * 1000:>9.1f}{row['p99'] * 1000:>9.1f}{row['max'] * 1000:>9.1f}"
+                f"{row['error_rate']:>8.1%}"
+            )
+
+        if options['json_path']:
+            with open(options['json_path'], 'w') as handle:
+                json.dump({'elapsed': elapsed, 'urls': report}, handle, indent=2, default=str)
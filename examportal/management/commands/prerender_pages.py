@@ -0,0 +1,29 @@
+from django.core.management.base import BaseCommand, CommandError
+
+from examportal import prerender
+from examportal.models import UpcomingExam
+
+
+class Command(BaseCommand):
+    help = 'Write the policy pages and exam detail pages to PRERENDER_ROOT as static HTML'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--exam', type=int, nargs='+', help='Only re-render these exam ids')
+        parser.add_argument('--clear', action='store_true', help='Delete every pre-rendered file first')
+
+    def handle(self, *args, **options):
+        if prerender.prerender_root() is None:
+            raise CommandError('PRERENDER_ROOT is not set (DJANGO_PRERENDER_ROOT)')
+        if options['clear']:
+            prerender.clear()
+
+        if options['exam']:
+            for exam in UpcomingExam.objects.filter(id__in=options['exam']):
+                prerender.prerender_exam(exam)
+            self.stdout.write(self.style.SUCCESS(f"Re-rendered {len(options['exam'])} exam pages"))
+            return
+
+        written, unchanged, removed = prerender.prerender_all()
+        self.stdout.write(self.style.SUCCESS(
+            f'Pre-rendered pages: {written} written, {unchanged} unchanged, {removed} removed'
+        ))
@@ -0,0 +1,40 @@
+import json
+
+from django.core.management.base import BaseCommand, CommandError
+
+from examportal.startup import STARTUP_BUDGET, heaviest_imports, over_budget, profile_startup
+
+
+class Command(BaseCommand):
+    help = 'Profile web worker startup with -X importtime and check it against the startup budget'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--top', type=int, default=15, help='Heaviest top-level imports to list')
+        parser.add_argument('--check', action='store_true', help='Exit with an error when over budget')
+        parser.add_argument('--json', action='store_true', help='Print the profile as JSON')
+
+    def handle(self, *args, **options):
+        profile = profile_startup()
+        problems = over_budget(profile)
+        heaviest = heaviest_imports(profile, options['top'])
+        if options['json']:
+            self.stdout.write(json.dumps({
+                'seconds': round(profile['seconds'], 4),
+                'max_rss_mb': round(profile['max_rss_mb'], 1),
+                'modules': len(profile['modules']),
+                'heaviest': heaviest,
+                'problems': problems,
+            }))
+        else:
+            self.stdout.write(
+                f"Startup {profile['seconds']:.2f}s (budget {STARTUP_BUDGET['seconds']:.2f}s), "
+                f"peak memory {profile['max_rss_mb']:.0f} MB (budget {STARTUP_BUDGET['max_rss_mb']} MB), "
+                f"{len(profile['modules'])} modules"
+            )
+            self.stdout.write(f"{'package':<24}{'ms':>10}")
+            for package, seconds in heaviest:
+                self.stdout.write(f'{package:<24}{seconds * 1000:>10.1f}')
+            for problem in problems:
+                self.stdout.write(self.style.ERROR(f'OVER BUDGET {problem}'))
+        if options['check'] and problems:
+            raise CommandError('Worker startup is over budget')
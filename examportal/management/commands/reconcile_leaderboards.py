@@ -0,0 +1,15 @@
+from django.core.management.base import BaseCommand
+
+from examportal.leaderboards import RECONCILE_WEEKS, reconcile
+
+
+class Command(BaseCommand):
+    help = 'Rebuild the study-time leaderboard totals from the study sessions'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--weeks', type=int, default=RECONCILE_WEEKS,
+                            help='Weekly boards to rebuild, counting back from this week')
+
+    def handle(self, *args, **options):
+        rows = reconcile(weeks=max(1, options['weeks']))
+        self.stdout.write(self.style.SUCCESS(f'Rebuilt {rows} leaderboard totals'))
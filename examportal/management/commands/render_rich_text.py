@@ -0,0 +1,33 @@
+from django.core.management.base import BaseCommand
+
+from examportal.models import Announcement, UpcomingExam
+from examportal.rich_text import LINEBREAK_FIELDS
+
+
+class Command(BaseCommand):
+    help = 'Backfill the save-time rendered exam text and announcement summaries'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--batch-size', type=int, default=500)
+
+    def handle(self, *args, **options):
+        batch_size = options['batch_size']
+        jobs = [
+            (UpcomingExam, ['id', *LINEBREAK_FIELDS], 'rendered_text'),
+            (Announcement, ['id', 'content'], 'summary'),
+        ]
+        for model, fields, target in jobs:
+            batch = []
+            total = 0
+            for obj in model.objects.only(*fields).order_by('id').iterator(chunk_size=batch_size):
+                obj.render_rich_text()
+                batch.append(obj)
+                if len(batch) >= batch_size:
+                    model.objects.bulk_update(batch, [target])
+                    total += len(batch)
+                    batch = []
+            if batch:
+                model.objects.bulk_update(batch, [target])
+                total += len(batch)
+            self.stdout.write(f'  {model._meta.verbose_name_plural}: {total}')
+        self.stdout.write(self.style.SUCCESS('Rendered rich text'))
@@ -0,0 +1,441 @@
+import random
+import time
+from contextlib import contextmanager
+from datetime import timedelta
+from itertools import islice
+
+from django.contrib.auth.hashers import make_password
+from django.contrib.auth.models import User
+from django.core.cache import cache
+from django.core.management.base import BaseCommand, CommandError
+from django.db import transaction
+from django.utils import timezone
+from django.utils.text import slugify
+
+from examportal import leaderboards
+from examportal.models import (
+    ExamCategory, Subject, Note, UpcomingExam, Announcement, AdmitCard, Result,
+    AnswerKey, UserProfile, UserActivity, UserStudySession,
+)
+
+# Row counts generated for --scale 1. Everything is multiplied by the scale
+# factor, so --scale 10 produces roughly one million rows.
+SCALE_PROFILE = {
+    'categories': 12,
+    'subjects': 120,
+    'notes': 2000,
+    'exams': 500,
+    'announcements': 300,
+    'admit_cards': 400,
+    'results': 400,
+    'answer_keys': 400,
+    'users': 2000,
+    'activities': 60000,
+    'sessions': 30000,
+}
+
+SEED_USERNAME_PREFIX = 'seed_user_'
+
+CATEGORY_NAMES = [
+    'SSC', 'Banking', 'Teaching', 'UPSC', 'Railway', 'Defense',
+    'State PSC', 'Police', 'Insurance', 'Nursing', 'Judiciary', 'PSU',
+]
+
+SUBJECT_NAMES = [
+    'Quantitative Aptitude', 'Reasoning Ability', 'English Language',
+    'General Awareness', 'Current Affairs', 'Computer Knowledge',
+    'Indian Polity', 'Indian History', 'Geography', 'Economics',
+    'General Science', 'Child Pedagogy', 'Hindi Language', 'Static GK',
+]
+
+ORGANISATIONS = [
+    'SSC', 'IBPS', 'SBI', 'RBI', 'UPSC', 'RRB', 'CTET', 'KVS', 'NVS',
+    'BPSC', 'UPPSC', 'MPPSC', 'CRPF', 'BSF', 'Indian Army', 'LIC', 'NABARD',
+]
+
+POSTS = [
+    'CGL', 'CHSL', 'MTS', 'GD Constable', 'PO', 'Clerk', 'SO', 'Grade B',
+    'Civil Services', 'NTPC', 'Group D', 'ALP', 'TGT', 'PGT', 'PRT',
+    'Assistant', 'Stenographer', 'Sub Inspector', 'AAO', 'Junior Engineer',
+]
+
+ACTIVITY_TYPES = [
+    ('login', 'User logged in successfully'),
+    ('logout', 'User logged out'),
+    ('download', 'Downloaded study material'),
+    ('note_completed', 'Completed note: {title}'),
+    ('study_session', 'Studied {subject} for {minutes} minutes'),
+]
+
+ANNOUNCEMENT_TYPES = [choice for choice, _ in Announcement.ANNOUNCEMENT_TYPES]
+ANSWER_KEY_TYPES = [choice for choice, _ in AnswerKey.EXAM_TYPE_CHOICES]
+EXAM_INTERESTS = [choice for choice, _ in UserProfile.EXAM_CHOICES]
+
+WORDS = (
+    'exam candidates notification vacancy eligibility syllabus pattern '
+    'question paper marks section reasoning quantitative aptitude english '
+    'general awareness preparation strategy revision mock test previous year '
+    'cut off merit list selection process interview document verification '
+    'application online form fee payment admit card result answer key '
+    'objection window official website important dates age limit relaxation '
+    'category reservation posts recruitment board commission tier stage '
+    'descriptive objective negative marking duration minutes practice topic '
+    'chapter concept formula example solution shortcut trick percentage ratio '
+    'profit loss interest time work speed distance puzzle seating arrangement '
+    'syllogism coding decoding blood relation direction sense grammar vocabulary '
+    'comprehension polity history geography economics science constitution'
+).split()
+
+
+@contextmanager
+def preserve_timestamps(*models):
+    """Let bulk_create keep the generated created_at/updated_at values."""
+    saved = []
+    for model in models:
+        for field in model._meta.concrete_fields:
+            if getattr(field, 'auto_now', False) or getattr(field, 'auto_now_add', False):
+                saved.append((field, field.auto_now, field.auto_now_add))
+                field.auto_now = field.auto_now_add = False
+    try:
+        yield
+    finally:
+        for field, auto_now, auto_now_add in saved:
+            field.auto_now = auto_now
+            field.auto_now_add = auto_now_add
+
+
+class Command(BaseCommand):
+    help = 'Bulk-generate deterministic synthetic data for load and capacity testing'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--scale', type=float, default=1.0,
+                            help='Scale factor; 1 generates about 100k rows, 10 about 1M rows')
+        parser.add_argument('--seed', type=int, default=42, help='Random seed for reproducible datasets')
+        parser.add_argument('--batch-size', type=int, default=5000, help='Rows per bulk_create batch')
+        parser.add_argument('--clear', action='store_true',
+                            help='Delete existing portal content and seeded users first')
+
+    def handle(self, *args, **options):
+        scale = options['scale']
+        if scale <= 0:
+            raise CommandError('--scale must be greater than zero')
+
+        self.rng = random.Random(options['seed'])
+        self.batch_size = options['batch_size']
+        self.now = timezone.now()
+        self.today = self.now.date()
+        counts = {name: max(1, int(round(base * scale))) for name, base in SCALE_PROFILE.items()}
+
+        started = time.perf_counter()
+        if options['clear']:
+            self.clear()
+
+        with preserve_timestamps(Note, UpcomingExam, Announcement, AdmitCard, Result,
+                                 AnswerKey, UserProfile, UserActivity):
+            categories = self.seed_categories(counts['categories'])
+            subjects = self.seed_subjects(categories, counts['subjects'])
+            self.seed_notes(subjects, counts['notes'])
+            exams = self.seed_exams(categories, counts['exams'])
+            self.seed_announcements(counts['announcements'])
+            self.seed_exam_documents(exams, counts)
+            users = self.seed_users(counts['users'])
+            self.seed_activities(users, counts['activities'])
+            self.seed_sessions(users, subjects, counts['sessions'])
+        leaderboards.reconcile()
+        # bulk_create skips the signals that invalidate cached users and recommendations.
+        cache.clear()
+
+        total = sum(counts.values()) + counts['users']  # users + profiles
+        elapsed = time.perf_counter() - started
+        self.stdout.write(self.style.SUCCESS(
+            f'Seeded {total} rows at scale {scale:g} in {elapsed:.1f}s'
+        ))
+
+    # Helpers
+
+    def bulk(self, model, rows, total):
+        """Insert rows from a generator in batches without materialising them all."""
+        rows = iter(rows)
+        created = 0
+        with transaction.atomic():
+            while True:
+                batch = list(islice(rows, self.batch_size))
+                if not batch:
+                    break
+                model.objects.bulk_create(batch, batch_size=self.batch_size)
+                created += len(batch)
+        self.stdout.write(f'  {model._meta.verbose_name_plural}: {created}/{total}')
+        return created
+
+    def words(self, count):
+        return ' '.join(self.rng.choice(WORDS) for _ in range(count))
+
+    def sentence(self, low=8, high=20):
+        return self.words(self.rng.randint(low, high)).capitalize() + '.'
+
+    def paragraph(self, low=3, high=7):
+        return ' '.join(self.sentence() for _ in range(self.rng.randint(low, high)))
+
+    def lines(self, low=3, high=8):
+        return '\n'.join(self.sentence(4, 12) for _ in range(self.rng.randint(low, high)))
+
+    def rich_text(self, low=3, high=12):
+        """CKEditor-style HTML, typically 2-10KB per document."""
+        parts = []
+        for _ in range(self.rng.randint(low, high)):
+            kind = self.rng.random()
+            if kind < 0.15:
+                parts.append(f'<h2>{self.sentence(3, 7)}</h2>')
+            elif kind < 0.35:
+                items = ''.join(f'<li>{self.sentence(5, 12)}</li>' for _ in range(self.rng.randint(3, 8)))
+                parts.append(f'<ul>{items}</ul>')
+            elif kind < 0.45:
+                parts.append(f'<p><strong>{self.sentence(3, 8)}</strong> {self.paragraph(1, 3)}</p>')
+            else:
+                parts.append(f'<p>{self.paragraph()}</p>')
+        return '\n'.join(parts)
+
+    def past_datetime(self, days=365):
+        return self.now - timedelta(seconds=self.rng.randint(0, days * 86400))
+
+    def clear(self):
+        with transaction.atomic():
+            for model in (UserStudySession, UserActivity, AnswerKey, Result, AdmitCard,
+                          Announcement, UpcomingExam, Note, Subject, ExamCategory):
+                model.objects.all().delete()
+            User.objects.filter(username__startswith=SEED_USERNAME_PREFIX).delete()
+        self.stdout.write('Cleared existing portal content')
+
+    # Content
+
+    def seed_categories(self, count):
+        existing = set(ExamCategory.objects.values_list('slug', flat=True))
+        rows = []
+        for i in range(count):
+            base = CATEGORY_NAMES[i % len(CATEGORY_NAMES)]
+            name = base if i < len(CATEGORY_NAMES) else f'{base} {i // len(CATEGORY_NAMES) + 1}'
+            slug = slugify(name)
+            if slug in existing:
+                continue
+            existing.add(slug)
+            rows.append(ExamCategory(
+                name=name,
+                slug=slug,
+                description=self.sentence(10, 25),
+                icon=self.rng.choice(['fas fa-book', 'fas fa-university', 'fas fa-train', 'fas fa-shield-alt']),
+            ))
+        self.bulk(ExamCategory, rows, count)
+        return list(ExamCategory.objects.values_list('id', flat=True))
+
+    def seed_subjects(self, categories, count):
+        def rows():
+            for i in range(count):
+                yield Subject(
+                    exam_category_id=categories[i % len(categories)],
+                    name=self.rng.choice(SUBJECT_NAMES),
+                    description=self.sentence(8, 20),
+                    order=i // len(categories),
+                )
+        self.bulk(Subject, rows(), count)
+        return list(Subject.objects.values_list('id', flat=True))
+
+    def seed_notes(self, subjects, count):
+        def rows():
+            for _ in range(count):
+                stamp = self.past_datetime()
+                yield Note(
+                    subject_id=self.rng.choice(subjects),
+                    title=self.sentence(3, 8).rstrip('.'),
+                    content=self.rich_text(),
+                    created_at=stamp,
+                    updated_at=stamp,
+                    is_active=self.rng.random() < 0.95,
+                )
+        self.bulk(Note, rows(), count)
+
+    def seed_exams(self, categories, count):
+        def fee():
+            return self.rng.choice(['Nil', 'Rs. 100', 'Rs. 175', 'Rs. 500', 'Rs. 850', 'Rs. 1000'])
+
+        def vacancy_breakdown(total):
+            shares = {'General': 0.4, 'OBC': 0.27, 'SC': 0.15, 'ST': 0.08, 'EWS': 0.1}
+            return '\n'.join(f'{name}: {int(total * share)}' for name, share in shares.items())
+
+        def rows():
+            for i in range(count):
+                start = self.today + timedelta(days=self.rng.randint(-180, 120))
+                end = start + timedelta(days=self.rng.randint(14, 45))
+                exam_date = end + timedelta(days=self.rng.randint(30, 150)) if self.rng.random() < 0.8 else None
+                vacancies = self.rng.choice([0, self.rng.randint(10, 50000)])
+                age_min = self.rng.choice([18, 18, 20, 21, 25])
+                slug = f'{i}-{self.rng.randint(1000, 9999)}'
+                exam = UpcomingExam(
+                    title=f'{self.rng.choice(ORGANISATIONS)} {self.rng.choice(POSTS)} Recruitment {start.year}',
+                    exam_category_id=self.rng.choice(categories),
+                    description=self.paragraph(2, 5),
+                    application_start=start,
+                    application_end=end,
+                    exam_date=exam_date,
+                    apply_link=f'https://example.org/apply/{slug}',
+                    date_extend_notice=f'https://example.org/notice/{slug}.pdf' if self.rng.random() < 0.2 else '',
+                    information_bulletin=f'https://example.org/bulletin/{slug}.pdf',
+                    official_notification=f'https://example.org/notification/{slug}.pdf',
+                    official_website='https://example.org/',
+                    eligibility_criteria=self.lines(),
+                    exam_pattern=self.lines(4, 12),
+                    syllabus='\n\n'.join(self.paragraph(2, 6) for _ in range(self.rng.randint(3, 8))),
+                    vacancy_details=self.sentence(),
+                    application_fee=f'General/OBC: {fee()}, SC/ST: {fee()}',
+                    total_vacancies=vacancies,
+                    age_min=age_min,
+                    age_max=age_min + self.rng.choice([7, 9, 12, 14, 17]),
+                    age_relaxation_details=self.lines(2, 5),
+                    fee_general=fee(),
+                    fee_obc=fee(),
+                    fee_sc_st=fee(),
+                    fee_female=fee(),
+                    fee_refund_policy=self.sentence(),
+                    payment_modes='Debit Card, Credit Card, Net Banking, UPI',
+                    fee_payment_last_date=end + timedelta(days=2),
+                    correction_dates=f'{end + timedelta(days=5):%d %b} - {end + timedelta(days=7):%d %b %Y}',
+                    vacancy_breakdown=vacancy_breakdown(vacancies),
+                    educational_qualification=self.lines(2, 6),
+                    percentage_required=self.lines(2, 4),
+                    how_to_apply=self.lines(5, 10),
+                    is_active=self.rng.random() < 0.9,
+                    created_at=self.past_datetime(),
+                )
+                exam.updated_at = exam.created_at
+                exam.render_rich_text()
+                exam.update_eligibility()
+                exam.update_structured_data()
+                yield exam
+        self.bulk(UpcomingExam, rows(), count)
+        return list(UpcomingExam.objects.values_list('id', flat=True))
+
+    def seed_announcements(self, count):
+        def rows():
+            for _ in range(count):
+                announcement = Announcement(
+                    title=self.sentence(5, 12).rstrip('.'),
+                    content=self.rich_text(1, 5),
+                    announcement_type=self.rng.choice(ANNOUNCEMENT_TYPES),
+                    is_active=self.rng.random() < 0.9,
+                    created_at=self.past_datetime(),
+                )
+                announcement.updated_at = announcement.created_at
+                announcement.render_rich_text()
+                yield announcement
+        self.bulk(Announcement, rows(), count)
+
+    def seed_exam_documents(self, exams, counts):
+        def release_date():
+            return self.today - timedelta(days=self.rng.randint(-30, 365))
+
+        def admit_cards():
+            for i in range(counts['admit_cards']):
+                admit_card = AdmitCard(
+                    exam_id=self.rng.choice(exams),
+                    title=f'Admit Card {self.rng.choice(["Tier I", "Tier II", "Prelims", "Mains", "Skill Test"])}',
+                    download_link=f'https://example.org/admit-card/{i}',
+                    release_date=release_date(),
+                    is_active=self.rng.random() < 0.9,
+                    created_at=self.past_datetime(),
+                )
+                admit_card.updated_at = admit_card.created_at
+                yield admit_card
+
+        def results():
+            for i in range(counts['results']):
+                result = Result(
+                    exam_id=self.rng.choice(exams),
+                    title=f'{self.rng.choice(["Final", "Prelims", "Mains", "Tier I"])} Result',
+                    result_link=f'https://example.org/result/{i}',
+                    result_date=release_date(),
+                    is_active=self.rng.random() < 0.9,
+                    created_at=self.past_datetime(),
+                )
+                result.updated_at = result.created_at
+                yield result
+
+        def answer_keys():
+            for i in range(counts['answer_keys']):
+                answer_key = AnswerKey(
+                    exam_id=self.rng.choice(exams),
+                    title=f'{self.rng.choice(["Provisional", "Final"])} Answer Key',
+                    exam_type=self.rng.choice(ANSWER_KEY_TYPES),
+                    answer_key_link=f'https://example.org/answer-key/{i}',
+                    release_date=release_date(),
+                    is_active=self.rng.random() < 0.9,
+                    created_at=self.past_datetime(),
+                )
+                answer_key.updated_at = answer_key.created_at
+                yield answer_key
+
+        self.bulk(AdmitCard, admit_cards(), counts['admit_cards'])
+        self.bulk(Result, results(), counts['results'])
+        self.bulk(AnswerKey, answer_keys(), counts['answer_keys'])
+
+    # Users and activity
+
+    def seed_users(self, count):
+        # Hashing is deliberately slow, so every seeded user shares one hash.
+        password = make_password('seedpass123')
+        offset = User.objects.filter(username__startswith=SEED_USERNAME_PREFIX).count()
+
+        def users():
+            for i in range(offset, offset + count):
+                yield User(
+                    username=f'{SEED_USERNAME_PREFIX}{i}',
+                    email=f'{SEED_USERNAME_PREFIX}{i}@example.org',
+                    password=password,
+                    date_joined=self.past_datetime(),
+                )
+        self.bulk(User, users(), count)
+        user_ids = list(
+            User.objects.filter(username__startswith=SEED_USERNAME_PREFIX, userprofile__isnull=True)
+            .values_list('id', flat=True)
+        )
+
+        def profiles():
+            for user_id in user_ids:
+                stamp = self.past_datetime()
+                yield UserProfile(
+                    user_id=user_id,
+                    phone=f'9{self.rng.randint(100000000, 999999999)}',
+                    exam_interests=self.rng.choice(EXAM_INTERESTS),
+                    created_at=stamp,
+                    updated_at=stamp,
+                )
+        self.bulk(UserProfile, profiles(), len(user_ids))
+        return user_ids
+
+    def seed_activities(self, users, count):
+        def rows():
+            for _ in range(count):
+                activity_type, template = self.rng.choice(ACTIVITY_TYPES)
+                yield UserActivity(
+                    user_id=self.rng.choice(users),
+                    activity_type=activity_type,
+                    description=template.format(
+                        title=self.sentence(3, 6).rstrip('.'),
+                        subject=self.rng.choice(SUBJECT_NAMES),
+                        minutes=self.rng.randint(5, 180),
+                    ),
+                    created_at=self.past_datetime(),
+                )
+        self.bulk(UserActivity, rows(), count)
+
+    def seed_sessions(self, users, subjects, count):
+        def rows():
+            for _ in range(count):
+                start = self.past_datetime()
+                minutes = self.rng.randint(5, 180)
+                yield UserStudySession(
+                    user_id=self.rng.choice(users),
+                    subject_id=self.rng.choice(subjects),
+                    start_time=start,
+                    end_time=start + timedelta(minutes=minutes),
+                    duration_minutes=minutes,
+                )
+        self.bulk(UserStudySession, rows(), count)
@@ -0,0 +1,108 @@
+import json
+import os
+import subprocess
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+from django.conf import settings
+from django.contrib.auth.models import User
+from django.core.management.base import BaseCommand, CommandError
+from django.db import OperationalError
+
+from examportal.models import ExamCategory, Subject, UserProgress
+from examportal.sqlite import is_locked_error, serialized_write
+from examportal.views import log_activity
+
+MANAGE_PY = Path(settings.BASE_DIR) / 'manage.py'
+
+
+@serialized_write
+def get_or_create_user(username):
+    return User.objects.get_or_create(username=username)[0]
+
+
+@serialized_write
+def record_progress(user, subject, i):
+    """The write pattern of a busy login/progress request."""
+    log_activity(user, 'stress', f'Stress write {i}')
+    progress, created = UserProgress.objects.get_or_create(user=user, subject=subject)
+    progress.progress_percentage = i % 101
+    progress.save()
+
+
+class Command(BaseCommand):
+    help = 'Hammer a throwaway SQLite database from several processes and count lock errors'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--processes', type=int, default=8, help='Concurrent worker processes')
+        parser.add_argument('--writes', type=int, default=200, help='Write units per process')
+        parser.add_argument('--no-concurrency-mode', action='store_true',
+                            help='Run with DJANGO_SQLITE_CONCURRENCY=0 for comparison')
+        parser.add_argument('--json', action='store_true', help='Print the summary as JSON')
+        parser.add_argument('--worker', action='store_true', help='Internal: run one worker process')
+
+    def handle(self, *args, **options):
+        if options['worker']:
+            return self.work(options['writes'])
+
+        if settings.DB_ENGINE != 'sqlite3':
+            raise CommandError('sqlite_stress only runs against the SQLite profile')
+
+        with tempfile.TemporaryDirectory() as directory:
+            env = {
+                **os.environ,
+                'DJANGO_DB_NAME': os.path.join(directory, 'stress.sqlite3'),
+                'DJANGO_DB_REPLICAS': '',
+                'DJANGO_SQLITE_CONCURRENCY': '0' if options['no_concurrency_mode'] else '1',
+            }
+            self.manage(env, 'migrate', '--verbosity', '0')
+            self.manage(env, 'sqlite_stress', '--worker', '--writes', '0')
+
+            started = time.perf_counter()
+            workers = [
+                subprocess.Popen(
+                    [sys.executable, str(MANAGE_PY), 'sqlite_stress', '--worker', '--writes', str(options['writes'])],
+                    env=env, stdout=subprocess.PIPE, stderr=subprocess.DEVNULL, text=True,
+                )
+                for _ in range(options['processes'])
+            ]
+            results = [json.loads(worker.communicate()[0].strip().splitlines()[-1]) for worker in workers]
+            elapsed = time.perf_counter() - started
+
+        summary = {
+            'processes': options['processes'],
+            'writes': sum(result['writes'] for result in results),
+            'lock_errors': sum(result['lock_errors'] for result in results),
+            'seconds': round(elapsed, 3),
+        }
+        summary['writes_per_second'] = round(summary['writes'] / elapsed, 1)
+
+        if options['json']:
+            self.stdout.write(json.dumps(summary))
+        else:
+            self.stdout.write(
+                f"{summary['writes']} writes from {summary['processes']} processes in {summary['seconds']}s "
+                f"({summary['writes_per_second']}/s), {summary['lock_errors']} lock errors"
+            )
+
+    def manage(self, env, *args):
+        subprocess.run([sys.executable, str(MANAGE_PY), *args], env=env, check=True,
+                       stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+
+    def work(self, writes):
+        category, created = ExamCategory.objects.get_or_create(slug='stress', defaults={'name': 'Stress'})
+        subject, created = Subject.objects.get_or_create(exam_category=category, name='Stress')
+        user = get_or_create_user(f'stress_{os.getpid()}')
+
+        done = lock_errors = 0
+        for i in range(writes):
+            try:
+                record_progress(user, subject, i)
+                done += 1
+            except OperationalError as exc:
+                if not is_locked_error(exc):
+                    raise
+                lock_errors += 1
+        self.stdout.write(json.dumps({'writes': done, 'lock_errors': lock_errors}))
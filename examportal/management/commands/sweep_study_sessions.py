@@ -0,0 +1,11 @@
+from django.core.management.base import BaseCommand
+
+from examportal.heartbeats import sweep_stale_sessions
+
+
+class Command(BaseCommand):
+    help = 'Close study sessions that stopped sending heartbeats'
+
+    def handle(self, *args, **options):
+        closed = sweep_stale_sessions()
+        self.stdout.write(self.style.SUCCESS(f'Closed {closed} stale study sessions'))
@@ -0,0 +1,24 @@
+# Generated by Django 5.1.7 on 2026-10-19 03:16
+
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('examportal', '0012_alter_upcomingexam_age_max_and_more'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='userstudysession',
+            name='last_heartbeat',
+            field=models.DateTimeField(blank=True, null=True),
+        ),
+        migrations.AddIndex(
+            model_name='userstudysession',
+            index=models.Index(condition=models.Q(('end_time__isnull', True)), fields=['start_time'], name='studysession_open_idx'),
+        ),
+    ]
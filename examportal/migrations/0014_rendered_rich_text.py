@@ -0,0 +1,39 @@
+# Generated by Django 5.1.7 on 2026-10-19 03:24
+
+from django.db import migrations, models
+
+from examportal.rich_text import LINEBREAK_FIELDS, render_linebreaks, summarize
+
+
+def backfill(apps, schema_editor):
+    UpcomingExam = apps.get_model('examportal', 'UpcomingExam')
+    Announcement = apps.get_model('examportal', 'Announcement')
+    exams = list(UpcomingExam.objects.only('id', *LINEBREAK_FIELDS))
+    for exam in exams:
+        exam.rendered_text = render_linebreaks(exam)
+    UpcomingExam.objects.bulk_update(exams, ['rendered_text'], batch_size=500)
+    announcements = list(Announcement.objects.only('id', 'content'))
+    for announcement in announcements:
+        announcement.summary = summarize(announcement.content)
+    Announcement.objects.bulk_update(announcements, ['summary'], batch_size=500)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('examportal', '0013_userstudysession_last_heartbeat'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='announcement',
+            name='summary',
+            field=models.TextField(blank=True, editable=False),
+        ),
+        migrations.AddField(
+            model_name='upcomingexam',
+            name='rendered_text',
+            field=models.JSONField(blank=True, default=dict, editable=False),
+        ),
+        migrations.RunPython(backfill, migrations.RunPython.noop),
+    ]
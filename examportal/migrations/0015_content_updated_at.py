@@ -0,0 +1,31 @@
+from django.db import migrations, models
+from django.db.models import F
+import django.utils.timezone
+
+CONTENT_MODELS = ['upcomingexam', 'announcement', 'admitcard', 'result', 'answerkey']
+
+
+def copy_created_at(apps, schema_editor):
+    # Existing rows have not changed since they were created, as far as we know.
+    for model_name in CONTENT_MODELS:
+        apps.get_model('examportal', model_name).objects.update(updated_at=F('created_at'))
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('examportal', '0014_rendered_rich_text'),
+    ]
+
+    operations = [
+        *[
+            migrations.AddField(
+                model_name=model_name,
+                name='updated_at',
+                field=models.DateTimeField(auto_now=True, default=django.utils.timezone.now),
+                preserve_default=False,
+            )
+            for model_name in CONTENT_MODELS
+        ],
+        migrations.RunPython(copy_created_at, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,33 @@
+# Generated by Django 5.1.7 on 2026-10-19 03:33
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('examportal', '0015_content_updated_at'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='upcomingexam',
+            index=models.Index(fields=['is_active', 'exam_date'], name='exam_active_date_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='upcomingexam',
+            index=models.Index(fields=['is_active', 'exam_category', 'exam_date'], name='exam_active_category_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='upcomingexam',
+            index=models.Index(fields=['is_active', 'application_end'], name='exam_active_deadline_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='upcomingexam',
+            index=models.Index(fields=['is_active', 'total_vacancies'], name='exam_active_vacancies_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='upcomingexam',
+            index=models.Index(fields=['age_min', 'age_max'], name='exam_age_idx'),
+        ),
+    ]
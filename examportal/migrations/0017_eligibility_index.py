@@ -0,0 +1,46 @@
+# Generated by Django 5.1.7 on 2026-10-19 03:35
+
+from django.db import migrations, models
+
+from examportal.eligibility import ELIGIBILITY_FIELDS, dob_bounds, parse_qualification
+
+
+def backfill(apps, schema_editor):
+    UpcomingExam = apps.get_model('examportal', 'UpcomingExam')
+    exams = list(UpcomingExam.objects.only('id', *ELIGIBILITY_FIELDS))
+    for exam in exams:
+        exam.dob_earliest, exam.dob_latest = dob_bounds(exam)
+        exam.qualification_level = parse_qualification(exam.educational_qualification)
+    UpcomingExam.objects.bulk_update(
+        exams, ['dob_earliest', 'dob_latest', 'qualification_level'], batch_size=500
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('examportal', '0016_upcomingexam_facet_indexes'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='upcomingexam',
+            name='dob_earliest',
+            field=models.DateField(blank=True, editable=False, null=True),
+        ),
+        migrations.AddField(
+            model_name='upcomingexam',
+            name='dob_latest',
+            field=models.DateField(blank=True, editable=False, null=True),
+        ),
+        migrations.AddField(
+            model_name='upcomingexam',
+            name='qualification_level',
+            field=models.PositiveSmallIntegerField(choices=[(0, 'Not specified'), (1, '10th pass'), (2, '12th pass'), (3, 'Diploma / ITI'), (4, 'Graduate'), (5, 'Post graduate')], default=0, editable=False),
+        ),
+        migrations.AddIndex(
+            model_name='upcomingexam',
+            index=models.Index(fields=['is_active', 'dob_latest', 'dob_earliest'], name='exam_eligibility_idx'),
+        ),
+        migrations.RunPython(backfill, migrations.RunPython.noop),
+    ]
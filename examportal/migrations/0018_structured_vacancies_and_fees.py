@@ -0,0 +1,57 @@
+# Generated by Django 5.1.7 on 2026-10-19 03:38
+
+from django.db import migrations, models
+
+from examportal.exam_data import FEE_FIELDS, fee_amounts, parse_vacancies
+
+
+def backfill(apps, schema_editor):
+    UpcomingExam = apps.get_model('examportal', 'UpcomingExam')
+    exams = list(UpcomingExam.objects.only('id', 'vacancy_breakdown', *FEE_FIELDS))
+    for exam in exams:
+        exam.vacancies = parse_vacancies(exam.vacancy_breakdown)
+        for field, amount in fee_amounts(exam).items():
+            setattr(exam, field, amount)
+    UpcomingExam.objects.bulk_update(
+        exams, ['vacancies', *(f'{field}_amount' for field in FEE_FIELDS)], batch_size=500
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('examportal', '0017_eligibility_index'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='upcomingexam',
+            name='fee_female_amount',
+            field=models.PositiveIntegerField(blank=True, editable=False, null=True),
+        ),
+        migrations.AddField(
+            model_name='upcomingexam',
+            name='fee_general_amount',
+            field=models.PositiveIntegerField(blank=True, editable=False, null=True),
+        ),
+        migrations.AddField(
+            model_name='upcomingexam',
+            name='fee_obc_amount',
+            field=models.PositiveIntegerField(blank=True, editable=False, null=True),
+        ),
+        migrations.AddField(
+            model_name='upcomingexam',
+            name='fee_sc_st_amount',
+            field=models.PositiveIntegerField(blank=True, editable=False, null=True),
+        ),
+        migrations.AddField(
+            model_name='upcomingexam',
+            name='vacancies',
+            field=models.JSONField(blank=True, default=dict, editable=False),
+        ),
+        migrations.AddIndex(
+            model_name='upcomingexam',
+            index=models.Index(fields=['is_active', 'fee_general_amount'], name='exam_active_fee_idx'),
+        ),
+        migrations.RunPython(backfill, migrations.RunPython.noop),
+    ]
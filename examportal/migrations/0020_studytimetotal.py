@@ -0,0 +1,30 @@
+# Generated by Django 5.1.7 on 2026-10-19 03:52
+
+import django.db.models.deletion
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('examportal', '0019_syncevent'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='StudyTimeTotal',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('period', models.CharField(max_length=10)),
+                ('minutes', models.PositiveIntegerField(default=0)),
+                ('exam_category', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, to='examportal.examcategory')),
+                ('user', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, to=settings.AUTH_USER_MODEL)),
+            ],
+            options={
+                'indexes': [models.Index(fields=['exam_category', 'period', '-minutes'], name='studytime_board_idx')],
+                'constraints': [models.UniqueConstraint(fields=('exam_category', 'period', 'user'), name='studytime_board_user_unique')],
+            },
+        ),
+    ]
@@ -0,0 +1,27 @@
+from django.db import migrations
+
+from examportal.eligibility import parse_qualification
+
+
+def reparse(apps, schema_editor):
+    # "Senior Secondary" used to be read as 10th pass
+    UpcomingExam = apps.get_model('examportal', 'UpcomingExam')
+    exams = list(UpcomingExam.objects.only('id', 'educational_qualification', 'qualification_level'))
+    changed = []
+    for exam in exams:
+        level = parse_qualification(exam.educational_qualification)
+        if level != exam.qualification_level:
+            exam.qualification_level = level
+            changed.append(exam)
+    UpcomingExam.objects.bulk_update(changed, ['qualification_level'], batch_size=500)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('examportal', '0020_studytimetotal'),
+    ]
+
+    operations = [
+        migrations.RunPython(reparse, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,25 @@
+from django.db import migrations
+
+from examportal.exam_data import FEE_FIELDS, fee_amounts
+
+
+def reparse(apps, schema_editor):
+    # Fees with exemption notes, like "Rs. 100/- (SC/ST exempted)", used to be stored as 0
+    UpcomingExam = apps.get_model('examportal', 'UpcomingExam')
+    amount_fields = [f'{field}_amount' for field in FEE_FIELDS]
+    exams = list(UpcomingExam.objects.only('id', *FEE_FIELDS, *amount_fields))
+    for exam in exams:
+        for name, amount in fee_amounts(exam).items():
+            setattr(exam, name, amount)
+    UpcomingExam.objects.bulk_update(exams, amount_fields, batch_size=500)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('examportal', '0021_reparse_qualification_level'),
+    ]
+
+    operations = [
+        migrations.RunPython(reparse, migrations.RunPython.noop),
+    ]
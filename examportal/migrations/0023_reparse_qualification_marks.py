@@ -0,0 +1,27 @@
+from django.db import migrations
+
+from examportal.eligibility import parse_qualification
+
+
+def reparse(apps, schema_editor):
+    # "Bachelor's degree with 60% marks in 12th" used to be read as 12th pass
+    UpcomingExam = apps.get_model('examportal', 'UpcomingExam')
+    exams = list(UpcomingExam.objects.only('id', 'educational_qualification', 'qualification_level'))
+    changed = []
+    for exam in exams:
+        level = parse_qualification(exam.educational_qualification)
+        if level != exam.qualification_level:
+            exam.qualification_level = level
+            changed.append(exam)
+    UpcomingExam.objects.bulk_update(changed, ['qualification_level'], batch_size=500)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('examportal', '0022_reparse_fee_amounts'),
+    ]
+
+    operations = [
+        migrations.RunPython(reparse, migrations.RunPython.noop),
+    ]
@@ -4,6 +4,10 @@ from django.utils import timezone
 from django.utils.text import slugify
 from django.contrib.auth.models import User  # Move this import to the top
 
+from .eligibility import ELIGIBILITY_FIELDS, QUALIFICATION_LEVELS, dob_bounds, parse_qualification
+from .exam_data import FEE_FIELDS, fee_amounts, parse_vacancies
+from .rich_text import LINEBREAK_FIELDS, render_linebreaks, summarize
+
 class ExamCategory(models.Model):
     name = models.CharField(max_length=100)
     slug = models.SlugField(unique=True, blank=True)
@@ -128,6 +132,63 @@ class UpcomingExam(models.Model):
     # Status
     is_active = models.BooleanField(default=True)
     created_at = models.DateTimeField(auto_now_add=True)
+    updated_at = models.DateTimeField(auto_now=True)
+    
+    # linebreaks HTML of the long text fields, filled on save (see rich_text.py)
+    rendered_text = models.JSONField(default=dict, blank=True, editable=False)
+    
+    # Eligibility index, filled on save (see eligibility.py)
+    dob_earliest = models.DateField(null=True, blank=True, editable=False)
+    dob_latest = models.DateField(null=True, blank=True, editable=False)
+    qualification_level = models.PositiveSmallIntegerField(choices=QUALIFICATION_LEVELS, default=0, editable=False)
+    
+    # Parsed vacancy_breakdown and fee amounts in rupees, filled on save (see exam_data.py)
+    vacancies = models.JSONField(default=dict, blank=True, editable=False)
+    fee_general_amount = models.PositiveIntegerField(null=True, blank=True, editable=False)
+    fee_obc_amount = models.PositiveIntegerField(null=True, blank=True, editable=False)
+    fee_sc_st_amount = models.PositiveIntegerField(null=True, blank=True, editable=False)
+    fee_female_amount = models.PositiveIntegerField(null=True, blank=True, editable=False)
+
+    class Meta:
+        indexes = [
+            # Filters and sorts of the upcoming exams page (see exam_facets.py)
+            models.Index(fields=['is_active', 'exam_date'], name='exam_active_date_idx'),
+            models.Index(fields=['is_active', 'exam_category', 'exam_date'], name='exam_active_category_idx'),
+            models.Index(fields=['is_active', 'application_end'], name='exam_active_deadline_idx'),
+            models.Index(fields=['is_active', 'total_vacancies'], name='exam_active_vacancies_idx'),
+            models.Index(fields=['age_min', 'age_max'], name='exam_age_idx'),
+            models.Index(fields=['is_active', 'dob_latest', 'dob_earliest'], name='exam_eligibility_idx'),
+            models.Index(fields=['is_active', 'fee_general_amount'], name='exam_active_fee_idx'),
+        ]
+
+    def render_rich_text(self):
+        self.rendered_text = render_linebreaks(self)
+    
+    def update_eligibility(self):
+        self.dob_earliest, self.dob_latest = dob_bounds(self)
+        self.qualification_level = parse_qualification(self.educational_qualification)
+    
+    def update_structured_data(self):
+        self.vacancies = parse_vacancies(self.vacancy_breakdown)
+        for field, amount in fee_amounts(self).items():
+            setattr(self, field, amount)
+    
+    def save(self, *args, **kwargs):
+        self.render_rich_text()
+        self.update_eligibility()
+        self.update_structured_data()
+        update_fields = kwargs.get('update_fields')
+        if update_fields is not None:
+            update_fields = set(update_fields)
+            if update_fields & set(LINEBREAK_FIELDS):
+                update_fields.add('rendered_text')
+            if update_fields & set(ELIGIBILITY_FIELDS):
+                update_fields.update(['dob_earliest', 'dob_latest', 'qualification_level'])
+            if 'vacancy_breakdown' in update_fields:
+                update_fields.add('vacancies')
+            update_fields.update(f'{field}_amount' for field in FEE_FIELDS if field in update_fields)
+            kwargs['update_fields'] = update_fields
+        super().save(*args, **kwargs)
     
     def get_exam_date_display(self):
         if self.exam_date:
@@ -154,6 +215,19 @@ class Announcement(models.Model):
     announcement_type = models.CharField(max_length=20, choices=ANNOUNCEMENT_TYPES, default='general')
     is_active = models.BooleanField(default=True)
     created_at = models.DateTimeField(auto_now_add=True)
+    updated_at = models.DateTimeField(auto_now=True)
+    # Plain-text teaser of content, filled on save
+    summary = models.TextField(blank=True, editable=False)
+    
+    def render_rich_text(self):
+        self.summary = summarize(self.content)
+    
+    def save(self, *args, **kwargs):
+        self.render_rich_text()
+        update_fields = kwargs.get('update_fields')
+        if update_fields is not None and 'content' in update_fields:
+            kwargs['update_fields'] = {*update_fields, 'summary'}
+        super().save(*args, **kwargs)
     
     def __str__(self):
         return self.title
@@ -165,6 +239,7 @@ class AdmitCard(models.Model):
     release_date = models.DateField()
     is_active = models.BooleanField(default=True)
     created_at = models.DateTimeField(auto_now_add=True)
+    updated_at = models.DateTimeField(auto_now=True)
     
     def __str__(self):
         return f"{self.exam.title} - {self.title}"
@@ -176,6 +251,7 @@ class Result(models.Model):
     result_date = models.DateField()
     is_active = models.BooleanField(default=True)
     created_at = models.DateTimeField(auto_now_add=True)
+    updated_at = models.DateTimeField(auto_now=True)
     
     def __str__(self):
         return f"{self.exam.title} - {self.title}"
@@ -205,6 +281,7 @@ class AnswerKey(models.Model):
     release_date = models.DateField()
     is_active = models.BooleanField(default=True)
     created_at = models.DateTimeField(auto_now_add=True)
+    updated_at = models.DateTimeField(auto_now=True)
     
     def __str__(self):
         return f"{self.exam.title} - {self.title}"
@@ -239,9 +316,17 @@ class UserStudySession(models.Model):
     subject = models.ForeignKey(Subject, on_delete=models.CASCADE)
     start_time = models.DateTimeField()
     end_time = models.DateTimeField(null=True, blank=True)
+    last_heartbeat = models.DateTimeField(null=True, blank=True)
     duration_minutes = models.IntegerField(default=0)
     notes_covered = models.ManyToManyField('Note', blank=True)
     
+    class Meta:
+        indexes = [
+            # Open sessions, scanned by the heartbeat sweeper
+            models.Index(fields=['start_time'], condition=models.Q(end_time__isnull=True),
+                         name='studysession_open_idx'),
+        ]
+    
     def save(self, *args, **kwargs):
         if self.end_time and self.start_time:
             duration = self.end_time - self.start_time
@@ -259,4 +344,43 @@ class ExamTarget(models.Model):
     created_at = models.DateTimeField(auto_now_add=True)
     
     def __str__(self):
-        return f"{self.user.username} - {self.exam.title}"
\ No newline at end of file
+        return f"{self.user.username} - {self.exam.title}"
+
+
+class SyncEvent(models.Model):
+    """A client progress event applied by the sync endpoint, kept so replays are ignored (see sync.py)."""
+    user = models.ForeignKey(User, on_delete=models.CASCADE)
+    key = models.CharField(max_length=64)
+    event_type = models.CharField(max_length=30)
+    occurred_at = models.DateTimeField()
+    # The study session a session_started event created, for later session_ended events
+    session = models.ForeignKey(UserStudySession, null=True, blank=True, on_delete=models.SET_NULL)
+    received_at = models.DateTimeField(auto_now_add=True)
+    
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(fields=['user', 'key'], name='syncevent_user_key_unique'),
+        ]
+    
+    def __str__(self):
+        return f"{self.user.username} - {self.event_type} - {self.key}"
+
+
+class StudyTimeTotal(models.Model):
+    """Minutes a user studied for one exam category in one leaderboard period (see leaderboards.py)."""
+    user = models.ForeignKey(User, on_delete=models.CASCADE)
+    exam_category = models.ForeignKey(ExamCategory, on_delete=models.CASCADE)
+    # 'all' for the all-time board, otherwise the ISO date of the week's Monday
+    period = models.CharField(max_length=10)
+    minutes = models.PositiveIntegerField(default=0)
+    
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(fields=['exam_category', 'period', 'user'], name='studytime_board_user_unique'),
+        ]
+        indexes = [
+            models.Index(fields=['exam_category', 'period', '-minutes'], name='studytime_board_idx'),
+        ]
+    
+    def __str__(self):
+        return f"{self.user.username} - {self.exam_category.name} - {self.period}: {self.minutes}"
@@ -0,0 +1,259 @@
+"""
+Static pre-rendering of pages that rarely change.
+
+The policy pages and every active ``exam_detail`` page are rendered for
+anonymous visitors and written to ``PRERENDER_ROOT`` as
+``<url path>/index.html``. Each file also gets ``.gz`` and, when the
+``brotli`` package is installed, ``.br`` variants. nginx can serve these
+directly to visitors without a session cookie, e.g.::
+
+    location / {
+        if ($cookie_sessionid) { proxy_pass http://django; }
+        root /srv/prerendered;
+        gzip_static on;
+        try_files $uri/index.html @django;
+    }
+
+A missing file falls back to the live view. Without nginx, ``prerendered``
+gives the same behaviour inside Django: anonymous GETs get the file and
+everyone else gets the live view.
+
+``prerender_pages`` writes everything and removes pages of exams that are no
+longer active. After that, saving or deleting an exam only re-renders that
+exam's page, and only rewrites files whose HTML actually changed. The
+navigation on every page lists the exam categories, so a category change
+deletes all files until the next ``prerender_pages`` run. Leave
+``PRERENDER_ROOT`` empty to turn all of this off.
+
+An exam page shows whether applications are open, which changes with the
+date rather than with a save. So each exam page also records the first day
+that status changes, in ``index.html.expires``. From that day on
+``prerendered`` ignores the file and serves the live view. nginx does not
+read that file, so schedule ``prerender_pages`` to run daily. Each run
+re-renders every exam page for the current date.
+"""
+import gzip
+import logging
+import os
+import shutil
+import tempfile
+from functools import wraps
+from inspect import iscoroutinefunction
+from datetime import date, timedelta
+from pathlib import Path
+
+from asgiref.sync import async_to_sync
+from django.conf import settings
+from django.contrib.auth.models import AnonymousUser
+from django.db import transaction
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+from django.http import HttpResponse
+from django.test import RequestFactory
+from django.urls import resolve, reverse
+from django.utils import timezone
+
+from .models import ExamCategory, UpcomingExam
+
+try:
+    import brotli
+except ImportError:
+    brotli = None
+
+logger = logging.getLogger(__name__)
+
+STATIC_PAGES = ['privacy_policy', 'terms_conditions', 'about_us', 'refund_policy', 'disclaimer']
+ENCODINGS = [('br', '.br'), ('gzip', '.gz')]
+
+
+def prerender_root():
+    root = getattr(settings, 'PRERENDER_ROOT', '')
+    return Path(root) if root else None
+
+
+def page_path(url, root=None):
+    return (root or prerender_root()) / url.strip('/') / 'index.html'
+
+
+def expires_path(path):
+    return path.with_name(path.name + '.expires')
+
+
+def page_expires(exam, today=None):
+    """The first day ``exam``'s page shows something else, or None if it never will by date alone."""
+    today = today or timezone.localdate()
+    changes = [exam.application_start, exam.application_end + timedelta(days=1)]
+    if exam.exam_date:
+        changes.append(exam.exam_date + timedelta(days=1))
+    return min((day for day in changes if day > today), default=None)
+
+
+def is_expired(path, today=None):
+    try:
+        expires = date.fromisoformat(expires_path(path).read_text().strip())
+    except (FileNotFoundError, ValueError):
+        return False
+    return expires <= (today or timezone.localdate())
+
+
+def exam_url(exam_id):
+    return reverse('exam_detail', kwargs={'exam_id': exam_id})
+
+
+def render_live(url):
+    """The HTML an anonymous visitor gets from the live view, or None if it isn't a 200."""
+    match = resolve(url)
+    view = getattr(match.func, 'live_view', match.func)
+    request = RequestFactory().get(url)
+    request.user = AnonymousUser()
+    if iscoroutinefunction(view):
+        view = async_to_sync(view)
+    response = view(request, *match.args, **match.kwargs)
+    return response.content if response.status_code == 200 else None
+
+
+def _file_mode():
+    umask = os.umask(0)
+    os.umask(umask)
+    return 0o666 & ~umask
+
+
+# Temporary files are created 0600; the web server may run as another user.
+FILE_MODE = _file_mode()
+
+
+def _write_atomic(path, content):
+    with tempfile.NamedTemporaryFile(dir=path.parent, delete=False) as handle:
+        handle.write(content)
+    os.chmod(handle.name, FILE_MODE)
+    os.replace(handle.name, path)
+
+
+def write_page(url, root=None, expires=None):
+    """Render ``url`` to disk, valid until ``expires``. Returns True if a file was written, False if unchanged."""
+    content = render_live(url)
+    if content is None:
+        return remove_page(url, root)
+    path = page_path(url, root)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    if expires is not None:
+        _write_atomic(expires_path(path), expires.isoformat().encode())
+    elif expires_path(path).exists():
+        expires_path(path).unlink()
+    if path.exists() and path.read_bytes() == content:
+        return False
+    _write_atomic(path.with_name(path.name + '.gz'), gzip.compress(content, compresslevel=9, mtime=0))
+    if brotli is not None:
+        _write_atomic(path.with_name(path.name + '.br'), brotli.compress(content))
+    # The plain file goes last; it is what marks the page as pre-rendered.
+    _write_atomic(path, content)
+    return True
+
+
+def remove_page(url, root=None):
+    directory = page_path(url, root).parent
+    if not directory.exists():
+        return False
+    for variant in directory.glob('index.html*'):
+        variant.unlink()
+    return True
+
+
+def prerender_exam(exam, root=None):
+    url = exam_url(exam.id)
+    return write_page(url, root, page_expires(exam)) if exam.is_active else remove_page(url, root)
+
+
+def prerender_all(root=None):
+    """Render every page. Returns (written, unchanged, removed) counts."""
+    root = root or prerender_root()
+    written = sum(write_page(reverse(name), root) for name in STATIC_PAGES)
+    exams = list(
+        UpcomingExam.objects.filter(is_active=True)
+        .only('id', 'is_active', 'application_start', 'application_end', 'exam_date').order_by('id')
+    )
+    written += sum(prerender_exam(exam, root) for exam in exams)
+    active = {exam.id for exam in exams}
+    removed = 0
+    exams_dir = page_path(exam_url(0), root).parent.parent
+    if exams_dir.exists():
+        for directory in exams_dir.iterdir():
+            if directory.name.isdigit() and int(directory.name) not in active:
+                removed += remove_page(exam_url(int(directory.name)), root)
+    return written, len(STATIC_PAGES) + len(exams) - written, removed
+
+
+def clear(root=None):
+    root = root or prerender_root()
+    if root is not None and root.exists():
+        shutil.rmtree(root)
+
+
+def _prerendered_response(request):
+    if request.method not in ('GET', 'HEAD') or request.GET or prerender_root() is None:
+        return None
+    path = page_path(request.path)
+    if is_expired(path):
+        return None
+    accepted = request.headers.get('Accept-Encoding', '')
+    for encoding, suffix in ENCODINGS:
+        variant = path.with_name(path.name + suffix)
+        if encoding in accepted and variant.exists() and path.exists():
+            response = HttpResponse(variant.read_bytes(), content_type='text/html; charset=utf-8')
+            response.headers['Content-Encoding'] = encoding
+            break
+    else:
+        if not path.exists():
+            return None
+        response = HttpResponse(path.read_bytes(), content_type='text/html; charset=utf-8')
+    response.headers['Vary'] = 'Accept-Encoding, Cookie'
+    return response
+
+
+def prerendered(view):
+    """Serve the pre-rendered file to anonymous GETs, falling back to ``view``."""
+    if iscoroutinefunction(view):
+        @wraps(view)
+        async def wrapper(request, *args, **kwargs):
+            if not (await request.auser()).is_authenticated:
+                response = _prerendered_response(request)
+                if response is not None:
+                    return response
+            return await view(request, *args, **kwargs)
+    else:
+        @wraps(view)
+        def wrapper(request, *args, **kwargs):
+            if not request.user.is_authenticated:
+                response = _prerendered_response(request)
+                if response is not None:
+                    return response
+            return view(request, *args, **kwargs)
+    wrapper.live_view = view
+    return wrapper
+
+
+def _safely(func, *args):
+    try:
+        func(*args)
+    except Exception:
+        logger.exception('Pre-rendering failed; the live view will serve this page')
+
+
+@receiver(post_save, sender=UpcomingExam)
+def _exam_saved(sender, instance, **kwargs):
+    if prerender_root() is not None:
+        transaction.on_commit(lambda: _safely(prerender_exam, instance))
+
+
+@receiver(post_delete, sender=UpcomingExam)
+def _exam_deleted(sender, instance, **kwargs):
+    if prerender_root() is not None:
+        url = exam_url(instance.id)  # the pk is cleared once the delete finishes
+        transaction.on_commit(lambda: _safely(remove_page, url))
+
+
+@receiver(post_save, sender=ExamCategory)
+@receiver(post_delete, sender=ExamCategory)
+def _category_changed(sender, **kwargs):
+    if prerender_root() is not None:
+        transaction.on_commit(lambda: _safely(clear))
@@ -0,0 +1,119 @@
+"""
+Per-client token-bucket rate limiting.
+
+``RATE_LIMITS`` maps URL names to ``(burst, per_minute, methods)`` budgets.
+Each client has its own bucket per route. A client is the user id when
+logged in, otherwise the IP address. The bucket holds ``burst`` tokens,
+refills at ``per_minute`` tokens a minute, and each limited request takes
+one. An empty bucket gets a ``429`` with ``Retry-After``. ``methods`` limits
+the budget to those HTTP methods, e.g. only login POSTs pay for password
+hashing. Unlisted routes are never touched.
+
+Buckets live in a pluggable ``RATE_LIMIT_STORE``. ``LocalBucketStore`` keeps
+them in process memory, so each worker enforces the budget separately.
+``CacheBucketStore`` keeps them in the Django cache so all workers share
+them. Its read-modify-write is not atomic, so concurrent requests can very
+occasionally get an extra token.
+"""
+import math
+import threading
+import time
+
+from django.conf import settings
+from django.core.cache import cache
+from django.http import HttpResponse, JsonResponse
+from django.utils.deprecation import MiddlewareMixin
+from django.utils.functional import cached_property
+from django.utils.module_loading import import_string
+
+
+class LocalBucketStore:
+    max_keys = 100_000
+
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.buckets = {}  # key -> (tokens, last refill)
+
+    def take(self, key, capacity, rate, now=None):
+        """Take a token; return 0 if allowed, else the seconds until one is available."""
+        now = time.monotonic() if now is None else now
+        with self.lock:
+            tokens, updated = self.buckets.get(key, (capacity, now))
+            tokens = min(capacity, tokens + (now - updated) * rate)
+            if tokens >= 1:
+                self.buckets[key] = (tokens - 1, now)
+                if len(self.buckets) > self.max_keys:
+                    self.prune(now)
+                return 0
+            self.buckets[key] = (tokens, now)
+            return (1 - tokens) / rate
+
+    def prune(self, now):
+        # Forget buckets that have been idle long enough to refill completely.
+        self.buckets = {
+            key: (tokens, updated) for key, (tokens, updated) in self.buckets.items()
+            if now - updated < 3600
+        }
+
+
+class CacheBucketStore:
+    def take(self, key, capacity, rate, now=None):
+        now = time.time() if now is None else now
+        cache_key = f'examportal:ratelimit:{key}'
+        tokens, updated = cache.get(cache_key) or (capacity, now)
+        tokens = min(capacity, tokens + (now - updated) * rate)
+        allowed = tokens >= 1
+        if allowed:
+            tokens -= 1
+        # Expire once the bucket would be full again anyway.
+        cache.set(cache_key, (tokens, now), math.ceil((capacity - tokens) / rate) + 1)
+        return 0 if allowed else (1 - tokens) / rate
+
+
+def client_key(request):
+    user = getattr(request, 'user', None)
+    if user is not None and user.is_authenticated:
+        return f'user:{user.pk}'
+    if getattr(settings, 'RATE_LIMIT_TRUST_FORWARDED', False):
+        forwarded = request.headers.get('X-Forwarded-For', '')
+        if forwarded:
+            return f"ip:{forwarded.split(',')[0].strip()}"
+    return f"ip:{request.META.get('REMOTE_ADDR', '')}"
+
+
+def too_many_requests(request, retry_after):
+    seconds = max(1, math.ceil(retry_after))
+    if 'text/html' in request.headers.get('Accept', ''):
+        response = HttpResponse('Too many requests. Please try again shortly.', status=429,
+                                content_type='text/plain; charset=utf-8')
+    else:
+        response = JsonResponse({'success': False, 'error': 'Too many requests'}, status=429)
+    response['Retry-After'] = str(seconds)
+    return response
+
+
+class RateLimitMiddleware(MiddlewareMixin):
+    @cached_property
+    def budgets(self):
+        return {
+            url_name: (burst, per_minute / 60, set(methods) if methods else None)
+            for url_name, (burst, per_minute, methods) in getattr(settings, 'RATE_LIMITS', {}).items()
+        }
+
+    @cached_property
+    def store(self):
+        return import_string(settings.RATE_LIMIT_STORE)()
+
+    def process_view(self, request, view_func, view_args, view_kwargs):
+        if not getattr(settings, 'RATE_LIMIT_ENABLED', True):
+            return None
+        budget = self.budgets.get(request.resolver_match.url_name)
+        if budget is None:
+            return None
+        capacity, rate, methods = budget
+        if methods is not None and request.method not in methods:
+            return None
+        retry_after = self.store.take(f'{request.resolver_match.url_name}:{client_key(request)}', capacity, rate)
+        if retry_after:
+            return too_many_requests(request, retry_after)
+        return None
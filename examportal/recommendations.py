@@ -0,0 +1,137 @@
+"""
+Precomputed exam recommendations for the dashboard.
+
+``recommendation_index`` ranks all active exams once for every
+``UserProfile.EXAM_CHOICES`` segment and caches the result. Each segment gets
+its top ``POOL_SIZE`` exams. An exam's score depends on whether applications
+are open, how close the deadline is, and how many vacancies it has. A segment
+matches exams whose category name contains the segment's keyword, and
+``multiple`` matches every exam. ``recommend_exams`` reads the index and each
+user's target categories from the cache. It then adds a per-user boost for
+categories the user already targets and slices the result.
+
+The index is dropped whenever an exam or category is saved or deleted, and
+it expires at midnight because the scores depend on today's date. With the
+default LocMem cache each worker holds its own copy, so other workers can be
+up to ``INDEX_CACHE_SECONDS`` stale.
+"""
+import math
+from datetime import timedelta
+
+from django.core.cache import cache
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+from django.utils import timezone
+
+from .models import ExamCategory, ExamTarget, UpcomingExam, UserProfile
+
+POOL_SIZE = 20
+INDEX_CACHE_SECONDS = 600
+TARGET_CACHE_SECONDS = 300
+TARGET_CATEGORY_BOOST = 25.0
+
+# Long text fields the dashboard never shows.
+DEFERRED_FIELDS = [
+    'eligibility_criteria', 'exam_pattern', 'syllabus', 'vacancy_details', 'age_relaxation_details',
+    'rendered_text',
+]
+
+
+def index_key(today):
+    return f'examportal:recommendations:{today.isoformat()}'
+
+
+def targets_key(user_id):
+    return f'examportal:target-categories:{user_id}'
+
+
+def segment_keywords():
+    """Category-name keyword per segment, e.g. ``'banking'`` for "Banking Exams"."""
+    return {
+        segment: None if segment == 'multiple' else label.split()[0].lower()
+        for segment, label in UserProfile.EXAM_CHOICES
+    }
+
+
+def score_exam(exam, today):
+    score = 0.0
+    if exam.application_start <= today <= exam.application_end:
+        # Open now; the closer the deadline, the more urgent.
+        score += 50 + 30 * max(0.0, 1 - (exam.application_end - today).days / 60)
+    elif exam.application_start > today:
+        score += 15 * max(0.0, 1 - (exam.application_start - today).days / 60)
+    elif exam.exam_date and exam.exam_date >= today:
+        score += 5
+    return score + 10 * math.log10(1 + max(exam.total_vacancies, 0))
+
+
+def build_index(today=None):
+    """Rank active exams for every segment. Returns ``{segment: [(score, exam), ...]}``."""
+    today = today or timezone.localdate()
+    exams = (
+        UpcomingExam.objects.filter(is_active=True)
+        .select_related('exam_category')
+        .defer(*DEFERRED_FIELDS)
+    )
+    ranked = sorted(
+        ((score_exam(exam, today), exam) for exam in exams),
+        key=lambda item: (-item[0], item[1].exam_date or today, item[1].id),
+    )
+    index = {}
+    for segment, keyword in segment_keywords().items():
+        matches = (item for item in ranked if keyword is None or keyword in item[1].exam_category.name.lower())
+        index[segment] = [item for item, _ in zip(matches, range(POOL_SIZE))]
+    return index
+
+
+def recommendation_index(today=None):
+    today = today or timezone.localdate()
+    index = cache.get(index_key(today))
+    if index is None:
+        index = build_index(today)
+        seconds_to_midnight = int((
+            timezone.localtime().replace(hour=0, minute=0, second=0, microsecond=0)
+            + timedelta(days=1) - timezone.localtime()
+        ).total_seconds())
+        cache.set(index_key(today), index, max(1, min(INDEX_CACHE_SECONDS, seconds_to_midnight)))
+    return index
+
+
+def target_category_ids(user):
+    category_ids = cache.get(targets_key(user.pk))
+    if category_ids is None:
+        category_ids = set(
+            ExamTarget.objects.filter(user=user).values_list('exam__exam_category_id', flat=True)
+        )
+        cache.set(targets_key(user.pk), category_ids, TARGET_CACHE_SECONDS)
+    return category_ids
+
+
+def recommend_exams(user, segment, limit=3):
+    index = recommendation_index()
+    pool = index.get(segment, index['multiple'])
+    boosted = target_category_ids(user)
+    if boosted:
+        pool = sorted(
+            pool,
+            key=lambda item: -(item[0] + (TARGET_CATEGORY_BOOST if item[1].exam_category_id in boosted else 0)),
+        )
+    return [exam for _, exam in pool[:limit]]
+
+
+def invalidate_index():
+    cache.delete(index_key(timezone.localdate()))
+
+
+@receiver(post_save, sender=UpcomingExam)
+@receiver(post_delete, sender=UpcomingExam)
+@receiver(post_save, sender=ExamCategory)
+@receiver(post_delete, sender=ExamCategory)
+def _exams_changed(sender, **kwargs):
+    invalidate_index()
+
+
+@receiver(post_save, sender=ExamTarget)
+@receiver(post_delete, sender=ExamTarget)
+def _target_changed(sender, instance, **kwargs):
+    cache.delete(targets_key(instance.user_id))
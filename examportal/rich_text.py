@@ -0,0 +1,35 @@
+"""
+Save-time rendering of text fields that templates used to filter per request.
+
+``UpcomingExam`` keeps the ``linebreaks`` HTML of its long text fields in
+``rendered_text``. ``Announcement`` keeps a plain-text ``summary`` of its
+CKEditor content. Both are filled in ``save()``. Use the
+``render_rich_text`` command after bulk imports or after changing the rules
+here. The functions only read attributes, so migrations can use them with
+historical models.
+"""
+from html import unescape
+
+from django.template.defaultfilters import linebreaks_filter
+from django.utils.html import strip_tags
+from django.utils.text import Truncator
+
+LINEBREAK_FIELDS = [
+    'vacancy_breakdown', 'educational_qualification', 'percentage_required',
+    'how_to_apply', 'exam_pattern', 'syllabus',
+]
+SUMMARY_WORDS = 30
+
+
+def render_linebreaks(exam):
+    """``{field: html}`` for every non-empty field; the text is escaped before wrapping."""
+    return {
+        field: str(linebreaks_filter(getattr(exam, field), autoescape=True))
+        for field in LINEBREAK_FIELDS
+        if getattr(exam, field)
+    }
+
+
+def summarize(html, words=SUMMARY_WORDS):
+    """Plain-text teaser of CKEditor HTML. Templates escape it like any other text."""
+    return Truncator(unescape(strip_tags(html)).strip()).words(words)
@@ -0,0 +1,169 @@
+"""
+Cached search results.
+
+``search(query)`` normalizes the query, so "SSC  CGL" and "ssc cgl" share an
+entry. It then looks up the matching ids per section in the cache and loads
+the rows by primary key with the relations the template needs. Cache keys
+include a content version that is bumped when any searchable model changes,
+so stale ids are never served. Entries also expire after
+``SEARCH_CACHE_SECONDS``.
+
+Concurrent misses for the same query are coalesced. The first request takes
+a short lock in the cache and runs the six ``icontains`` queries. The others
+wait up to ``COALESCE_WAIT_SECONDS`` for its result before giving up and
+running the queries themselves. With a shared cache this works across
+workers. Hit, miss and coalesced counts are kept in the cache too, see
+``stats()``.
+
+Token order is kept in the key. Each section still matches the whole phrase
+as a substring, so "cgl ssc" and "ssc cgl" can return different rows.
+"""
+import hashlib
+import time
+
+from django.core.cache import cache
+from django.db.models import Q
+from django.db.models.signals import post_delete, post_save
+
+from .models import AdmitCard, Announcement, AnswerKey, ExamCategory, Note, Result, Subject, UpcomingExam
+
+SEARCH_CACHE_SECONDS = 300
+SECTION_LIMIT = 10
+LOCK_SECONDS = 10
+COALESCE_WAIT_SECONDS = 2.0
+COALESCE_POLL_SECONDS = 0.01
+VERSION_KEY = 'examportal:search-version'
+STATS = ['hits', 'misses', 'coalesced']
+
+# section -> (model, relations the template reads)
+SECTIONS = {
+    'notes': (Note, ['subject__exam_category']),
+    'exams': (UpcomingExam, ['exam_category']),
+    'announcements': (Announcement, []),
+    'answer_keys': (AnswerKey, ['exam']),
+    'admit_cards': (AdmitCard, ['exam']),
+    'results': (Result, ['exam']),
+}
+
+
+def normalize_query(query):
+    return ' '.join(query.lower().split())
+
+
+def matching(query):
+    """The uncached per-section querysets, as the search view always ran them."""
+    exam_match = (
+        Q(title__icontains=query) |
+        Q(exam__title__icontains=query) |
+        Q(exam__exam_category__name__icontains=query)
+    )
+    return {
+        'notes': Note.objects.filter(
+            Q(title__icontains=query) |
+            Q(content__icontains=query) |
+            Q(subject__name__icontains=query) |
+            Q(subject__exam_category__name__icontains=query),
+            is_active=True
+        ),
+        'exams': UpcomingExam.objects.filter(
+            Q(title__icontains=query) |
+            Q(description__icontains=query) |
+            Q(exam_category__name__icontains=query),
+            is_active=True
+        ),
+        'announcements': Announcement.objects.filter(
+            Q(title__icontains=query) |
+            Q(content__icontains=query),
+            is_active=True
+        ),
+        'answer_keys': AnswerKey.objects.filter(exam_match, is_active=True),
+        'admit_cards': AdmitCard.objects.filter(exam_match, is_active=True),
+        'results': Result.objects.filter(exam_match, is_active=True),
+    }
+
+
+def compute_ids(query):
+    return {
+        section: list(queryset.distinct().values_list('id', flat=True)[:SECTION_LIMIT])
+        for section, queryset in matching(query).items()
+    }
+
+
+def result_key(query):
+    # Start from the clock so an evicted version never reuses an old number.
+    version = cache.get_or_set(VERSION_KEY, time.time_ns, None)
+    return f'examportal:search:{version}:{hashlib.md5(query.encode()).hexdigest()}'
+
+
+def count(stat):
+    key = f'examportal:search-stats:{stat}'
+    try:
+        cache.incr(key)
+    except ValueError:
+        if not cache.add(key, 1, None):
+            cache.incr(key)
+
+
+def cached_ids(query):
+    """Per-section result ids for a normalized query, computing them at most once at a time."""
+    key = result_key(query)
+    ids = cache.get(key)
+    if ids is not None:
+        count('hits')
+        return ids
+
+    lock = f'{key}:lock'
+    if not cache.add(lock, 1, LOCK_SECONDS):
+        # Someone else is computing this query; wait for their result.
+        deadline = time.monotonic() + COALESCE_WAIT_SECONDS
+        while time.monotonic() < deadline:
+            time.sleep(COALESCE_POLL_SECONDS)
+            ids = cache.get(key)
+            if ids is not None:
+                count('coalesced')
+                return ids
+
+    count('misses')
+    try:
+        ids = compute_ids(query)
+        cache.set(key, ids, SEARCH_CACHE_SECONDS)
+    finally:
+        cache.delete(lock)
+    return ids
+
+
+def load(section, ids):
+    if not ids:
+        return []
+    model, related = SECTIONS[section]
+    rows = model.objects.select_related(*related).in_bulk(ids)
+    return [rows[pk] for pk in ids if pk in rows]
+
+
+def search(query):
+    """``{section: [objects]}`` for a raw query string; empty sections for a blank query."""
+    query = normalize_query(query)
+    if not query:
+        return {section: [] for section in SECTIONS}
+    ids = cached_ids(query)
+    return {section: load(section, ids[section]) for section in SECTIONS}
+
+
+def stats():
+    values = cache.get_many([f'examportal:search-stats:{stat}' for stat in STATS])
+    counts = {stat: values.get(f'examportal:search-stats:{stat}', 0) for stat in STATS}
+    lookups = sum(counts.values())
+    counts['hit_rate'] = round((counts['hits'] + counts['coalesced']) / lookups, 4) if lookups else None
+    return counts
+
+
+def bump_version(**kwargs):
+    try:
+        cache.incr(VERSION_KEY)
+    except ValueError:
+        cache.set(VERSION_KEY, time.time_ns(), None)
+
+
+for _model in [Note, Subject, ExamCategory, UpcomingExam, Announcement, AnswerKey, AdmitCard, Result]:
+    post_save.connect(bump_version, sender=_model, dispatch_uid=f'search-save-{_model.__name__}')
+    post_delete.connect(bump_version, sender=_model, dispatch_uid=f'search-delete-{_model.__name__}')
@@ -0,0 +1,87 @@
+"""
+High-concurrency SQLite mode.
+
+``configure_connection`` runs on ``connection_created`` and applies
+``settings.SQLITE_PRAGMAS`` (WAL journaling, ``synchronous=NORMAL``, busy
+timeout, mmap and page cache size) to every SQLite connection.
+
+``serialized_write`` wraps a unit of writes so that, on SQLite, it runs in
+its own transaction behind a writer lock shared by every thread and worker
+process using the same database file, and is retried with backoff if SQLite
+still reports the database as locked. On other databases it just calls the
+function.
+"""
+import random
+import threading
+import time
+from contextlib import contextmanager
+from functools import wraps
+
+from django.conf import settings
+from django.db import DEFAULT_DB_ALIAS, OperationalError, connections, transaction
+
+try:
+    import fcntl
+except ImportError:  # Windows: fall back to the in-process lock only.
+    fcntl = None
+
+WRITE_RETRIES = 5
+RETRY_BACKOFF = 0.05
+
+_thread_lock = threading.RLock()
+
+
+def is_enabled(using=DEFAULT_DB_ALIAS):
+    return getattr(settings, 'SQLITE_CONCURRENCY_MODE', False) and connections[using].vendor == 'sqlite'
+
+
+def configure_connection(sender, connection, **kwargs):
+    if connection.vendor != 'sqlite' or not getattr(settings, 'SQLITE_CONCURRENCY_MODE', False):
+        return
+    with connection.cursor() as cursor:
+        for pragma, value in getattr(settings, 'SQLITE_PRAGMAS', {}).items():
+            cursor.execute(f'PRAGMA {pragma} = {value}')
+
+
+def _lock_path(using):
+    name = str(connections[using].settings_dict['NAME'])
+    if not name or name == ':memory:' or name.startswith('file:'):
+        return None
+    return name + '.writelock'
+
+
+@contextmanager
+def writer_lock(using=DEFAULT_DB_ALIAS):
+    """Serialize writers across threads and, where fcntl exists, processes."""
+    with _thread_lock:
+        path = _lock_path(using) if fcntl else None
+        if path is None:
+            yield
+            return
+        with open(path, 'a') as handle:
+            fcntl.flock(handle, fcntl.LOCK_EX)
+            try:
+                yield
+            finally:
+                fcntl.flock(handle, fcntl.LOCK_UN)
+
+
+def is_locked_error(exc):
+    return 'locked' in str(exc) or 'busy' in str(exc)
+
+
+def serialized_write(func):
+    @wraps(func)
+    def wrapper(*args, **kwargs):
+        # Inside an outer transaction the caller owns locking and retries.
+        if not is_enabled() or connections[DEFAULT_DB_ALIAS].in_atomic_block:
+            return func(*args, **kwargs)
+        for attempt in range(WRITE_RETRIES):
+            try:
+                with writer_lock(), transaction.atomic():
+                    return func(*args, **kwargs)
+            except OperationalError as exc:
+                if not is_locked_error(exc) or attempt == WRITE_RETRIES - 1:
+                    raise
+            time.sleep(RETRY_BACKOFF * (2 ** attempt) * random.uniform(0.5, 1.5))
+    return wrapper
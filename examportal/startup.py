@@ -0,0 +1,95 @@
+"""
+Worker startup profiling.
+
+``profile_startup()`` starts a fresh interpreter with ``-X importtime``. It
+loads the app the way a web worker does: it imports the WSGI application and
+builds the URL resolver, which imports every view module. Like
+``python -X importtime manage.py check``, but without the system checks.
+The child reports its wall time and peak resident memory. The parent parses
+the import log into per-module cumulative times.
+
+``over_budget()`` compares a profile with ``STARTUP_BUDGET``. It also fails
+when any module from ``FORBIDDEN_IMPORTS`` is loaded. These are the heavy
+packages in the full ``requirements.txt`` that the web app has no use for.
+``requirements-runtime.txt`` lists what workers actually need.
+"""
+import json
+import os
+import re
+import subprocess
+import sys
+import time
+from pathlib import Path
+
+BASE_DIR = Path(__file__).resolve().parent.parent
+
+STARTUP_BUDGET = {
+    'seconds': 3.0,      # wall time of the whole child, interpreter start included
+    'max_rss_mb': 100,   # peak resident memory of the child
+}
+FORBIDDEN_IMPORTS = [
+    'numpy', 'pandas', 'scipy', 'matplotlib', 'seaborn', 'cv2', 'keras', 'tensorflow', 'torch',
+    'torchvision', 'ultralytics', 'sympy', 'h5py', 'flask', 'sqlalchemy', 'reportlab',
+]
+
+CHILD = """
+import json, os, resource, sys
+os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'govtexamprep.settings')
+from govtexamprep.wsgi import application
+from django.urls import get_resolver
+get_resolver().url_patterns
+rss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+# ru_maxrss is in KiB on Linux and in bytes on macOS
+print(json.dumps({'max_rss_mb': rss / (1024 * 1024 if sys.platform == 'darwin' else 1024)}))
+"""
+IMPORT_LINE = re.compile(r'^import time:\s+\d+\s+\|\s+(\d+)\s+\|\s*(\S+)$')
+
+
+def parse_importtime(stderr):
+    """``{module: cumulative seconds}`` from ``-X importtime`` output."""
+    modules = {}
+    for line in stderr.splitlines():
+        match = IMPORT_LINE.match(line)
+        if match:
+            modules[match.group(2)] = int(match.group(1)) / 1_000_000
+    return modules
+
+
+def profile_startup(env=None):
+    # Warm-up needs the database and is timed by /health/ready/; measure imports only.
+    child_env = {**os.environ, 'DJANGO_WARMUP': '0', **(env or {})}
+    child_env.pop('PYTHONIMPORTTIME', None)
+    start = time.perf_counter()
+    completed = subprocess.run(
+        [sys.executable, '-X', 'importtime', '-c', CHILD],
+        cwd=BASE_DIR, env=child_env, capture_output=True, text=True, check=True,
+    )
+    seconds = time.perf_counter() - start
+    profile = json.loads(completed.stdout.strip().splitlines()[-1])
+    profile['seconds'] = seconds
+    profile['modules'] = parse_importtime(completed.stderr)
+    return profile
+
+
+def heaviest_imports(profile, limit=15):
+    """The top-level packages with the largest cumulative import time."""
+    packages = {}
+    for module, seconds in profile['modules'].items():
+        package = module.split('.')[0]
+        packages[package] = max(packages.get(package, 0), seconds)
+    return sorted(packages.items(), key=lambda item: item[1], reverse=True)[:limit]
+
+
+def over_budget(profile, budget=None):
+    """Human-readable budget violations; empty when the profile is within budget."""
+    budget = {**STARTUP_BUDGET, **(budget or {})}
+    problems = []
+    if profile['seconds'] > budget['seconds']:
+        problems.append(f"startup took {profile['seconds']:.2f}s, budget {budget['seconds']:.2f}s")
+    if profile['max_rss_mb'] > budget['max_rss_mb']:
+        problems.append(f"peak memory {profile['max_rss_mb']:.0f} MB, budget {budget['max_rss_mb']} MB")
+    loaded = {module.split('.')[0] for module in profile['modules']}
+    for module in FORBIDDEN_IMPORTS:
+        if module in loaded:
+            problems.append(f'{module} is imported at startup')
+    return problems
@@ -0,0 +1,273 @@
+"""
+Offline batch sync for progress events.
+
+A client that studied offline posts its queued events to
+``/progress/sync/`` as JSON::
+
+    {"events": [
+        {"id": "c1f0...", "type": "session_started", "at": "2026-10-19T07:00:00Z", "subject_id": 3},
+        {"id": "9a2b...", "type": "note_completed", "at": "2026-10-19T07:20:00Z", "note_id": 41},
+        {"id": "77de...", "type": "session_ended", "at": "2026-10-19T07:45:00Z", "session": "c1f0..."},
+        {"id": "e310...", "type": "exam_target_set", "at": "2026-10-19T07:46:00Z",
+         "exam_id": 9, "target_date": "2027-01-10", "daily_goal": 90}
+    ]}
+
+``id`` is a client-generated idempotency key. Every applied event is kept
+as a ``SyncEvent``, so a batch resent after a lost response applies nothing
+twice. ``session_ended`` names its session by the key of the
+``session_started`` event, which may have arrived in an earlier batch, or by
+a server ``session_id``. Timestamps in the future are clamped to now.
+
+The whole batch is applied in one transaction with set-based writes:
+- notes go through the bulk completion used by ``mark_notes_completed``
+- sessions are started with one ``bulk_create`` and ended with one
+  ``bulk_update``
+- exam targets keep the latest event per exam
+Invalid events are returned as ``rejected`` and not recorded, so they can be
+fixed and resent. The response ends with the user's current progress state.
+"""
+import json
+
+from django.contrib.auth.decorators import login_required
+from django.contrib.auth.models import User
+from django.core.cache import cache
+from django.db import connection, transaction
+from django.http import JsonResponse
+from django.utils import timezone
+from django.utils.dateparse import parse_date, parse_datetime
+
+from . import heartbeats, heatmap, leaderboards, recommendations, views
+from .models import ExamTarget, Note, Subject, SyncEvent, UpcomingExam, UserProgress, UserStudySession
+from .sqlite import serialized_write
+
+MAX_EVENTS = 500
+# event type -> integer fields it needs
+EVENT_FIELDS = {
+    'note_completed': ['note_id'],
+    'session_started': ['subject_id'],
+    'session_ended': [],
+    'exam_target_set': ['exam_id'],
+}
+
+
+class EventError(ValueError):
+    pass
+
+
+def parse_event(raw, now):
+    if not isinstance(raw, dict):
+        raise EventError('Event must be an object')
+    key = str(raw.get('id') or '')
+    if not key or len(key) > 64:
+        raise EventError('Event needs an id of at most 64 characters')
+    event_type = raw.get('type')
+    if event_type not in EVENT_FIELDS:
+        raise EventError(f'Unknown event type: {event_type}')
+    at = parse_datetime(str(raw.get('at') or ''))
+    if at is None:
+        raise EventError('Event needs an ISO 8601 "at" timestamp')
+    if timezone.is_naive(at):
+        at = timezone.make_aware(at)
+    event = {'key': key, 'type': event_type, 'at': min(at, now)}
+    try:
+        for field in EVENT_FIELDS[event_type]:
+            event[field] = int(raw[field])
+        if event_type == 'session_ended':
+            if raw.get('session'):
+                event['session'] = str(raw['session'])
+            else:
+                event['session_id'] = int(raw['session_id'])
+        if event_type == 'exam_target_set':
+            event['daily_goal'] = int(raw.get('daily_goal', 120))
+    except (KeyError, TypeError, ValueError) as e:
+        raise EventError(f'Missing or invalid field for {event_type}: {e}')
+    if event_type == 'exam_target_set':
+        event['target_date'] = parse_date(str(raw.get('target_date') or ''))
+        if event['target_date'] is None:
+            raise EventError('exam_target_set needs a target_date')
+    return event
+
+
+def _create_sessions(sessions):
+    if connection.features.can_return_rows_from_bulk_insert:
+        return UserStudySession.objects.bulk_create(sessions)
+    for session in sessions:  # backends that cannot return the new ids
+        session.save()
+    return sessions
+
+
+@serialized_write
+def apply_events(user, raw_events):
+    now = timezone.now()
+    result = {'applied': [], 'duplicates': [], 'rejected': [], 'sessions': {}}
+    events = []
+    for raw in raw_events:
+        try:
+            events.append(parse_event(raw, now))
+        except EventError as e:
+            result['rejected'].append({'id': raw.get('id') if isinstance(raw, dict) else None, 'error': str(e)})
+
+    with transaction.atomic():
+        # One sync per user at a time, so concurrent replays cannot both apply
+        list(User.objects.select_for_update().filter(pk=user.pk).values_list('pk', flat=True))
+        recorded = dict(
+            SyncEvent.objects.filter(user=user, key__in=[event['key'] for event in events])
+            .values_list('key', 'session_id')
+        )
+        fresh, seen = [], set()
+        for event in sorted(events, key=lambda event: event['at']):
+            if event['key'] in recorded or event['key'] in seen:
+                result['duplicates'].append(event['key'])
+            else:
+                seen.add(event['key'])
+                fresh.append(event)
+
+        def reject(event, error):
+            result['rejected'].append({'id': event['key'], 'error': error})
+
+        by_type = {event_type: [event for event in fresh if event['type'] == event_type] for event_type in EVENT_FIELDS}
+        applied = []
+
+        # Notes
+        notes = Note.objects.filter(id__in=[event['note_id'] for event in by_type['note_completed']]).only(
+            'id', 'subject_id', 'title'
+        ).in_bulk()
+        for event in by_type['note_completed']:
+            if event['note_id'] in notes:
+                applied.append(event)
+            else:
+                reject(event, 'Unknown note')
+        if notes:
+            views._complete_notes(user, sorted(notes.values(), key=lambda note: note.id))
+
+        # Session starts
+        subject_ids = set(Subject.objects.filter(
+            id__in=[event['subject_id'] for event in by_type['session_started']]
+        ).values_list('id', flat=True))
+        starts = []
+        for event in by_type['session_started']:
+            if event['subject_id'] in subject_ids:
+                starts.append(event)
+            else:
+                reject(event, 'Unknown subject')
+        created = _create_sessions([
+            UserStudySession(user=user, subject_id=event['subject_id'], start_time=event['at']) for event in starts
+        ])
+        session_ids = {key: session_id for key, session_id in recorded.items() if session_id}
+        for event, session in zip(starts, created):
+            session_ids[event['key']] = session.id
+            result['sessions'][event['key']] = session.id
+            event['created_session'] = session
+            applied.append(event)
+
+        # Session ends
+        ends = by_type['session_ended']
+        earlier = {event['session'] for event in ends if 'session' in event} - set(session_ids)
+        if earlier:  # started in an earlier batch
+            session_ids.update(
+                SyncEvent.objects.filter(user=user, key__in=earlier, session__isnull=False)
+                .values_list('key', 'session_id')
+            )
+        for event in ends:
+            if 'session' in event:
+                event['session_id'] = session_ids.get(event['session'])
+        open_sessions = UserStudySession.objects.filter(
+            user=user, end_time__isnull=True, id__in=[event['session_id'] for event in ends if event['session_id']]
+        ).in_bulk()
+        ended = []
+        for event in ends:
+            session = open_sessions.pop(event['session_id'], None)
+            if session is None:
+                reject(event, 'Unknown or already ended session')
+                continue
+            session.end_time = max(event['at'], session.start_time)
+            session.duration_minutes = int((session.end_time - session.start_time).total_seconds() / 60)
+            ended.append(session)
+            applied.append(event)
+        if ended:
+            UserStudySession.objects.bulk_update(ended, ['end_time', 'duration_minutes'])
+            leaderboards.record_sessions(ended)
+            heatmap.invalidate([user.id])
+            for session in ended:
+                heartbeats.buffer.discard(session.id)
+            views.log_activity(
+                user, 'study_session',
+                f'Studied {sum(session.duration_minutes for session in ended)} minutes '
+                f'in {len(ended)} synced session{"s" if len(ended) != 1 else ""}'
+            )
+
+        # Exam targets: the latest event per exam wins
+        latest = {event['exam_id']: event for event in by_type['exam_target_set']}
+        exam_ids = set(UpcomingExam.objects.filter(id__in=latest).values_list('id', flat=True))
+        for event in by_type['exam_target_set']:
+            if event['exam_id'] not in exam_ids:
+                reject(event, 'Unknown exam')
+            else:
+                applied.append(event)
+        targets = {target.exam_id: target for target in ExamTarget.objects.filter(user=user, exam_id__in=exam_ids)}
+        new_targets = []
+        for exam_id in exam_ids:
+            event = latest[exam_id]
+            target = targets.get(exam_id)
+            if target is None:
+                new_targets.append(ExamTarget(user=user, exam_id=exam_id, target_date=event['target_date'],
+                                              daily_study_goal=event['daily_goal']))
+            else:
+                target.target_date, target.daily_study_goal = event['target_date'], event['daily_goal']
+        if targets:
+            ExamTarget.objects.bulk_update(targets.values(), ['target_date', 'daily_study_goal'])
+        if new_targets:
+            ExamTarget.objects.bulk_create(new_targets)
+        if exam_ids:
+            cache.delete(recommendations.targets_key(user.id))  # bulk writes skip the signal
+
+        SyncEvent.objects.bulk_create([
+            SyncEvent(user=user, key=event['key'], event_type=event['type'], occurred_at=event['at'],
+                      session=event.get('created_session'))
+            for event in applied
+        ], ignore_conflicts=True)
+        result['applied'] = [event['key'] for event in applied]
+    return result
+
+
+def progress_state(user):
+    """The user's current progress, open sessions and exam targets."""
+    completed = {}
+    for subject_id, note_id in UserProgress.completed_notes.through.objects.filter(
+        userprogress__user=user
+    ).values_list('userprogress__subject_id', 'note_id'):
+        completed.setdefault(subject_id, []).append(note_id)
+    return {
+        'subjects': [
+            {**row, 'completed_notes': sorted(completed.get(row['subject_id'], []))}
+            for row in UserProgress.objects.filter(user=user).values(
+                'subject_id', 'total_notes', 'progress_percentage', 'last_updated'
+            ).order_by('subject_id')
+        ],
+        'open_sessions': list(
+            UserStudySession.objects.filter(user=user, end_time__isnull=True)
+            .values('id', 'subject_id', 'start_time').order_by('start_time')
+        ),
+        'exam_targets': list(
+            ExamTarget.objects.filter(user=user).values('exam_id', 'target_date', 'daily_study_goal').order_by('exam_id')
+        ),
+    }
+
+
+@login_required
+def sync_progress(request):
+    try:
+        if request.method == 'POST':
+            try:
+                events = json.loads(request.body or b'{}').get('events', [])
+            except (ValueError, AttributeError):
+                return JsonResponse({'success': False, 'error': 'Body must be a JSON object'}, status=400)
+            if not isinstance(events, list) or len(events) > MAX_EVENTS:
+                return JsonResponse({'success': False, 'error': f'events must be a list of at most {MAX_EVENTS}'},
+                                    status=400)
+            result = apply_events(request.user, events)
+            return JsonResponse({'success': True, **result, 'state': progress_state(request.user)})
+
+        return JsonResponse({'success': False})
+    except Exception as e:
+        return JsonResponse({'success': False, 'error': str(e)})
@@ -1,3 +1,1094 @@
-from django.test import TestCase
+import io
+import json
+import tempfile
+import threading
+import time
+from datetime import date, datetime, timedelta
+from unittest import mock
 
-# Create your tests here.
+from django.contrib.auth.models import User
+from django.core.cache import cache
+from django.core.management import CommandError, call_command
+from django.db import connection
+from django.test import RequestFactory, SimpleTestCase, TestCase, TransactionTestCase, override_settings
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+from django.utils import timezone
+
+from . import (
+    auth_cache, context_processors, crawlers, db_routers, eligibility, exam_data, exam_facets, exam_reports, fragments,
+    heartbeats, heatmap, leaderboards, prerender, ratelimit, recommendations, search_cache, startup, sync, views,
+    warmup,
+)
+from .benchmarks import VIEW_CASES, find_regressions, load_baselines, run_benchmarks
+from .urls_async import ASYNC_VIEWS
+from .models import (
+    Announcement, ExamCategory, ExamTarget, Note, StudyTimeTotal, Subject, SyncEvent, UpcomingExam, UserActivity,
+    UserProfile, UserProgress, UserStudySession,
+)
+from .urls import urlpatterns
+
+
+class ViewBenchmarkCoverageTests(TestCase):
+    def test_every_named_url_has_a_benchmark_case(self):
+        url_names = {pattern.name for pattern in urlpatterns if pattern.name}
+        benchmarked = {case.url_name for case in VIEW_CASES}
+        self.assertEqual(url_names - benchmarked, set())
+
+    def test_command_fails_on_a_regression(self):
+        command = 'examportal.management.commands.benchmark_views'
+        baseline = {'home': {'seconds': 0.01, 'queries': 3, 'bytes': 1000, 'status': 200}}
+        measured = {'home': {'seconds': 0.01, 'queries': 9, 'bytes': 1000, 'status': 200}}
+        out = io.StringIO()
+        # The throwaway database and the seeding are not under test here.
+        with (
+            mock.patch(f'{command}.connection'),
+            mock.patch(f'{command}.call_command'),
+            mock.patch(f'{command}.setup_test_environment'),
+            mock.patch(f'{command}.teardown_test_environment'),
+            mock.patch(f'{command}.load_baselines', return_value={'0.01': baseline}),
+            mock.patch(f'{command}.run_benchmarks', return_value=measured),
+            self.assertRaisesMessage(CommandError, '1 regression(s)'),
+        ):
+            call_command('benchmark_views', scales=[0.01], stdout=out)
+        self.assertIn('REGRESSION home: 9 queries (baseline 3)', out.getvalue())
+
+
+class ViewBenchmarkMixin:
+    """Fails when a view regresses against benchmark_baselines.json."""
+    scale = None
+
+    @classmethod
+    def setUpTestData(cls):
+        call_command('seed_examportal', scale=cls.scale, stdout=io.StringIO())
+
+    def test_views_within_baseline(self):
+        baseline = load_baselines().get(str(self.scale))
+        if not baseline:
+            self.skipTest(f'No baseline recorded for scale {self.scale}')
+        # Baselines are recorded against the primary database only.
+        with override_settings(DATABASE_REPLICAS=[]):
+            results = run_benchmarks(repeat=3)
+        self.assertEqual(find_regressions(results, baseline), [])
+
+
+class SmallDatasetBenchmarkTests(ViewBenchmarkMixin, TestCase):
+    scale = 0.01
+
+
+class MediumDatasetBenchmarkTests(ViewBenchmarkMixin, TestCase):
+    scale = 0.05
+
+
+class ReplicaRouterTests(TestCase):
+    def setUp(self):
+        self.router = db_routers.ReplicaRouter()
+        db_routers._unavailable_until.clear()
+
+    def tearDown(self):
+        db_routers._unavailable_until.clear()
+
+    @override_settings(DATABASE_REPLICAS=['replica1'])
+    def test_public_request_reads_content_from_replica(self):
+        self.assertIsNone(self.router.db_for_read(Note))
+        token = db_routers.use_replicas()
+        try:
+            with mock.patch.object(db_routers, 'replica_available', return_value=True):
+                self.assertEqual(self.router.db_for_read(Note), 'replica1')
+                self.assertIsNone(self.router.db_for_read(User))
+        finally:
+            db_routers.stop_using_replicas(token)
+
+    @override_settings(DATABASE_REPLICAS=['replica1'])
+    def test_write_pins_request_to_primary(self):
+        token = db_routers.use_replicas()
+        try:
+            with mock.patch.object(db_routers, 'replica_available', return_value=True):
+                self.assertEqual(self.router.db_for_write(Note), 'default')
+                self.assertIsNone(self.router.db_for_read(Note))
+        finally:
+            db_routers.stop_using_replicas(token)
+
+    @override_settings(DATABASE_REPLICAS=['missing'])
+    def test_unavailable_replica_falls_back_to_primary(self):
+        token = db_routers.use_replicas()
+        try:
+            self.assertEqual(self.router.db_for_read(Note), 'default')
+            self.assertIn('missing', db_routers._unavailable_until)
+        finally:
+            db_routers.stop_using_replicas(token)
+
+    @override_settings(DATABASE_REPLICAS=['replica1'])
+    def test_middleware_only_marks_public_reads(self):
+        seen = []
+        middleware = db_routers.ReplicaRoutingMiddleware(
+            lambda request: seen.append(db_routers._request_state.get())
+        )
+        factory = RequestFactory()
+        middleware(factory.get('/results/'))
+        middleware(factory.get('/dashboard/'))
+        middleware(factory.post('/search/'))
+        self.assertEqual(seen, [{'pinned': False}, None, None])
+        self.assertIsNone(db_routers._request_state.get())
+
+
+class SQLiteConcurrencyTests(SimpleTestCase):
+    def test_concurrent_writers_do_not_hit_lock_errors(self):
+        out = io.StringIO()
+        call_command('sqlite_stress', processes=4, writes=25, json=True, stdout=out)
+        summary = json.loads(out.getvalue())
+        self.assertEqual(summary['writes'], 100)
+        self.assertEqual(summary['lock_errors'], 0)
+
+
+@override_settings(ROOT_URLCONF='govtexamprep.urls_async')
+class AsyncViewTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        call_command('seed_examportal', scale=0.01, stdout=io.StringIO())
+
+    def test_async_views_match_sync_baseline(self):
+        baseline = load_baselines().get('0.01', {})
+        cases = [case for case in VIEW_CASES if case.url_name in ASYNC_VIEWS]
+        with override_settings(DATABASE_REPLICAS=[]):
+            results = run_benchmarks(repeat=1, cases=cases)
+        for url_name, measured in results.items():
+            self.assertEqual(measured['status'], baseline[url_name]['status'], url_name)
+            self.assertLessEqual(measured['queries'], baseline[url_name]['queries'], url_name)
+
+
+class StudyHeartbeatTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = User.objects.create_user('student', password='pass12345')
+        category = ExamCategory.objects.create(name='SSC')
+        cls.subject = Subject.objects.create(exam_category=category, name='Reasoning')
+
+    def setUp(self):
+        self.buffer = heartbeats.HeartbeatBuffer()
+        self.start = timezone.now() - timedelta(minutes=20)
+        self.session = UserStudySession.objects.create(user=self.user, subject=self.subject, start_time=self.start)
+
+    def test_heartbeats_are_coalesced_into_one_write(self):
+        for minutes in (5, 10, 15):
+            self.assertTrue(self.buffer.beat(self.session.id, self.user.id, now=self.start + timedelta(minutes=minutes)))
+        self.session.refresh_from_db()
+        self.assertIsNone(self.session.last_heartbeat)
+
+        with self.assertNumQueries(1):
+            self.assertEqual(self.buffer.flush(), 1)
+        self.session.refresh_from_db()
+        self.assertEqual(self.session.duration_minutes, 15)
+        self.assertIsNone(self.session.end_time)
+
+    def test_heartbeat_for_another_users_session_is_rejected(self):
+        other = User.objects.create_user('other', password='pass12345')
+        self.assertFalse(self.buffer.beat(self.session.id, other.id))
+
+    def test_sweeper_closes_stale_sessions_at_last_heartbeat(self):
+        self.buffer.beat(self.session.id, self.user.id, now=self.start + timedelta(minutes=5))
+        self.buffer.flush()
+        fresh = UserStudySession.objects.create(user=self.user, subject=self.subject, start_time=timezone.now())
+
+        self.assertEqual(heartbeats.sweep_stale_sessions(), 1)
+        self.session.refresh_from_db()
+        fresh.refresh_from_db()
+        self.assertEqual(self.session.end_time, self.start + timedelta(minutes=5))
+        self.assertIsNone(fresh.end_time)
+
+    def test_sessions_without_heartbeats_survive_the_sweep(self):
+        # Clients that only call start and end never heartbeat
+        self.assertEqual(heartbeats.sweep_stale_sessions(now=self.start + timedelta(hours=2)), 0)
+        self.client.force_login(self.user)
+        with self.captureOnCommitCallbacks(execute=True):
+            response = self.client.post(reverse('end_study_session', args=[self.session.id]))
+        self.assertEqual(response.json()['duration'], 20)
+        total = StudyTimeTotal.objects.get(user=self.user, period=leaderboards.ALL_TIME)
+        self.assertEqual(total.minutes, 20)
+
+        abandoned = UserStudySession.objects.create(
+            user=self.user, subject=self.subject, start_time=timezone.now() - timedelta(days=2),
+        )
+        self.assertEqual(heartbeats.sweep_stale_sessions(), 1)
+        abandoned.refresh_from_db()
+        self.assertEqual(abandoned.end_time, abandoned.start_time)
+
+    def test_heartbeat_endpoint(self):
+        self.client.force_login(self.user)
+        with mock.patch.object(heartbeats, 'buffer', self.buffer):
+            response = self.client.post(reverse('study_heartbeat', args=[self.session.id]))
+        self.assertEqual(response.json()['success'], True)
+        self.assertIn(self.session.id, self.buffer.pending)
+
+
+class AuthCacheTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = User.objects.create_user('cached', password='pass12345')
+        UserProfile.objects.create(user=cls.user, phone='9999999999')
+
+    def setUp(self):
+        cache.clear()
+        self.backend = auth_cache.CachedModelBackend()
+
+    def test_cached_user_and_profile_skip_queries(self):
+        self.backend.get_user(self.user.id)
+        auth_cache.get_cached_profile(self.user)
+        with self.assertNumQueries(0):
+            self.assertEqual(self.backend.get_user(self.user.id), self.user)
+            self.assertEqual(auth_cache.get_cached_profile(self.user).phone, '9999999999')
+
+    def test_saves_invalidate_cache(self):
+        self.backend.get_user(self.user.id)
+        profile = auth_cache.get_cached_profile(self.user)
+        self.user.is_active = False
+        self.user.save()
+        profile.phone = '8888888888'
+        profile.save()
+
+        self.assertIsNone(self.backend.get_user(self.user.id))
+        self.assertEqual(auth_cache.get_cached_profile(self.user).phone, '8888888888')
+
+    def test_logout_drops_cached_user(self):
+        self.client.force_login(self.user)
+        self.client.get(reverse('profile'))
+        self.assertIsNotNone(cache.get(auth_cache.user_key(self.user.id)))
+        self.client.get(reverse('logout'))
+        self.assertIsNone(cache.get(auth_cache.user_key(self.user.id)))
+
+    def test_sessions_from_before_the_cached_backend_stay_signed_in(self):
+        self.client.force_login(self.user, backend='django.contrib.auth.backends.ModelBackend')
+        response = self.client.get(reverse('profile'))
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.context['user'], self.user)
+
+    def test_failed_login_checks_the_password_once(self):
+        with mock.patch('django.contrib.auth.backends.ModelBackend.authenticate', return_value=None) as check:
+            self.assertFalse(self.client.login(username='cached', password='wrong'))
+        self.assertEqual(check.call_count, 1)
+
+
+class RecommendationTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = User.objects.create_user('aspirant', password='pass12345')
+        cls.banking = ExamCategory.objects.create(name='Banking', slug='banking')
+        cls.ssc = ExamCategory.objects.create(name='SSC', slug='ssc')
+        today = timezone.localdate()
+
+        def exam(title, category, opens, closes, vacancies=0):
+            return UpcomingExam.objects.create(
+                title=title, exam_category=category, description=title, total_vacancies=vacancies,
+                application_start=today + timedelta(days=opens), application_end=today + timedelta(days=closes),
+            )
+
+        cls.closing_soon = exam('IBPS PO', cls.banking, -20, 2)
+        cls.open_later = exam('SBI Clerk', cls.banking, 10, 40)
+        cls.big_open = exam('SSC CGL', cls.ssc, -5, 30, vacancies=17000)
+        cls.closed = exam('SSC CHSL', cls.ssc, -60, -10)
+
+    def setUp(self):
+        cache.clear()
+
+    def test_segments_rank_matching_exams(self):
+        index = recommendations.build_index()
+        self.assertEqual([exam for _, exam in index['banking']], [self.closing_soon, self.open_later])
+        self.assertEqual([exam for _, exam in index['multiple']][0], self.big_open)
+        self.assertEqual(index['railway'], [])
+
+    def test_targets_boost_their_category(self):
+        ranked = [self.big_open, self.closing_soon, self.open_later]
+        self.assertEqual(recommendations.recommend_exams(self.user, 'multiple'), ranked)
+
+        ExamTarget.objects.create(user=self.user, exam=self.closed, target_date=timezone.localdate())
+        self.assertEqual(recommendations.recommend_exams(self.user, 'multiple'), ranked[:2] + [self.closed])
+
+    def test_index_is_cached_until_exams_change(self):
+        recommendations.recommend_exams(self.user, 'ssc')
+        with self.assertNumQueries(0):
+            recommendations.recommend_exams(self.user, 'ssc')
+
+        self.big_open.is_active = False
+        self.big_open.save()
+        self.assertEqual(recommendations.recommend_exams(self.user, 'ssc'), [self.closed])
+
+
+class HomeFragmentCacheTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = User.objects.create_user('visitor', password='pass12345')
+        category = ExamCategory.objects.create(name='Railway', slug='railway')
+        Subject.objects.create(exam_category=category, name='General Awareness')
+
+    def setUp(self):
+        cache.clear()
+
+    def test_logged_in_home_reuses_shared_sections(self):
+        self.client.get(reverse('home'))
+        self.client.force_login(self.user)
+        with CaptureQueriesContext(connection) as warm:
+            response = self.client.get(reverse('home'))
+        self.assertContains(response, 'General Awareness')
+        self.assertFalse(any('examportal_upcomingexam' in query['sql'] for query in warm.captured_queries))
+
+    def test_content_change_bumps_version(self):
+        version = fragments.home_fragment_version()
+        Subject.objects.create(exam_category=ExamCategory.objects.get(), name='Mathematics')
+        self.assertNotEqual(fragments.home_fragment_version(), version)
+        self.assertContains(self.client.get(reverse('home')), 'Mathematics')
+
+    @override_settings(ROOT_URLCONF='govtexamprep.urls_async')
+    def test_async_home_renders_the_fragment_it_fetched(self):
+        key = fragments.home_fragment_key()
+        cache.set(key, '<p>Cached sections</p>')
+
+        def then_expire(read):
+            async def wrapper(*args, **kwargs):
+                value = await read(*args, **kwargs)
+                cache.delete(key)  # expires before the template would have read it
+                return value
+            return wrapper
+
+        with mock.patch.object(cache, 'aget', then_expire(cache.aget)), \
+                mock.patch.object(cache, 'ahas_key', then_expire(cache.ahas_key)):
+            response = self.client.get(reverse('home'))
+        self.assertContains(response, 'Cached sections')
+        self.assertIsNone(cache.get(key))  # no empty sections were cached
+
+
+class PrerenderTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.category = ExamCategory.objects.create(name='Teaching', slug='teaching')
+        cls.exam = UpcomingExam.objects.create(
+            title='CTET July', exam_category=cls.category, description='Central TET',
+            application_start=timezone.localdate(), application_end=timezone.localdate() + timedelta(days=30),
+        )
+
+    def setUp(self):
+        root = tempfile.TemporaryDirectory()
+        self.addCleanup(root.cleanup)
+        self.root = root.name
+        override = override_settings(PRERENDER_ROOT=self.root)
+        override.enable()
+        self.addCleanup(override.disable)
+
+    def test_command_writes_pages_and_variants(self):
+        call_command('prerender_pages', stdout=io.StringIO())
+        path = prerender.page_path(reverse('exam_detail', args=[self.exam.id]))
+        self.assertIn(b'CTET July', path.read_bytes())
+        self.assertTrue(path.with_name('index.html.gz').exists())
+        self.assertTrue(prerender.page_path(reverse('privacy_policy')).exists())
+
+
+        with self.assertNumQueries(0):
+            response = self.client.get(reverse('exam_detail', args=[self.exam.id]), HTTP_ACCEPT_ENCODING='gzip')
+        self.assertEqual(response.headers['Content-Encoding'], 'gzip')
+
+    def test_files_are_readable_by_the_web_server(self):
+        fake_brotli = mock.Mock(compress=lambda content: b'br:' + content)
+        with mock.patch.object(prerender, 'brotli', fake_brotli):
+            prerender.prerender_all()
+        path = prerender.page_path(reverse('exam_detail', args=[self.exam.id]))
+        for name in ('index.html', 'index.html.gz', 'index.html.br'):
+            mode = path.with_name(name).stat().st_mode & 0o777
+            self.assertEqual(mode, prerender.FILE_MODE, name)
+            self.assertNotEqual(mode, 0o600, name)
+
+    def test_exam_save_rerenders_only_that_page(self):
+        prerender.prerender_all()
+        path = prerender.page_path(reverse('exam_detail', args=[self.exam.id]))
+        with self.captureOnCommitCallbacks(execute=True):
+            self.exam.title = 'CTET December'
+            self.exam.save()
+        self.assertIn(b'CTET December', path.read_bytes())
+
+        with self.captureOnCommitCallbacks(execute=True):
+            self.exam.is_active = False
+            self.exam.save()
+        self.assertFalse(path.exists())
+        self.assertEqual(self.client.get(reverse('exam_detail', args=[self.exam.id])).status_code, 404)
+
+    def test_page_falls_back_to_live_view_once_its_status_changes(self):
+        prerender.prerender_all()
+        path = prerender.page_path(reverse('exam_detail', args=[self.exam.id]))
+        closes = self.exam.application_end + timedelta(days=1)
+        self.assertEqual(prerender.expires_path(path).read_text(), closes.isoformat())
+        self.assertIn(b'Open for Application', path.read_bytes())
+
+        with mock.patch.object(prerender.timezone, 'localdate', return_value=closes):
+            response = self.client.get(reverse('exam_detail', args=[self.exam.id]), HTTP_ACCEPT_ENCODING='gzip')
+        self.assertNotIn('Content-Encoding', response.headers)  # rendered live
+
+    def test_missing_page_falls_back_to_live_view(self):
+        response = self.client.get(reverse('exam_detail', args=[self.exam.id]))
+        self.assertContains(response, 'CTET July')
+        self.assertNotIn('Content-Encoding', response.headers)
+
+
+class RichTextRenderingTests(TestCase):
+    def test_exam_text_is_rendered_and_escaped_on_save(self):
+        exam = UpcomingExam.objects.create(
+            title='NDA I', exam_category=ExamCategory.objects.create(name='Defense', slug='defense'),
+            description='NDA', application_start=timezone.localdate(), application_end=timezone.localdate(),
+            syllabus='Maths <b>II</b>\nGAT',
+        )
+        self.assertEqual(exam.rendered_text, {'syllabus': '<p>Maths &lt;b&gt;II&lt;/b&gt;<br>GAT</p>'})
+
+        UpcomingExam.objects.filter(id=exam.id).update(rendered_text={})
+        call_command('render_rich_text', stdout=io.StringIO())
+        exam.refresh_from_db()
+        self.assertIn('syllabus', exam.rendered_text)
+
+    def test_announcement_summary_is_plain_text(self):
+        announcement = Announcement.objects.create(
+            title='Notice', content='<p><strong>Admit cards</strong> &amp; results <script>x</script></p>' + ' word' * 40,
+        )
+        self.assertTrue(announcement.summary.startswith('Admit cards & results x word'))
+        self.assertEqual(len(announcement.summary.split()), 30)
+
+
+class CrawlerTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        category = ExamCategory.objects.create(name='Banking', slug='banking')
+        cls.exam = UpcomingExam.objects.create(
+            title='IBPS Clerk', exam_category=category, description='Clerk',
+            application_start=timezone.localdate(), application_end=timezone.localdate(),
+        )
+        Announcement.objects.create(title='IBPS calendar out', content='<p>Dates announced</p>')
+
+    def setUp(self):
+        cache.clear()
+
+    def test_sitemap_index_and_exam_shard(self):
+        index = self.client.get(reverse('sitemap_index'))
+        self.assertContains(index, reverse('sitemap_section', args=['exams']))
+        shard = self.client.get(reverse('sitemap_section', args=['exams']))
+        self.assertContains(shard, reverse('exam_detail', args=[self.exam.id]))
+        self.assertContains(shard, f'<lastmod>{self.exam.updated_at:%Y-%m-%d}</lastmod>')
+        self.assertEqual(self.client.get(reverse('sitemap_section', args=['nope'])).status_code, 404)
+
+    def test_feeds_are_cached_until_content_changes(self):
+        url = reverse('feed', args=['announcements', 'atom'])
+        response = self.client.get(url)
+        self.assertContains(response, 'IBPS calendar out')
+        self.assertEqual(response['Content-Type'], 'application/atom+xml; charset=utf-8')
+
+        with self.assertNumQueries(0):
+            cached = self.client.get(url)
+            not_modified = self.client.get(url, HTTP_IF_MODIFIED_SINCE=response['Last-Modified'])
+        self.assertEqual(cached.content, response.content)
+        self.assertEqual(not_modified.status_code, 304)
+
+        with self.captureOnCommitCallbacks(execute=True):
+            Announcement.objects.create(title='SBI PO notification', content='<p>Apply now</p>')
+        self.assertContains(self.client.get(url), 'SBI PO notification')
+        self.assertEqual(self.client.get(reverse('feed', args=['exams', 'rss'])).status_code, 404)
+
+    def test_change_is_marked_when_it_commits(self):
+        before = crawlers.last_changed('announcements')
+        with self.captureOnCommitCallbacks() as callbacks:
+            Announcement.objects.create(title='SSC GD result date', content='<p>Soon</p>')
+            self.assertEqual(crawlers.last_changed('announcements'), before)
+        for callback in callbacks:
+            callback()
+        self.assertGreater(crawlers.last_changed('announcements'), before)
+
+    def test_change_times_expire_in_a_per_process_cache(self):
+        crawlers.last_changed('exams')
+        with mock.patch.object(cache, 'add', wraps=cache.add) as add:
+            cache.delete(crawlers.changed_key('exams'))
+            crawlers.last_changed('exams')
+        add.assert_called_once_with(crawlers.changed_key('exams'), mock.ANY, crawlers.LOCAL_CHANGED_SECONDS)
+
+    @override_settings(ALLOWED_HOSTS=['testserver', 'staging.example.com'])
+    def test_cache_is_kept_per_host_and_scheme(self):
+        url = reverse('sitemap_section', args=['exams'])
+        self.assertContains(self.client.get(url), 'http://testserver/')
+        self.assertContains(self.client.get(url, secure=True), 'https://testserver/')
+        staging = self.client.get(url, HTTP_HOST='staging.example.com')
+        self.assertContains(staging, 'http://staging.example.com/')
+        self.assertNotContains(staging, 'testserver')
+
+
+# A fast hasher keeps failed logins well inside the one-second refill of the login bucket
+@override_settings(
+    RATE_LIMITS={'search': (3, 60, None), 'login': (2, 60, ['POST'])},
+    PASSWORD_HASHERS=['django.contrib.auth.hashers.MD5PasswordHasher'],
+)
+class RateLimitTests(TestCase):
+    def test_exhausted_bucket_returns_429_with_retry_after(self):
+        for _ in range(3):
+            self.assertEqual(self.client.get(reverse('search')).status_code, 200)
+        response = self.client.get(reverse('search'))
+        self.assertEqual(response.status_code, 429)
+        self.assertEqual(response['Retry-After'], '1')
+        # Another address has its own bucket.
+        self.assertEqual(self.client.get(reverse('search'), REMOTE_ADDR='10.0.0.2').status_code, 200)
+
+    def test_budget_only_applies_to_listed_methods(self):
+        for _ in range(5):
+            self.assertEqual(self.client.get(reverse('login')).status_code, 200)
+        for _ in range(2):
+            self.client.post(reverse('login'), {'username': 'x', 'password': 'y'})
+        response = self.client.post(reverse('login'), {'username': 'x', 'password': 'y'}, HTTP_ACCEPT='text/html')
+        self.assertEqual(response.status_code, 429)
+        self.assertEqual(response['Content-Type'], 'text/plain; charset=utf-8')
+
+    def test_stores_refill_over_time(self):
+        cache.clear()
+        for store in (ratelimit.LocalBucketStore(), ratelimit.CacheBucketStore()):
+            self.assertEqual(store.take('k', 1, 0.5, now=100.0), 0)
+            self.assertEqual(store.take('k', 1, 0.5, now=101.0), 1.0)
+            self.assertEqual(store.take('k', 1, 0.5, now=102.0), 0)
+
+    def test_overhead_is_negligible(self):
+        middleware = ratelimit.RateLimitMiddleware(lambda request: None)
+        factory = RequestFactory()
+        requests = []
+        for i, url_name in enumerate(['search', 'home'] * 1000):
+            request = factory.get(reverse(url_name), REMOTE_ADDR=f'10.1.{i // 250}.{i % 250}')
+            request.resolver_match = mock.Mock(url_name=url_name)
+            requests.append(request)
+
+        started = time.perf_counter()
+        for request in requests:
+            middleware.process_view(request, None, (), {})
+        per_request = (time.perf_counter() - started) / len(requests)
+        self.assertLess(per_request, 50e-6)
+
+    @override_settings(RATE_LIMIT_ENABLED=True)
+    def test_loadtest_refuses_to_run_against_the_limiter(self):
+        with mock.patch('examportal.loadtest.LoadTest.run') as run:
+            with self.assertRaisesMessage(CommandError, 'DJANGO_RATE_LIMIT=0'):
+                call_command('loadtest', users=0, stdout=io.StringIO())
+        run.assert_not_called()
+
+
+class SearchCacheTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        category = ExamCategory.objects.create(name='SSC', slug='ssc')
+        cls.exam = UpcomingExam.objects.create(
+            title='SSC CGL 2026', exam_category=category, description='Combined Graduate Level',
+            application_start=timezone.localdate(), application_end=timezone.localdate(),
+        )
+
+    def setUp(self):
+        cache.clear()
+
+    def test_normalized_queries_share_one_entry(self):
+        self.assertEqual(search_cache.search('SSC  cgl')['exams'], [self.exam])
+        with self.assertNumQueries(1):  # only the primary-key load of the exam
+            self.assertEqual(search_cache.search(' ssc CGL ')['exams'], [self.exam])
+        self.assertEqual(search_cache.stats()['hits'], 1)
+        self.assertEqual(search_cache.stats()['hit_rate'], 0.5)
+
+    def test_content_change_invalidates_results(self):
+        self.assertEqual(search_cache.search('ssc cgl')['exams'], [self.exam])
+        self.exam.is_active = False
+        self.exam.save()
+        self.assertEqual(search_cache.search('ssc cgl')['exams'], [])
+
+    def test_concurrent_miss_waits_for_the_computing_request(self):
+        key = search_cache.result_key('ssc cgl')
+        cache.add(f'{key}:lock', 1)
+        timer = threading.Timer(0.05, lambda: cache.set(key, {section: [] for section in search_cache.SECTIONS}))
+        timer.start()
+        with self.assertNumQueries(0):
+            search_cache.search('ssc cgl')
+        timer.join()
+        self.assertEqual(search_cache.stats()['coalesced'], 1)
+
+    def test_stats_endpoint_is_staff_only(self):
+        staff = User.objects.create_user('admin', password='pass12345', is_staff=True)
+        self.assertEqual(self.client.get(reverse('search_cache_stats')).status_code, 302)
+        self.client.force_login(staff)
+        self.assertEqual(self.client.get(reverse('search_cache_stats')).json()['misses'], 0)
+
+
+class ExamFacetTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        today = timezone.localdate()
+        ssc = ExamCategory.objects.create(name='SSC', slug='ssc')
+        bank = ExamCategory.objects.create(name='Banking', slug='banking')
+        cls.open_ssc = UpcomingExam.objects.create(
+            title='SSC CGL', exam_category=ssc, description='x', total_vacancies=5000,
+            application_start=today - timedelta(days=1), application_end=today + timedelta(days=10),
+            exam_date=today + timedelta(days=60), age_min=18, age_max=32,
+        )
+        cls.later_ssc = UpcomingExam.objects.create(
+            title='SSC CHSL', exam_category=ssc, description='x', total_vacancies=300,
+            application_start=today + timedelta(days=5), application_end=today + timedelta(days=20),
+            exam_date=today + timedelta(days=90), age_min=18, age_max=27,
+        )
+        cls.open_bank = UpcomingExam.objects.create(
+            title='IBPS PO', exam_category=bank, description='x', total_vacancies=50,
+            application_start=today - timedelta(days=3), application_end=today + timedelta(days=2),
+            exam_date=today + timedelta(days=30),
+        )
+
+    def setUp(self):
+        cache.clear()
+
+    def test_filters_and_sorts(self):
+        filters = exam_facets.parse_filters({'open': '1', 'sort': 'vacancies', 'age': 'abc'})
+        self.assertEqual(filters, {'open': True, 'sort': 'vacancies'})
+        self.assertEqual(list(exam_facets.filter_exams(filters)), [self.open_ssc, self.open_bank])
+        filters = exam_facets.parse_filters({'category': 'ssc', 'age': '30'})
+        self.assertEqual(list(exam_facets.filter_exams(filters)), [self.open_ssc])
+
+    def test_facets_come_from_one_cached_query(self):
+        filters = exam_facets.parse_filters({'category': 'ssc'})
+        with self.assertNumQueries(2):  # the last-changed stamp and the grouped counts
+            facets = exam_facets.facet_counts(filters)
+        self.assertEqual([(c['slug'], c['count']) for c in facets['categories']], [('banking', 1), ('ssc', 2)])
+        self.assertEqual((facets['all_total'], facets['total'], facets['open_now']), (3, 2, 1))
+        self.assertEqual(facets['vacancies'], {100: 2, 1000: 1, 10000: 0})
+        with self.assertNumQueries(0):
+            exam_facets.facet_counts(filters)
+
+    def test_selected_category_is_listed_without_matches(self):
+        response = self.client.get(reverse('upcoming_exams'), {'category': 'ssc', 'age': '40'})
+        facets = response.context['facets']
+        self.assertEqual([(c['slug'], c['count']) for c in facets['categories']], [('banking', 1), ('ssc', 0)])
+        self.assertEqual((facets['all_total'], facets['total']), (1, 0))
+        self.assertContains(response, '<option value="">All (1)</option>', html=True)
+        self.assertContains(response, '<option value="ssc" selected>SSC (0)</option>', html=True)
+
+    def test_exam_change_refreshes_facets(self):
+        self.assertEqual(exam_facets.facet_counts({})['total'], 3)
+        self.open_bank.is_active = False
+        with self.captureOnCommitCallbacks(execute=True):
+            self.open_bank.save()
+        self.assertEqual(exam_facets.facet_counts({})['total'], 2)
+
+    def test_page_renders_filter_bar(self):
+        response = self.client.get(reverse('upcoming_exams'), {'category': 'banking'})
+        self.assertEqual(list(response.context['upcoming_exams']), [self.open_bank])
+        self.assertContains(response, 'Open now (1)')
+
+
+class EligibilityTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        today = timezone.localdate()
+        category = ExamCategory.objects.create(name='SSC', slug='ssc')
+
+        def exam(title, **fields):
+            return UpcomingExam.objects.create(
+                title=title, exam_category=category, description='x',
+                application_start=today - timedelta(days=1), application_end=date(today.year + 1, 1, 1), **fields
+            )
+        cls.graduate = exam('CGL', age_min=18, age_max=27, educational_qualification="Bachelor's degree from a recognised university")
+        cls.twelfth = exam('CHSL', age_min=18, age_max=27, educational_qualification='12th pass (10+2)')
+        cls.post_graduate = exam('Lecturer', age_min=21, age_max=40, educational_qualification='Post Graduate degree with 55%')
+        cls.no_limits = exam('Open', educational_qualification='As per notification')
+
+    def test_qualification_text_is_normalized(self):
+        self.assertEqual(
+            [self.graduate.qualification_level, self.twelfth.qualification_level,
+             self.post_graduate.qualification_level, self.no_limits.qualification_level],
+            [eligibility.GRADUATE, eligibility.TWELFTH, eligibility.POST_GRADUATE, eligibility.NOT_SPECIFIED],
+        )
+
+    def test_secondary_levels_are_told_apart(self):
+        cases = {
+            'Senior Secondary (Class 12) from a recognised board': eligibility.TWELFTH,
+            'Higher Secondary or equivalent': eligibility.TWELFTH,
+            'Senior secondary examination passed': eligibility.TWELFTH,
+            'Secondary (Class 10) from a recognised board': eligibility.TENTH,
+            'Matriculation or Secondary School Certificate': eligibility.TENTH,
+        }
+        for text, level in cases.items():
+            self.assertEqual(eligibility.parse_qualification(text), level, text)
+
+    def test_marks_conditions_do_not_lower_the_level(self):
+        cases = {
+            "Bachelor's degree with 60% marks in 12th": eligibility.GRADUATE,
+            'Graduation with 50 percent marks in Class 12 and Class 10, or equivalent': eligibility.GRADUATE,
+            '10th or 12th pass': eligibility.TENTH,
+            '12th pass with 55% marks in Mathematics': eligibility.TWELFTH,
+            '60% marks in 12th or a Diploma': eligibility.TWELFTH,
+        }
+        for text, level in cases.items():
+            self.assertEqual(eligibility.parse_qualification(text), level, text)
+
+    def test_age_limits_and_category_relaxation(self):
+        cutoff = self.graduate.application_end
+        # 29 on the cutoff: too old for the general limit of 27, within it for OBC (+3)
+        dob = date(cutoff.year - 29, cutoff.month, cutoff.day)
+        matches = lambda category: set(UpcomingExam.objects.filter(
+            eligibility.eligibility_filter(dob, category, eligibility.GRADUATE)))
+        self.assertEqual(matches('general'), {self.no_limits})
+        self.assertEqual(matches('obc'), {self.graduate, self.twelfth, self.no_limits})
+        # Turning 28 on the cutoff day is already over the limit
+        self.assertEqual(eligibility.dob_bounds(self.graduate)[0], date(cutoff.year - 28, cutoff.month, cutoff.day) + timedelta(days=1))
+
+    def test_editing_age_limits_updates_the_index(self):
+        self.graduate.age_max = 32
+        self.graduate.save(update_fields=['age_max'])
+        self.graduate.refresh_from_db()
+        self.assertEqual(self.graduate.dob_earliest, eligibility.dob_bounds(self.graduate)[0])
+
+    def test_json_endpoint(self):
+        response = self.client.get(reverse('eligible_exams_api'), {'dob': '2004-05-01', 'category': 'general', 'qualification': '2'})
+        self.assertEqual([exam['title'] for exam in response.json()['exams']], ['CHSL', 'Open'])
+        response = self.client.get(reverse('eligible_exams_api'), {'dob': 'not a date', 'qualification': '2'})
+        self.assertEqual(response.status_code, 400)
+        self.assertIn('dob', response.json()['errors'])
+
+    def test_page_lists_matches(self):
+        response = self.client.get(reverse('eligible_exams'), {'dob': '2000-05-01', 'category': 'sc_st', 'qualification': '5'})
+        self.assertEqual(set(response.context['exams']), {self.graduate, self.twelfth, self.post_graduate, self.no_limits})
+        self.assertEqual(self.client.get(reverse('eligible_exams')).context['exams'], None)
+
+
+class StructuredExamDataTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        today = timezone.localdate()
+        cls.ssc = ExamCategory.objects.create(name='SSC', slug='ssc')
+
+        def exam(title, **fields):
+            return UpcomingExam.objects.create(
+                title=title, exam_category=cls.ssc, description='x',
+                application_start=today, application_end=today + timedelta(days=30), **fields
+            )
+        cls.cgl = exam('CGL', vacancy_breakdown='UR: 1,020\nOBC (NCL) - 300 posts\nSC: 150\nTotal: 1470',
+                       fee_general='Rs. 100/-', fee_sc_st='Nil')
+        cls.chsl = exam('CHSL', vacancy_breakdown='{"General": 80, "EWS": 20}', fee_general='₹ 50')
+        cls.mts = exam('MTS', vacancy_breakdown='To be announced', fee_general='As per notification')
+
+    def setUp(self):
+        cache.clear()
+
+    def test_text_is_parsed_on_save(self):
+        self.assertEqual(self.cgl.vacancies, {'general': 1020, 'obc': 300, 'sc': 150})
+        self.assertEqual((self.cgl.fee_general_amount, self.cgl.fee_sc_st_amount, self.cgl.fee_obc_amount), (100, 0, None))
+        self.assertEqual(self.chsl.vacancies, {'general': 80, 'ews': 20})
+        self.assertEqual(self.mts.vacancies, {})
+        self.assertEqual(exam_data.parse_vacancies('[{"category": "PwBD", "count": 4}]'), {'pwd': 4})
+
+    def test_amount_wins_over_exemption_wording(self):
+        cases = {
+            'Rs. 100/- (Women, SC/ST, PwBD and ESM are exempted)': 100,
+            '₹ 500 (no fee for female candidates)': 500,
+            'Exempted': 0,
+            'Nil': 0,
+            'As per notification': None,
+        }
+        for text, amount in cases.items():
+            self.assertEqual(exam_data.parse_fee(text), amount, text)
+
+    def test_partial_save_keeps_columns_in_sync(self):
+        self.mts.fee_general = 'INR 1,000'
+        self.mts.save(update_fields=['fee_general'])
+        self.mts.refresh_from_db()
+        self.assertEqual(self.mts.fee_general_amount, 1000)
+
+    def test_stats_are_aggregated_in_one_cached_query(self):
+        with self.assertNumQueries(2):  # the last-changed stamp and the grouped aggregate
+            stats = exam_reports.cached_category_stats()
+        row = stats[0]
+        self.assertEqual((row['exams'], row['min_fee'], row['avg_fee']), (3, 50, 75))
+        self.assertEqual(row['vacancies']['general'], 1100)
+        self.assertEqual(row['vacancies']['ews'], 20)
+        with self.assertNumQueries(0):
+            exam_reports.cached_category_stats()
+        self.assertContains(self.client.get(reverse('exam_stats')), '1100')
+
+    def test_sort_by_fee_puts_unknown_fees_last(self):
+        filters = exam_facets.parse_filters({'sort': 'fee'})
+        self.assertEqual(list(exam_facets.filter_exams(filters)), [self.chsl, self.cgl, self.mts])
+
+
+class StartupBudgetTests(SimpleTestCase):
+    def test_worker_startup_is_within_budget(self):
+        profile = startup.profile_startup()
+        self.assertIn('examportal.views', profile['modules'])
+        self.assertEqual(startup.over_budget(profile), [])
+
+    def test_heavy_imports_are_reported(self):
+        profile = {'seconds': 0.5, 'max_rss_mb': 40, 'modules': startup.parse_importtime(
+            'import time: self [us] | cumulative | imported package\n'
+            'import time:       120 |     250000 |   numpy.core\n'
+            'import time:       300 |     900000 | numpy\n'
+        )}
+        self.assertEqual(startup.heaviest_imports(profile), [('numpy', 0.9)])
+        self.assertEqual(startup.over_budget(profile), ['numpy is imported at startup'])
+
+
+# Warm-up runs on its own thread and connection, so it must see committed rows.
+class WarmupTests(TransactionTestCase):
+    def setUp(self):
+        cache.clear()
+        self.addCleanup(warmup._state.update, {'started': None, 'finished': None, 'steps': {}})
+
+    def test_readiness_waits_for_warm_up(self):
+        ExamCategory.objects.create(name='SSC', slug='ssc')
+        response = self.client.get(reverse('readiness'))
+        self.assertEqual(response.status_code, 503)
+        self.assertFalse(response.json()['warmed_up'])
+
+        state = warmup.warm_up()
+        self.assertEqual({name: step['error'] for name, step in state['steps'].items()},
+                         {'templates': None, 'urls': None, 'caches': None})
+        self.assertGreater(state['steps']['templates']['result'], 20)
+        response = self.client.get(reverse('readiness'))
+        self.assertEqual(response.status_code, 200)
+        self.assertTrue(response.json()['ready'])
+
+    def test_categories_are_served_from_the_primed_cache(self):
+        ExamCategory.objects.create(name='SSC', slug='ssc')
+        warmup.warm_up()
+        with self.assertNumQueries(0):
+            self.assertEqual([category.slug for category in context_processors.category_list()], ['ssc'])
+
+    @override_settings(WARMUP_ON_STARTUP=False)
+    def test_ready_without_warm_up_when_disabled(self):
+        self.assertEqual(self.client.get(reverse('readiness')).status_code, 200)
+
+
+class BulkNoteCompletionTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = User.objects.create_user('student', password='pass12345')
+        category = ExamCategory.objects.create(name='SSC', slug='ssc')
+        cls.reasoning = Subject.objects.create(exam_category=category, name='Reasoning')
+        cls.maths = Subject.objects.create(exam_category=category, name='Maths')
+        cls.reasoning_notes = [Note.objects.create(subject=cls.reasoning, title=f'R{i}', content='x') for i in range(4)]
+        cls.maths_notes = [Note.objects.create(subject=cls.maths, title=f'M{i}', content='x') for i in range(2)]
+
+    def setUp(self):
+        self.client.force_login(self.user)
+
+    def post(self, notes):
+        return self.client.post(reverse('mark_notes_completed'), {'note_ids': [note.id for note in notes]})
+
+    def test_notes_are_completed_with_set_based_writes(self):
+        UserProgress.objects.create(user=self.user, subject=self.reasoning).completed_notes.add(self.reasoning_notes[0])
+        notes = self.reasoning_notes + self.maths_notes[:1]
+        with CaptureQueriesContext(connection) as queries:
+            response = self.post(notes)
+        self.assertEqual(response.json(), {
+            'success': True, 'completed': 4,
+            'progress': {str(self.reasoning.id): 100, str(self.maths.id): 50},
+        })
+        self.assertEqual(UserActivity.objects.filter(user=self.user).count(), 1)
+
+        # A fixed set of statements however many notes are ticked: load the notes, read
+        # progress and completed rows, one insert, two counts, one update, one activity
+        with CaptureQueriesContext(connection) as more_queries:
+            response = self.post(self.reasoning_notes + self.maths_notes)
+        self.assertEqual(response.json()['completed'], 1)
+        self.assertEqual(len(more_queries), 10)
+
+    def test_repeats_are_idempotent(self):
+        self.post(self.maths_notes)
+        response = self.post(self.maths_notes)
+        self.assertEqual(response.json()['completed'], 0)
+        self.assertEqual(UserProgress.objects.get(user=self.user, subject=self.maths).completed_notes.count(), 2)
+        self.assertEqual(UserActivity.objects.filter(user=self.user).count(), 1)
+
+    def test_too_many_ids_are_rejected(self):
+        response = self.client.post(reverse('mark_notes_completed'), {'note_ids': ','.join(map(str, range(1, 300)))})
+        self.assertEqual(response.status_code, 400)
+
+
+class ProgressSyncTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = User.objects.create_user('student', password='pass12345')
+        category = ExamCategory.objects.create(name='SSC', slug='ssc')
+        cls.subject = Subject.objects.create(exam_category=category, name='Reasoning')
+        cls.notes = [Note.objects.create(subject=cls.subject, title=f'R{i}', content='x') for i in range(2)]
+        cls.exam = UpcomingExam.objects.create(
+            title='SSC CGL', exam_category=category, description='Combined Graduate Level',
+            application_start=timezone.localdate(), application_end=timezone.localdate() + timedelta(days=30),
+        )
+
+    def setUp(self):
+        self.client.force_login(self.user)
+        self.start = timezone.now() - timedelta(hours=1)
+
+    def sync(self, events):
+        return self.client.post(reverse('sync_progress'), {'events': events}, content_type='application/json')
+
+    def at(self, minutes):
+        return (self.start + timedelta(minutes=minutes)).isoformat()
+
+    def test_batch_is_applied_once(self):
+        events = [
+            {'id': 's1', 'type': 'session_started', 'at': self.at(0), 'subject_id': self.subject.id},
+            {'id': 'n1', 'type': 'note_completed', 'at': self.at(10), 'note_id': self.notes[0].id},
+            {'id': 'e1', 'type': 'session_ended', 'at': self.at(40), 'session': 's1'},
+            {'id': 't1', 'type': 'exam_target_set', 'at': self.at(41), 'exam_id': self.exam.id,
+             'target_date': '2030-03-01', 'daily_goal': 60},
+        ]
+        data = self.sync(events).json()
+        self.assertEqual(sorted(data['applied']), ['e1', 'n1', 's1', 't1'])
+        session = UserStudySession.objects.get(user=self.user)
+        self.assertEqual(session.duration_minutes, 40)
+        self.assertEqual(data['sessions'], {'s1': session.id})
+        self.assertEqual(data['state']['subjects'][0]['completed_notes'], [self.notes[0].id])
+        self.assertEqual(data['state']['exam_targets'][0]['daily_study_goal'], 60)
+
+        # A resend after a lost response changes nothing
+        data = self.sync(events).json()
+        self.assertEqual(data['applied'], [])
+        self.assertEqual(sorted(data['duplicates']), ['e1', 'n1', 's1', 't1'])
+        self.assertEqual(UserStudySession.objects.filter(user=self.user).count(), 1)
+        self.assertEqual(SyncEvent.objects.filter(user=self.user).count(), 4)
+
+    def test_session_started_in_an_earlier_batch_can_be_ended(self):
+        self.sync([{'id': 's1', 'type': 'session_started', 'at': self.at(0), 'subject_id': self.subject.id}])
+        data = self.sync([{'id': 'e1', 'type': 'session_ended', 'at': self.at(25), 'session': 's1'}]).json()
+        self.assertEqual(data['applied'], ['e1'])
+        self.assertEqual(data['state']['open_sessions'], [])
+        self.assertEqual(UserStudySession.objects.get(user=self.user).duration_minutes, 25)
+
+    def test_invalid_events_are_rejected_and_not_recorded(self):
+        data = self.sync([
+            {'id': 'n1', 'type': 'note_completed', 'at': self.at(0), 'note_id': 999999},
+            {'id': 'x1', 'type': 'unknown', 'at': self.at(0)},
+            {'id': 'e1', 'type': 'session_ended', 'at': self.at(0), 'session': 'missing'},
+            {'type': 'note_completed', 'at': self.at(0), 'note_id': self.notes[1].id},
+        ]).json()
+        self.assertEqual(data['applied'], [])
+        self.assertEqual(len(data['rejected']), 4)
+        self.assertFalse(SyncEvent.objects.exists())
+
+    def test_bad_bodies_are_refused(self):
+        response = self.client.post(reverse('sync_progress'), 'not json', content_type='application/json')
+        self.assertEqual(response.status_code, 400)
+        response = self.sync([{}] * (sync.MAX_EVENTS + 1))
+        self.assertEqual(response.status_code, 400)
+
+
+class LeaderboardTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.ssc = ExamCategory.objects.create(name='SSC', slug='ssc')
+        cls.banking = ExamCategory.objects.create(name='Banking', slug='banking')
+        cls.reasoning = Subject.objects.create(exam_category=cls.ssc, name='Reasoning')
+        cls.quant = Subject.objects.create(exam_category=cls.banking, name='Quant')
+        cls.users = [User.objects.create_user(f'student{i}', password='pass12345') for i in range(3)]
+
+    def setUp(self):
+        cache.clear()
+        self.now = timezone.now()
+
+    def test_ending_sessions_updates_the_totals_incrementally(self):
+        start = self.now - timedelta(minutes=30)
+        sessions = [
+            UserStudySession(user=self.users[0], subject=self.reasoning, start_time=start, duration_minutes=30),
+            UserStudySession(user=self.users[0], subject=self.reasoning, start_time=start, duration_minutes=15),
+            UserStudySession(user=self.users[1], subject=self.quant, start_time=start, duration_minutes=20),
+        ]
+        leaderboards.record_sessions(sessions)
+        leaderboards.record_sessions(sessions[:1])
+        week = leaderboards.week_period(start)
+        totals = dict(StudyTimeTotal.objects.filter(user=self.users[0]).values_list('period', 'minutes'))
+        self.assertEqual(totals, {'all': 75, week: 75})
+        self.assertEqual(StudyTimeTotal.objects.get(user=self.users[1], period='all').exam_category, self.banking)
+
+    def test_standings_rank_ties_and_serve_from_cache(self):
+        for user, minutes in zip(self.users, (50, 90, 50)):
+            leaderboards.record_sessions([UserStudySession(
+                user=user, subject=self.reasoning, start_time=self.now, duration_minutes=minutes,
+            )])
+        board = leaderboards.standings(self.ssc.id, 'all', self.users[2].id)
+        self.assertEqual([(e['rank'], e['username']) for e in board['top']],
+                         [(1, 'student1'), (2, 'student0'), (2, 'student2')])
+        self.assertEqual(board['mine'], {'rank': 2, 'minutes': 50})
+        with self.assertNumQueries(0):
+            self.assertEqual(leaderboards.standings(self.ssc.id, 'all', self.users[2].id), board)
+
+        # New minutes move the board's version, so the next read sees them
+        with self.captureOnCommitCallbacks(execute=True):
+            leaderboards.record_sessions([UserStudySession(
+                user=self.users[2], subject=self.reasoning, start_time=self.now, duration_minutes=60,
+            )])
+        self.assertEqual(leaderboards.standings(self.ssc.id, 'all', self.users[2].id)['mine'],
+                         {'rank': 1, 'minutes': 110})
+
+    def test_reconcile_rebuilds_totals_from_sessions(self):
+        this_week = UserStudySession.objects.create(
+            user=self.users[0], subject=self.reasoning, start_time=self.now - timedelta(minutes=40),
+            end_time=self.now,
+        )
+        UserStudySession.objects.create(
+            user=self.users[0], subject=self.reasoning, start_time=self.now - timedelta(days=30),
+            end_time=self.now - timedelta(days=30) + timedelta(minutes=25),
+        )
+        StudyTimeTotal.objects.create(user=self.users[0], exam_category=self.ssc, period='all', minutes=999)
+
+        call_command('reconcile_leaderboards', stdout=io.StringIO())
+        totals = dict(StudyTimeTotal.objects.filter(user=self.users[0]).values_list('period', 'minutes'))
+        self.assertEqual(totals, {'all': 65, leaderboards.week_period(this_week.start_time): 40})
+
+    def test_leaderboard_page(self):
+        leaderboards.record_sessions([UserStudySession(
+            user=self.users[0], subject=self.quant, start_time=self.now, duration_minutes=45,
+        )])
+        self.client.force_login(self.users[0])
+        response = self.client.get(reverse('leaderboard'), {'category': 'banking', 'period': 'week'})
+        self.assertContains(response, 'student0')
+        self.assertEqual(response.context['mine'], {'rank': 1, 'minutes': 45})
+
+
+class StudyHeatmapTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = User.objects.create_user('student', password='pass12345')
+        category = ExamCategory.objects.create(name='SSC', slug='ssc')
+        cls.subject = Subject.objects.create(exam_category=category, name='Reasoning')
+
+    def setUp(self):
+        cache.clear()
+        self.today = timezone.localdate()
+
+    def study(self, days_ago, minutes):
+        start = timezone.make_aware(datetime.combine(self.today - timedelta(days=days_ago), datetime.min.time()))
+        start += timedelta(hours=9)
+        return UserStudySession.objects.create(
+            user=self.user, subject=self.subject, start_time=start, end_time=start + timedelta(minutes=minutes),
+        )
+
+    def test_days_are_summed_in_one_grouped_query(self):
+        self.study(0, 30)
+        self.study(0, 15)
+        self.study(2, 60)
+        self.study(400, 90)  # outside the window
+        UserStudySession.objects.create(user=self.user, subject=self.subject, start_time=timezone.now())  # still open
+
+        with self.assertNumQueries(1):
+            data = heatmap.build_heatmap(self.user.id)
+        self.assertEqual(len(data['minutes']), heatmap.HEATMAP_DAYS)
+        self.assertEqual(data['end'], self.today.isoformat())
+        self.assertEqual(data['minutes'][-1], 45)
+        self.assertEqual(data['minutes'][-3], 60)
+        self.assertEqual((data['total'], data['active_days'], data['max']), (105, 2, 60))
+
+    def test_cached_until_a_session_ends(self):
+        self.study(1, 20)
+        self.assertEqual(heatmap.user_heatmap(self.user.id)['total'], 20)
+        with self.assertNumQueries(0):
+            heatmap.user_heatmap(self.user.id)
+
+        session = UserStudySession.objects.create(
+            user=self.user, subject=self.subject, start_time=timezone.now() - timedelta(minutes=25),
+        )
+        with self.captureOnCommitCallbacks(execute=True):
+            views._end_session(self.user, session)
+        self.assertEqual(heatmap.user_heatmap(self.user.id)['total'], 45)
+
+    def test_endpoint_returns_compact_json(self):
+        self.study(3, 50)
+        self.client.force_login(self.user)
+        data = self.client.get(reverse('study_heatmap')).json()
+        self.assertEqual(set(data), {'start', 'end', 'minutes', 'total', 'active_days', 'max'})
+        self.assertEqual(data['minutes'][-4], 50)
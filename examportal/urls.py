@@ -1,5 +1,5 @@
 from django.urls import path
-from . import views
+from . import crawlers, heatmap, sync, views, warmup
 
 urlpatterns = [
     path('', views.home, name='home'),
@@ -16,17 +16,26 @@ urlpatterns = [
     path('notes/', views.notes, name='notes'),
     path('notes/<slug:category_slug>/', views.notes_by_category, name='notes_by_category'),
     path('upcoming-exams/', views.upcoming_exams, name='upcoming_exams'),
+    path('upcoming-exams/stats/', views.exam_stats, name='exam_stats'),
     path('announcements/', views.announcements, name='announcements'),
     path('admit-cards/', views.admit_cards, name='admit_cards'),
     path('results/', views.results, name='results'),
     path('answer-keys/', views.answer_keys, name='answer_keys'),
     path('search/', views.search, name='search'),
+    path('search/stats/', views.search_cache_stats, name='search_cache_stats'),
+    path('eligibility/', views.eligible_exams, name='eligible_exams'),
+    path('eligibility/api/', views.eligible_exams_api, name='eligible_exams_api'),
     
     # Progress Tracking URLs
     path('progress/mark-completed/<int:note_id>/', views.mark_note_completed, name='mark_note_completed'),
+    path('progress/mark-completed/', views.mark_notes_completed, name='mark_notes_completed'),
     path('progress/start-session/', views.start_study_session, name='start_study_session'),
     path('progress/end-session/<int:session_id>/', views.end_study_session, name='end_study_session'),
+    path('progress/heartbeat/<int:session_id>/', views.study_heartbeat, name='study_heartbeat'),
     path('progress/set-exam-target/', views.set_exam_target, name='set_exam_target'),
+    path('progress/sync/', sync.sync_progress, name='sync_progress'),
+    path('progress/heatmap/', heatmap.study_heatmap, name='study_heatmap'),
+    path('leaderboard/', views.leaderboard, name='leaderboard'),
     
     # Debug URLs
     path('debug-upcoming/', views.debug_upcoming_exams, name='debug_upcoming'),
@@ -40,4 +49,12 @@ urlpatterns = [
     path('refund-policy/', views.refund_policy, name='refund_policy'),
     path('disclaimer/', views.disclaimer, name='disclaimer'),
     path('exam/<int:exam_id>/', views.exam_detail, name='exam_detail'),
+
+    # Crawler URLs
+    path('sitemap.xml', crawlers.sitemap_index, name='sitemap_index'),
+    path('sitemap-<str:section>.xml', crawlers.sitemap_section, name='sitemap_section'),
+    path('feeds/<str:kind>.<str:feed_format>', crawlers.feed, name='feed'),
+
+    # Load balancer readiness probe
+    path('health/ready/', warmup.readiness, name='readiness'),
 ]
\ No newline at end of file
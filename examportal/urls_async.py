@@ -0,0 +1,29 @@
+from django.urls import path
+from . import async_views
+from .urls import urlpatterns as sync_urlpatterns
+
+# Same routes and names as urls.py, with the async implementations swapped in
+# where they exist. Used by govtexamprep.urls_async under ASGI.
+ASYNC_VIEWS = {
+    'home': async_views.home,
+    'notes': async_views.notes,
+    'notes_by_category': async_views.notes_by_category,
+    'upcoming_exams': async_views.upcoming_exams,
+    'announcements': async_views.announcements,
+    'admit_cards': async_views.admit_cards,
+    'results': async_views.results,
+    'answer_keys': async_views.answer_keys,
+    'search': async_views.search,
+    'exam_detail': async_views.exam_detail,
+    'mark_note_completed': async_views.mark_note_completed,
+    'mark_notes_completed': async_views.mark_notes_completed,
+    'start_study_session': async_views.start_study_session,
+    'end_study_session': async_views.end_study_session,
+    'study_heartbeat': async_views.study_heartbeat,
+    'set_exam_target': async_views.set_exam_target,
+}
+
+urlpatterns = [
+    path(str(pattern.pattern), ASYNC_VIEWS.get(pattern.name, pattern.callback), name=pattern.name)
+    for pattern in sync_urlpatterns
+]
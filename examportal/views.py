@@ -1,14 +1,20 @@
 from django.shortcuts import render, redirect, get_object_or_404
 from django.contrib.auth import login, logout, authenticate
+from django.contrib.admin.views.decorators import staff_member_required
 from django.contrib.auth.decorators import login_required
 from django.contrib import messages
-from django.http import HttpResponseRedirect, JsonResponse
+from django.db import transaction
+from django.db.models import Count
+from django.http import Http404, HttpResponseRedirect, JsonResponse
 from django.urls import reverse
-from django.db.models import Q
 from django.utils import timezone
-from datetime import timedelta
 from .models import ExamCategory, UpcomingExam, Announcement, AdmitCard, Result, Note, UserProfile, UserActivity, Subject, AnswerKey
-from .forms import CustomUserCreationForm, CustomAuthenticationForm, UserProfileForm, ContactForm
+from .forms import CustomUserCreationForm, CustomAuthenticationForm, UserProfileForm, ContactForm, EligibilityForm
+from .sqlite import serialized_write
+from . import context_processors, eligibility, exam_facets, exam_reports, fragments, heartbeats, heatmap, leaderboards, search_cache
+from .auth_cache import get_cached_profile
+from .prerender import prerendered
+from .recommendations import recommend_exams
 
 # Add these progress tracking models to your models.py first
 try:
@@ -22,13 +28,138 @@ except ImportError:
     class ExamTarget:
         objects = None
 
+# Write helpers. Each one is a single serialized unit of work, so concurrent
+# requests on SQLite queue for the writer instead of failing with
+# "database is locked".
+@serialized_write
+def log_activity(user, activity_type, description):
+    return UserActivity.objects.create(
+        user=user,
+        activity_type=activity_type,
+        description=description
+    )
+
+@serialized_write
+def _register_user(form):
+    user = form.save()
+    UserProfile.objects.create(
+        user=user,
+        phone=form.cleaned_data['phone'],
+        exam_interests=form.cleaned_data['exam_interests']
+    )
+    log_activity(user, 'registration', 'User registered successfully')
+    return user
+
+@serialized_write
+def _complete_note(user, note):
+    user_progress, created = UserProgress.objects.get_or_create(
+        user=user,
+        subject=note.subject
+    )
+    if note in user_progress.completed_notes.all():
+        return None
+    user_progress.completed_notes.add(note)
+    user_progress.update_progress()
+    log_activity(user, 'note_completed', f'Completed note: {note.title}')
+    return user_progress
+
+@serialized_write
+def _complete_notes(user, notes):
+    """
+    Mark many notes completed with set-based writes: one bulk insert into the
+    completed-notes table, one bulk update of the affected ``UserProgress``
+    rows and one activity entry. Returns the notes that were newly completed
+    and ``{subject_id: progress_percentage}``.
+    """
+    Completed = UserProgress.completed_notes.through
+    subject_ids = {note.subject_id for note in notes}
+    with transaction.atomic():
+        progress = {p.subject_id: p for p in UserProgress.objects.filter(user=user, subject_id__in=subject_ids)}
+        missing = [UserProgress(user=user, subject_id=subject_id) for subject_id in subject_ids - set(progress)]
+        if missing:
+            UserProgress.objects.bulk_create(missing)
+            progress = {p.subject_id: p for p in UserProgress.objects.filter(user=user, subject_id__in=subject_ids)}
+
+        progress_ids = [p.id for p in progress.values()]
+        done = set(Completed.objects.filter(userprogress_id__in=progress_ids, note_id__in=[note.id for note in notes])
+                   .values_list('note_id', flat=True))
+        new_notes = [note for note in notes if note.id not in done]
+        if not new_notes:
+            return [], {subject_id: p.progress_percentage for subject_id, p in progress.items()}
+        Completed.objects.bulk_create(
+            [Completed(userprogress_id=progress[note.subject_id].id, note_id=note.id) for note in new_notes],
+            ignore_conflicts=True,
+        )
+
+        totals = dict(Note.objects.filter(subject_id__in=subject_ids, is_active=True)
+                      .values_list('subject_id').annotate(total=Count('id')).order_by())
+        completed = dict(Completed.objects.filter(userprogress_id__in=progress_ids)
+                         .values_list('userprogress_id').annotate(done=Count('id')).order_by())
+        now = timezone.now()
+        for subject_id, user_progress in progress.items():
+            user_progress.total_notes = totals.get(subject_id, 0)
+            done_count = completed.get(user_progress.id, 0)
+            user_progress.progress_percentage = (
+                int((done_count / user_progress.total_notes) * 100) if user_progress.total_notes > 0 else 0
+            )
+            user_progress.last_updated = now
+        UserProgress.objects.bulk_update(
+            list(progress.values()), ['total_notes', 'progress_percentage', 'last_updated']
+        )
+        log_activity(
+            user, 'note_completed',
+            f"Completed {len(new_notes)} notes: {', '.join(note.title for note in new_notes[:5])}"
+            + (f' and {len(new_notes) - 5} more' if len(new_notes) > 5 else '')
+        )
+    return new_notes, {subject_id: p.progress_percentage for subject_id, p in progress.items()}
+
+@serialized_write
+def _start_session(user, subject):
+    return UserStudySession.objects.create(
+        user=user,
+        subject=subject,
+        start_time=timezone.now()
+    )
+
+@serialized_write
+def _end_session(user, study_session):
+    was_open = study_session.end_time is None
+    study_session.end_time = timezone.now()
+    study_session.save()
+    if was_open:
+        leaderboards.record_sessions([study_session])
+        heatmap.invalidate([user.id])
+    log_activity(
+        user,
+        'study_session',
+        f'Studied {study_session.subject.name} for {study_session.duration_minutes} minutes'
+    )
+    return study_session
+
+@serialized_write
+def _save_exam_target(user, exam, target_date, daily_goal):
+    exam_target, created = ExamTarget.objects.get_or_create(
+        user=user,
+        exam=exam,
+        defaults={
+            'target_date': target_date,
+            'daily_study_goal': daily_goal
+        }
+    )
+    if not created:
+        exam_target.target_date = target_date
+        exam_target.daily_study_goal = daily_goal
+        exam_target.save()
+    return exam_target
+
 def home(request):
+    # Lazy querysets: they only run when the cached sections need rendering.
     try:
-        exam_categories = ExamCategory.objects.all()
+        exam_categories = ExamCategory.objects.prefetch_related('subject_set')
         upcoming_exams = UpcomingExam.objects.filter(is_active=True).order_by('exam_date')[:5]
         announcements = Announcement.objects.filter(is_active=True).order_by('-created_at')[:5]
-        admit_cards = AdmitCard.objects.filter(is_active=True).order_by('-release_date')[:3]
-        results = Result.objects.filter(is_active=True).order_by('-result_date')[:3]
+        admit_cards = AdmitCard.objects.filter(is_active=True).select_related('exam').order_by('-release_date')[:3]
+        results = Result.objects.filter(is_active=True).select_related('exam').order_by('-result_date')[:3]
     except Exception as e:
         exam_categories = []
         upcoming_exams = []
@@ -42,6 +173,7 @@ def home(request):
         'announcements': announcements,
         'admit_cards': admit_cards,
         'results': results,
+        **fragments.home_fragment_context(),
     }
     return render(request, 'examportal/index.html', context)
 
@@ -49,21 +181,8 @@ def register_view(request):
     if request.method == 'POST':
         form = CustomUserCreationForm(request.POST)
         if form.is_valid():
-            user = form.save()
-            
-            # Create user profile
-            UserProfile.objects.create(
-                user=user,
-                phone=form.cleaned_data['phone'],
-                exam_interests=form.cleaned_data['exam_interests']
-            )
-            
-            # Log activity
-            UserActivity.objects.create(
-                user=user,
-                activity_type='registration',
-                description='User registered successfully'
-            )
+            # Create user, profile and registration activity
+            user = _register_user(form)
             
             # Login user
             login(request, user)
@@ -86,11 +205,7 @@ def login_view(request):
                 login(request, user)
                 
                 # Log activity
-                UserActivity.objects.create(
-                    user=user,
-                    activity_type='login',
-                    description='User logged in successfully'
-                )
+                log_activity(user, 'login', 'User logged in successfully')
                 
                 messages.success(request, f'Welcome back, {user.username}!')
                 
@@ -107,11 +222,7 @@ def login_view(request):
 @login_required
 def logout_view(request):
     # Log activity
-    UserActivity.objects.create(
-        user=request.user,
-        activity_type='logout',
-        description='User logged out'
-    )
+    log_activity(request.user, 'logout', 'User logged out')
     
     logout(request)
     messages.success(request, 'You have been logged out successfully.')
@@ -119,7 +230,9 @@ def logout_view(request):
 
 @login_required
 def profile_view(request):
-    user_profile = get_object_or_404(UserProfile, user=request.user)
+    user_profile = get_cached_profile(request.user)
+    if user_profile is None:
+        raise Http404('No UserProfile matches the given query.')
     
     if request.method == 'POST':
         form = UserProfileForm(request.POST, instance=user_profile)
@@ -143,20 +256,14 @@ def profile_view(request):
 @login_required
 def dashboard_view(request):
     # Get or create user profile
-    user_profile, created = UserProfile.objects.get_or_create(user=request.user)
+    user_profile = get_cached_profile(request.user, create=True)
     
     # Calculate basic stats
     total_logins = UserActivity.objects.filter(user=request.user, activity_type='login').count()
     total_downloads = UserActivity.objects.filter(user=request.user, activity_type='download').count()
     
     # Get recommended exams
-    if user_profile.exam_interests != 'multiple':
-        recommended_exams = UpcomingExam.objects.filter(
-            exam_category__name__icontains=user_profile.get_exam_interests_display().split()[0].lower(),
-            is_active=True
-        )[:3]
-    else:
-        recommended_exams = UpcomingExam.objects.filter(is_active=True)[:3]
+    recommended_exams = recommend_exams(request.user, user_profile.exam_interests)
     
     # Progress Tracking Data (with error handling)
     try:
@@ -164,14 +271,11 @@ def dashboard_view(request):
         total_subjects = user_progress.count()
         completed_subjects = user_progress.filter(progress_percentage=100).count()
         
-        # Study time analytics (last 7 days)
-        week_ago = timezone.now() - timedelta(days=7)
-        study_sessions = UserStudySession.objects.filter(
-            user=request.user, 
-            start_time__gte=week_ago
-        )
-        total_study_time = sum(session.duration_minutes for session in study_sessions)
-        average_daily_study = total_study_time / 7 if study_sessions else 0
+        # Study time analytics (last 7 days), from the cached yearly heatmap
+        last_week = heatmap.user_heatmap(request.user.id)['minutes'][-7:]
+        total_study_time = sum(last_week)
+        average_daily_study = total_study_time / 7
+        active_days = sum(1 for minutes in last_week if minutes)
         
         # Exam targets
         exam_targets = ExamTarget.objects.filter(user=request.user)
@@ -182,7 +286,7 @@ def dashboard_view(request):
         completed_subjects = 0
         total_study_time = 0
         average_daily_study = 0
-        study_sessions = []
+        active_days = 0
         exam_targets = []
     
     # Recent activity
@@ -202,7 +306,7 @@ def dashboard_view(request):
         'average_daily_study': average_daily_study,
         'recent_activities': recent_activities,
         'exam_targets': exam_targets,
-        'study_sessions': study_sessions,
+        'active_days': active_days,
     }
     return render(request, 'examportal/dashboard.html', context)
 
@@ -212,28 +316,41 @@ def mark_note_completed(request, note_id):
     try:
         if request.method == 'POST':
             note = get_object_or_404(Note, id=note_id)
-            user_progress, created = UserProgress.objects.get_or_create(
-                user=request.user,
-                subject=note.subject
-            )
+            user_progress = _complete_note(request.user, note)
             
-            if note not in user_progress.completed_notes.all():
-                user_progress.completed_notes.add(note)
-                user_progress.update_progress()
-                
-                # Log activity
-                UserActivity.objects.create(
-                    user=request.user,
-                    activity_type='note_completed',
-                    description=f'Completed note: {note.title}'
-                )
-                
+            if user_progress is not None:
                 return JsonResponse({'success': True, 'progress': user_progress.progress_percentage})
         
         return JsonResponse({'success': False})
     except Exception as e:
         return JsonResponse({'success': False, 'error': str(e)})
 
+MAX_BULK_NOTES = 200
+
+def parse_note_ids(request):
+    """Note ids from repeated or comma-separated ``note_ids`` POST fields."""
+    ids = {int(value) for field in request.POST.getlist('note_ids') for value in field.split(',') if value.strip()}
+    if len(ids) > MAX_BULK_NOTES:
+        raise ValueError(f'At most {MAX_BULK_NOTES} notes per request')
+    return ids
+
+@login_required
+def mark_notes_completed(request):
+    try:
+        if request.method == 'POST':
+            try:
+                note_ids = parse_note_ids(request)
+            except ValueError as e:
+                return JsonResponse({'success': False, 'error': str(e)}, status=400)
+            notes = list(Note.objects.filter(id__in=note_ids).only('id', 'subject_id', 'title').order_by('id'))
+            if notes:
+                new_notes, progress = _complete_notes(request.user, notes)
+                return JsonResponse({'success': True, 'completed': len(new_notes), 'progress': progress})
+        
+        return JsonResponse({'success': False})
+    except Exception as e:
+        return JsonResponse({'success': False, 'error': str(e)})
+
 @login_required
 def start_study_session(request):
     try:
@@ -241,11 +358,7 @@ def start_study_session(request):
             subject_id = request.POST.get('subject_id')
             subject = get_object_or_404(Subject, id=subject_id)
             
-            study_session = UserStudySession.objects.create(
-                user=request.user,
-                subject=subject,
-                start_time=timezone.now()
-            )
+            study_session = _start_session(request.user, subject)
             
             return JsonResponse({'success': True, 'session_id': study_session.id})
         
@@ -257,16 +370,9 @@ def start_study_session(request):
 def end_study_session(request, session_id):
     try:
         if request.method == 'POST':
-            study_session = get_object_or_404(UserStudySession, id=session_id, user=request.user)
-            study_session.end_time = timezone.now()
-            study_session.save()
-            
-            # Log activity
-            UserActivity.objects.create(
-                user=request.user,
-                activity_type='study_session',
-                description=f'Studied {study_session.subject.name} for {study_session.duration_minutes} minutes'
-            )
+            study_session = get_object_or_404(UserStudySession.objects.select_related('subject'), id=session_id, user=request.user)
+            _end_session(request.user, study_session)
+            heartbeats.buffer.discard(study_session.id)
             
             return JsonResponse({'success': True, 'duration': study_session.duration_minutes})
         
@@ -274,6 +380,18 @@ def end_study_session(request, session_id):
     except Exception as e:
         return JsonResponse({'success': False, 'error': str(e)})
 
+@login_required
+def study_heartbeat(request, session_id):
+    # Buffered in memory and written in bulk, see heartbeats.py
+    try:
+        if request.method == 'POST':
+            if heartbeats.buffer.beat(session_id, request.user.id):
+                return JsonResponse({'success': True, 'interval': heartbeats.heartbeat_seconds()})
+        
+        return JsonResponse({'success': False})
+    except Exception as e:
+        return JsonResponse({'success': False, 'error': str(e)})
+
 @login_required
 def set_exam_target(request):
     try:
@@ -284,19 +402,7 @@ def set_exam_target(request):
             
             exam = get_object_or_404(UpcomingExam, id=exam_id)
             
-            exam_target, created = ExamTarget.objects.get_or_create(
-                user=request.user,
-                exam=exam,
-                defaults={
-                    'target_date': target_date,
-                    'daily_study_goal': daily_goal
-                }
-            )
-            
-            if not created:
-                exam_target.target_date = target_date
-                exam_target.daily_study_goal = daily_goal
-                exam_target.save()
+            _save_exam_target(request.user, exam, target_date, daily_goal)
             
             return JsonResponse({'success': True})
         
@@ -351,18 +457,19 @@ def notes_by_category(request, category_slug):
 
 def upcoming_exams(request):
     try:
-        # Get all active upcoming exams
-        upcoming_exams_list = UpcomingExam.objects.filter(is_active=True).order_by('exam_date')
-        
-        # Get exam categories for filtering
-        categories = ExamCategory.objects.all()
+        # Filtered, sorted active exams plus cached facet counts
+        filters = exam_facets.parse_filters(request.GET)
+        upcoming_exams_list = exam_facets.filter_exams(filters)
+        facets = exam_facets.facet_counts(filters)
         
         context = {
             'upcoming_exams': upcoming_exams_list,
-            'categories': categories,
+            'filters': filters,
+            'facets': facets,
+            'sorts': list(exam_facets.SORTS),
         }
         
-        print(f"Rendering template with {upcoming_exams_list.count()} exams")
+        print(f"Rendering template with {facets['total']} exams")
         return render(request, 'examportal/upcoming_exams.html', context)
         
     except Exception as e:
@@ -476,63 +583,7 @@ def answer_keys(request):
 
 def search(request):
     query = request.GET.get('q', '').strip()
-    results = {
-        'notes': [],
-        'exams': [],
-        'announcements': [],
-        'answer_keys': [],
-        'admit_cards': [],
-        'results': [],
-    }
-    
-    if query:
-        # Search in Notes
-        results['notes'] = Note.objects.filter(
-            Q(title__icontains=query) | 
-            Q(content__icontains=query) |
-            Q(subject__name__icontains=query) |
-            Q(subject__exam_category__name__icontains=query),
-            is_active=True
-        ).distinct()[:10]
-        
-        # Search in Upcoming Exams
-        results['exams'] = UpcomingExam.objects.filter(
-            Q(title__icontains=query) |
-            Q(description__icontains=query) |
-            Q(exam_category__name__icontains=query),
-            is_active=True
-        ).distinct()[:10]
-        
-        # Search in Announcements
-        results['announcements'] = Announcement.objects.filter(
-            Q(title__icontains=query) |
-            Q(content__icontains=query),
-            is_active=True
-        ).distinct()[:10]
-        
-        # Search in Answer Keys
-        results['answer_keys'] = AnswerKey.objects.filter(
-            Q(title__icontains=query) |
-            Q(exam__title__icontains=query) |
-            Q(exam__exam_category__name__icontains=query),
-            is_active=True
-        ).distinct()[:10]
-        
-        # Search in Admit Cards
-        results['admit_cards'] = AdmitCard.objects.filter(
-            Q(title__icontains=query) |
-            Q(exam__title__icontains=query) |
-            Q(exam__exam_category__name__icontains=query),
-            is_active=True
-        ).distinct()[:10]
-        
-        # Search in Results
-        results['results'] = Result.objects.filter(
-            Q(title__icontains=query) |
-            Q(exam__title__icontains=query) |
-            Q(exam__exam_category__name__icontains=query),
-            is_active=True
-        ).distinct()[:10]
+    results = search_cache.search(query)
     
     context = {
         'query': query,
@@ -543,6 +594,87 @@ def search(request):
     
     return render(request, 'examportal/search.html', context)
 
+@staff_member_required
+def search_cache_stats(request):
+    return JsonResponse(search_cache.stats())
+
+def exam_stats(request):
+    context = {
+        'stats': exam_reports.cached_category_stats(),
+        'reservation_categories': exam_reports.RESERVATION_CATEGORIES,
+    }
+    return render(request, 'examportal/exam_stats.html', context)
+
+def leaderboard(request):
+    categories = context_processors.category_list()
+    category = next((c for c in categories if c.slug == request.GET.get('category')), None)
+    category = category or (categories[0] if categories else None)
+    period = request.GET.get('period') if request.GET.get('period') in leaderboards.PERIODS else 'week'
+    board = {'top': [], 'mine': None}
+    if category:
+        board = leaderboards.standings(
+            category.id, leaderboards.period_key(period),
+            request.user.id if request.user.is_authenticated else None,
+        )
+    context = {
+        'categories': categories,
+        'category': category,
+        'period': period,
+        'periods': leaderboards.PERIODS,
+        'top': board['top'],
+        'mine': board['mine'],
+    }
+    return render(request, 'examportal/leaderboard.html', context)
+
+# Eligibility matcher
+ELIGIBILITY_LIMIT = 200
+
+def eligible_exams_for(form):
+    """Active exams still taking applications that the candidate in a valid ``EligibilityForm`` qualifies for."""
+    data = form.cleaned_data
+    today = timezone.localdate()
+    exams = UpcomingExam.objects.filter(
+        eligibility.eligibility_filter(data['dob'], data['category'], data['qualification']),
+        is_active=True,
+        application_end__gte=today,
+    )
+    if data['open_only']:
+        exams = exams.filter(exam_facets.open_now(today))
+    return exams.select_related('exam_category').order_by('application_end', 'id')[:ELIGIBILITY_LIMIT]
+
+def eligible_exams(request):
+    form = EligibilityForm(request.GET if 'dob' in request.GET else None)
+    exams = None
+    if form.is_valid():
+        exams = list(eligible_exams_for(form))
+        for exam in exams:
+            exam.candidate_age = eligibility.age_on(form.cleaned_data['dob'], exam.application_end)
+    return render(request, 'examportal/eligibility.html', {'form': form, 'exams': exams})
+
+def eligible_exams_api(request):
+    try:
+        form = EligibilityForm(request.GET)
+        if not form.is_valid():
+            return JsonResponse({'success': False, 'errors': form.errors}, status=400)
+        dob = form.cleaned_data['dob']
+        exams = [
+            {
+                'id': exam.id,
+                'title': exam.title,
+                'category': exam.exam_category.name,
+                'application_start': exam.application_start,
+                'application_end': exam.application_end,
+                'exam_date': exam.exam_date,
+                'age_on_cutoff': eligibility.age_on(dob, exam.application_end),
+                'qualification': exam.get_qualification_level_display(),
+                'url': reverse('exam_detail', kwargs={'exam_id': exam.id}),
+            }
+            for exam in eligible_exams_for(form)
+        ]
+        return JsonResponse({'success': True, 'count': len(exams), 'exams': exams})
+    except Exception as e:
+        return JsonResponse({'success': False, 'error': str(e)})
+
 # Debug views
 def debug_upcoming_exams(request):
     exams = UpcomingExam.objects.all()
@@ -576,18 +708,23 @@ def debug_results(request):
     from django.http import HttpResponse
     return HttpResponse(f"Total results: {results.count()}. Check console for details.")
 
+@prerendered
 def privacy_policy(request):
     return render(request, 'examportal/privacy_policy.html')
 
+@prerendered
 def terms_conditions(request):
     return render(request, 'examportal/terms_conditions.html')
 
+@prerendered
 def about_us(request):
     return render(request, 'examportal/about.html')
 
+@prerendered
 def refund_policy(request):
     return render(request, 'examportal/refund_policy.html')
 
+@prerendered
 def disclaimer(request):
     return render(request, 'examportal/disclaimer.html')
 
@@ -612,6 +749,7 @@ def contact_view(request):
     
     return render(request, 'examportal/contact.html', {'form': form})
 
+@prerendered
 def exam_detail(request, exam_id):
     """View for individual exam detail page"""
     exam = get_object_or_404(UpcomingExam, id=exam_id, is_active=True)
@@ -0,0 +1,134 @@
+"""
+Worker warm-up before serving.
+
+A fresh worker would otherwise pay for several things on its first
+requests:
+- compiling the large templates
+- populating the URL resolver
+- filling the shared content caches
+``warm_up()`` does this up front. ``govtexamprep.wsgi`` and
+``govtexamprep.asgi`` call it right after building the application when
+``WARMUP_ON_STARTUP`` is set. With ``gunicorn --preload`` that is before the
+fork, so every worker inherits the compiled templates and resolver.
+Otherwise each worker warms itself as it imports the application.
+
+The steps run on a separate thread that closes its database connections when
+it is done. That way no connection is shared across a fork, and an ASGI
+server's running event loop never sees sync ORM calls. A failing step is
+recorded and skipped. It does not stop the worker from starting.
+
+``readiness`` is the ``/health/ready/`` endpoint. It returns 503 until
+warm-up has finished and while the database is unreachable.
+"""
+import threading
+import time
+from pathlib import Path
+
+from django.apps import apps
+from django.conf import settings
+from django.db import connection, connections
+from django.http import JsonResponse
+from django.template.loader import get_template
+from django.urls import NoReverseMatch, get_resolver, reverse
+from django.views.decorators.cache import never_cache
+
+_lock = threading.Lock()
+_state = {'started': None, 'finished': None, 'steps': {}}
+
+
+def compile_templates():
+    """Load every examportal template so the cached loader holds it compiled."""
+    root = Path(apps.get_app_config('examportal').path) / 'templates'
+    names = sorted(str(path.relative_to(root)) for path in root.rglob('*.html'))
+    for name in names:
+        get_template(name)
+    return len(names)
+
+
+def resolve_urls():
+    """Populate the resolver's reverse and resolve caches for every named URL."""
+    resolver = get_resolver()
+    resolver.reverse_dict  # builds the lookup tables for every pattern
+    resolved = 0
+    for name in [key for key in resolver.reverse_dict if isinstance(key, str)]:
+        try:
+            path = reverse(name)
+        except NoReverseMatch:  # needs arguments
+            continue
+        resolver.resolve(path)
+        resolved += 1
+    return resolved
+
+
+def prime_caches():
+    """Fill the shared category and content caches the busiest pages read."""
+    from . import context_processors, crawlers, exam_facets, exam_reports, fragments, recommendations
+
+    for label in crawlers.LABEL_MODELS:
+        crawlers.last_changed(label)
+    context_processors.category_list()
+    fragments.home_fragment_context()
+    recommendations.recommendation_index()
+    exam_facets.facet_counts({})
+    exam_reports.cached_category_stats()
+    return 'ok'
+
+
+STEPS = [
+    ('templates', compile_templates),
+    ('urls', resolve_urls),
+    ('caches', prime_caches),
+]
+
+
+def _run_steps():
+    try:
+        for name, step in STEPS:
+            start = time.perf_counter()
+            try:
+                result, error = step(), None
+            except Exception as e:
+                result, error = None, str(e)
+            _state['steps'][name] = {
+                'seconds': round(time.perf_counter() - start, 4), 'result': result, 'error': error,
+            }
+    finally:
+        connections.close_all()
+
+
+def warm_up():
+    """Run the warm-up steps once per process and return the state."""
+    with _lock:
+        if _state['finished'] is None:
+            _state['started'] = time.time()
+            worker = threading.Thread(target=_run_steps, name='examportal-warmup')
+            worker.start()
+            worker.join()
+            _state['finished'] = time.time()
+    return status()
+
+
+def status():
+    warmed = _state['finished'] is not None
+    return {
+        'warmed_up': warmed or not getattr(settings, 'WARMUP_ON_STARTUP', False),
+        'seconds': round(_state['finished'] - _state['started'], 4) if warmed else None,
+        'steps': dict(_state['steps']),
+    }
+
+
+def database_ok():
+    try:
+        with connection.cursor() as cursor:
+            cursor.execute('SELECT 1')
+        return True
+    except Exception:
+        return False
+
+
+@never_cache
+def readiness(request):
+    state = status()
+    state['database'] = database_ok()
+    state['ready'] = state['warmed_up'] and state['database']
+    return JsonResponse(state, status=200 if state['ready'] else 503)
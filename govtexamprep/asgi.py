@@ -9,8 +9,17 @@ https://docs.djangoproject.com/en/5.1/howto/deployment/asgi/
 
 import os
 
+from django.conf import settings
 from django.core.asgi import get_asgi_application
 
 os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'govtexamprep.settings')
+# Serve the async views from examportal.async_views under ASGI.
+os.environ.setdefault('DJANGO_ROOT_URLCONF', 'govtexamprep.urls_async')
 
 application = get_asgi_application()
+
+# Compile templates, build the URL resolver and fill caches before serving
+# (see examportal.warmup); under gunicorn --preload this runs before the fork.
+if settings.WARMUP_ON_STARTUP:
+    from examportal.warmup import warm_up
+    warm_up()
@@ -16,21 +16,25 @@ INSTALLED_APPS = [
     'django.contrib.sessions',
     'django.contrib.messages',
     'django.contrib.staticfiles',
+    'django.contrib.sitemaps',
     'examportal',
     'ckeditor',
 ]
 
 MIDDLEWARE = [
     'django.middleware.security.SecurityMiddleware',
+    'examportal.db_routers.ReplicaRoutingMiddleware',
     'django.contrib.sessions.middleware.SessionMiddleware',
     'django.middleware.common.CommonMiddleware',
     'django.middleware.csrf.CsrfViewMiddleware',
     'django.contrib.auth.middleware.AuthenticationMiddleware',
+    'examportal.ratelimit.RateLimitMiddleware',
     'django.contrib.messages.middleware.MessageMiddleware',
     'django.middleware.clickjacking.XFrameOptionsMiddleware',
 ]
 
-ROOT_URLCONF = 'govtexamprep.urls'
+# govtexamprep.asgi switches to govtexamprep.urls_async (async views).
+ROOT_URLCONF = os.environ.get('DJANGO_ROOT_URLCONF', 'govtexamprep.urls')
 
 TEMPLATES = [
     {
@@ -51,13 +55,113 @@ TEMPLATES = [
 
 WSGI_APPLICATION = 'govtexamprep.wsgi.application'
 
-DATABASES = {
-    'default': {
-        'ENGINE': 'django.db.backends.sqlite3',
-        'NAME': BASE_DIR / 'db.sqlite3',
-    }
+# Database profile. SQLite by default; set DJANGO_DB_ENGINE=postgresql or mysql
+# (plus DJANGO_DB_NAME/USER/PASSWORD/HOST/PORT) for a server database.
+DB_ENGINE = os.environ.get('DJANGO_DB_ENGINE', 'sqlite3')
+
+# High-concurrency SQLite mode (see examportal.sqlite): the pragmas below are
+# applied to every connection and writes are serialized with retry.
+# DJANGO_SQLITE_CONCURRENCY=0 turns it off.
+SQLITE_CONCURRENCY_MODE = os.environ.get('DJANGO_SQLITE_CONCURRENCY', '1') == '1'
+SQLITE_PRAGMAS = {
+    'journal_mode': 'WAL',
+    'synchronous': 'NORMAL',
+    'busy_timeout': 5000,
+    'mmap_size': 134217728,
+    'cache_size': -20000,
 }
 
+if DB_ENGINE == 'sqlite3':
+    DATABASES = {
+        'default': {
+            'ENGINE': 'django.db.backends.sqlite3',
+            'NAME': os.environ.get('DJANGO_DB_NAME', BASE_DIR / 'db.sqlite3'),
+        }
+    }
+    if SQLITE_CONCURRENCY_MODE:
+        # Take the write lock when a transaction starts instead of upgrading
+        # a read lock later, which is what fails with "database is locked".
+        DATABASES['default']['OPTIONS'] = {'transaction_mode': 'IMMEDIATE'}
+else:
+    DATABASES = {
+        'default': {
+            'ENGINE': f'django.db.backends.{DB_ENGINE}',
+            'NAME': os.environ.get('DJANGO_DB_NAME', 'govtexamprep'),
+            'USER': os.environ.get('DJANGO_DB_USER', ''),
+            'PASSWORD': os.environ.get('DJANGO_DB_PASSWORD', ''),
+            'HOST': os.environ.get('DJANGO_DB_HOST', '127.0.0.1'),
+            'PORT': os.environ.get('DJANGO_DB_PORT', ''),
+            # Keep connections open between requests and check them before reuse.
+            'CONN_MAX_AGE': int(os.environ.get('DJANGO_DB_CONN_MAX_AGE', 300)),
+            'CONN_HEALTH_CHECKS': True,
+            'OPTIONS': {},
+        }
+    }
+    if DB_ENGINE == 'mysql':
+        DATABASES['default']['OPTIONS'] = {
+            'charset': 'utf8mb4',
+            'init_command': "SET sql_mode='STRICT_TRANS_TABLES'",
+        }
+    elif DB_ENGINE == 'postgresql' and os.environ.get('DJANGO_DB_POOL', '1') == '1':
+        # Native connection pooling needs psycopg 3 with psycopg_pool (Django 5.1+).
+        # A pool replaces persistent connections, so CONN_MAX_AGE must be 0.
+        from importlib.util import find_spec
+        if find_spec('psycopg_pool'):
+            DATABASES['default']['CONN_MAX_AGE'] = 0
+            DATABASES['default']['OPTIONS']['pool'] = {
+                'min_size': int(os.environ.get('DJANGO_DB_POOL_MIN', 2)),
+                'max_size': int(os.environ.get('DJANGO_DB_POOL_MAX', 10)),
+                'timeout': 10,
+            }
+
+# Read replicas for the public content views: comma-separated SQLite paths, or
+# hosts (host[:port]) sharing the default credentials for a server database, e.g.
+# DJANGO_DB_REPLICAS=/srv/replica1.sqlite3,/srv/replica2.sqlite3
+for index, replica in enumerate(filter(None, os.environ.get('DJANGO_DB_REPLICAS', '').split(',')), 1):
+    replica_settings = {
+        **DATABASES['default'],
+        'OPTIONS': dict(DATABASES['default'].get('OPTIONS', {})),
+        'TEST': {'MIRROR': 'default'},
+    }
+    if DB_ENGINE == 'sqlite3':
+        replica_settings['NAME'] = replica.strip()
+    else:
+        host, _, port = replica.strip().partition(':')
+        replica_settings.update(HOST=host, PORT=port or DATABASES['default']['PORT'])
+    DATABASES[f'replica{index}'] = replica_settings
+
+# Let async views run independent queries on separate connections. SQLite
+# gains nothing from it, so only server databases enable it.
+ASYNC_PARALLEL_QUERIES = DB_ENGINE != 'sqlite3'
+
+DATABASE_REPLICAS = [alias for alias in DATABASES if alias != 'default']
+DATABASE_ROUTERS = ['examportal.db_routers.ReplicaRouter']
+
+# Shared cache when DJANGO_REDIS_URL is set, otherwise per-process memory.
+if os.environ.get('DJANGO_REDIS_URL'):
+    CACHES = {
+        'default': {
+            'BACKEND': 'django.core.cache.backends.redis.RedisCache',
+            'LOCATION': os.environ['DJANGO_REDIS_URL'],
+        }
+    }
+else:
+    CACHES = {
+        'default': {
+            'BACKEND': 'django.core.cache.backends.locmem.LocMemCache',
+            'LOCATION': 'govtexamprep',
+        }
+    }
+
+# Sessions and request.user are served from the cache (see examportal.auth_cache).
+SESSION_ENGINE = 'django.contrib.sessions.backends.cached_db'
+# ModelBackend stays listed for sessions that stored its path before the cached
+# backend existed; without it they would be logged out.
+AUTHENTICATION_BACKENDS = [
+    'examportal.auth_cache.CachedModelBackend',
+    'django.contrib.auth.backends.ModelBackend',
+]
+
 AUTH_PASSWORD_VALIDATORS = [
     {
         'NAME': 'django.contrib.auth.password_validation.UserAttributeSimilarityValidator',
@@ -87,6 +191,44 @@ MEDIA_ROOT = BASE_DIR / 'media'
 
 DEFAULT_AUTO_FIELD = 'django.db.models.BigAutoField'
 
+# Token-bucket budgets per URL name: (burst, requests per minute, methods or None for all).
+# See examportal.ratelimit. Set DJANGO_RATE_LIMIT=0 for load tests from a single address.
+RATE_LIMIT_ENABLED = os.environ.get('DJANGO_RATE_LIMIT', '1') == '1'
+RATE_LIMITS = {
+    'search': (30, 30, None),
+    'eligible_exams_api': (30, 30, None),
+    'login': (10, 5, ['POST']),
+    'register': (5, 2, ['POST']),
+    'mark_note_completed': (60, 60, ['POST']),
+    'mark_notes_completed': (20, 20, ['POST']),
+    'sync_progress': (10, 6, ['POST']),
+    'start_study_session': (20, 10, ['POST']),
+    'end_study_session': (20, 10, ['POST']),
+    'study_heartbeat': (10, 6, ['POST']),
+    'set_exam_target': (20, 10, ['POST']),
+}
+# Buckets are shared between workers when a shared cache is configured.
+RATE_LIMIT_STORE = (
+    'examportal.ratelimit.CacheBucketStore' if os.environ.get('DJANGO_REDIS_URL')
+    else 'examportal.ratelimit.LocalBucketStore'
+)
+# Behind a reverse proxy, key anonymous clients by the first X-Forwarded-For address.
+RATE_LIMIT_TRUST_FORWARDED = os.environ.get('DJANGO_TRUST_X_FORWARDED_FOR', '0') == '1'
+
+# Directory for pre-rendered static pages (examportal.prerender); empty disables it.
+PRERENDER_ROOT = os.environ.get('DJANGO_PRERENDER_ROOT', '')
+
+# Warm each worker up before it serves (examportal.warmup); /health/ready/
+# returns 503 until this has finished.
+WARMUP_ON_STARTUP = os.environ.get('DJANGO_WARMUP', '1') == '1'
+
+# Study session heartbeats (see examportal.heartbeats)
+STUDY_HEARTBEAT_SECONDS = 60
+STUDY_HEARTBEAT_FLUSH_SECONDS = 30
+STUDY_SESSION_STALE_SECONDS = 300
+# Sessions that never sent a heartbeat are only swept once they are this old
+STUDY_SESSION_ABANDONED_SECONDS = 86400
+
 CKEDITOR_CONFIGS = {
     'default': {
         'toolbar': 'full',
@@ -9,8 +9,15 @@ https://docs.djangoproject.com/en/5.1/howto/deployment/wsgi/
 
 import os
 
+from django.conf import settings
 from django.core.wsgi import get_wsgi_application
 
 os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'govtexamprep.settings')
 
 application = get_wsgi_application()
+
+# Compile templates, build the URL resolver and fill caches before serving
+# (see examportal.warmup); under gunicorn --preload this runs before the fork.
+if settings.WARMUP_ON_STARTUP:
+    from examportal.warmup import warm_up
+    warm_up()